@@ -1,6 +1,10 @@
-from src.gui.main import WindowManager
+from src.gui.main import WindowManager, CODE_CACHE
 
 if __name__ == "__main__":
+    CODE_CACHE.attach('./test.json.cmdcache')
+
     with open('./test.json', 'r') as fr:
-        man = WindowManager.buildRaw(''.join(fr.readlines()))
-        man.getWindow('winA').run()
\ No newline at end of file
+        man = WindowManager.buildStream(fr, 'winA')
+        man.getWindow('winA').run()
+
+    CODE_CACHE.save()
\ No newline at end of file
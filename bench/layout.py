@@ -0,0 +1,89 @@
+"""
+    Synthetic layout generator for the benchmarks. Layouts are plain dictionaries in the format read
+    by `WindowManager.build()`, so they can be dumped to JSON and built with `buildRaw()`.
+"""
+
+import json
+
+CATEGORIES = [ 'buttons', 'labels', 'checkbuttons', 'textboxes', 'scales', 'listboxes', 'canvases', 'comboboxes' ]
+STROKES = [ 'line', 'rectangle', 'oval' ]
+
+def generate(windows=1, widgets=10, depth=1, strokes=0, rows=0, commands=0, categories=CATEGORIES):
+  """
+      Generates a layout of `windows` windows named `win0`, `win1`, and so on. Each window holds a
+      chain of `depth` nested frames, and `widgets` widgets of each of the given categories, spread
+      evenly over the frames.
+
+      Keyword arguments:
+      + `windows` The number of windows
+      + `widgets` The number of widgets per category in each window
+      + `depth` The nesting depth of the frames holding the widgets, or 0 to place them in the window
+      + `strokes` The number of strokes drawn on each canvas
+      + `rows` The number of rows in each listbox
+      + `commands` The number of commands in each window, which are assigned to the buttons in turn
+      + `categories` The widget categories to generate
+
+      Returns: The layout dictionary
+  """
+
+  return dict([(f'win{w}', window(widgets, depth, strokes, rows, commands, categories)) for w in range(windows)])
+
+def generateRaw(*args, **kwargs):
+  """ Generates a layout as `generate()` does, and returns it as JSON-formatted text. """
+
+  return json.dumps(generate(*args, **kwargs))
+
+def window(widgets=10, depth=1, strokes=0, rows=0, commands=0, categories=CATEGORIES):
+  """ Generates the specification of a single window -- see `generate()`. """
+
+  frames = [ f'frm{d}' for d in range(depth) ]
+  spec = {
+    'win' : { 'width' : 640, 'height' : 480, 'title' : 'Benchmark' },
+    'commands' : dict([(f'com{c}', 'pass') for c in range(commands)]),
+    'widgets' : {
+      'frames' : [
+        { 'name' : frames[d], 'root' : frames[d - 1] if d else None, 'geoMode' : 'pack', 'geoOptions' : { 'fill' : 'both' } }
+        for d in range(depth)
+      ]
+    }
+  }
+
+  for category in categories:
+    spec['widgets'].setdefault(category, [ ])
+
+    for i in range(widgets):
+      entry = widget(category, f'{category}{i}', i, strokes, rows, commands)
+      entry['root'] = frames[i % depth] if depth else None
+      spec['widgets'][category].append(entry)
+
+  return spec
+
+def widget(category, name, index, strokes=0, rows=0, commands=0):
+  """ Generates the specification of a single widget of the given category -- see `generate()`. """
+
+  spec = { 'name' : name, 'geoMode' : 'pack', 'geoOptions' : { 'side' : 'top' }, 'options' : { } }
+  options = spec['options']
+
+  if category in [ 'buttons', 'labels', 'checkbuttons' ]:
+    options['text'] = name
+  if category == 'buttons' and commands:
+    options['command'] = f'com{index % commands}'
+  if category == 'checkbuttons':
+    options['variable'] = { 'name' : f'{name}Var', 'type' : 'IntVar', 'value' : 0 }
+  if category == 'textboxes':
+    options['textvariable'] = { 'name' : f'{name}Var', 'type' : 'StringVar', 'value' : name }
+  if category == 'scales':
+    options.update({ 'from_' : 0, 'to' : 100, 'orient' : 'horizontal' })
+  if category == 'comboboxes':
+    options['values'] = [ f'{name} value {v}' for v in range(10) ]
+  if category == 'listboxes':
+    spec['values'] = [ f'{name} row {r}' for r in range(rows) ]
+
+  if category == 'canvases':
+    options.update({ 'width' : 200, 'height' : 100 })
+    spec['strokes'] = [
+      { 'type' : STROKES[s % len(STROKES)], 'unnamed' : [ s % 190, s % 90, s % 190 + 10, s % 90 + 10 ] }
+      for s in range(strokes)
+    ]
+
+  return spec
@@ -0,0 +1,217 @@
+"""
+    Benchmarks the build, update and teardown of synthetic layouts, and writes the results as JSON so
+    runs can be compared between commits. A display is required; on headless machines, run under Xvfb:
+
+        xvfb-run -a python -m bench.run --windows 4 --widgets 25 --output results.json
+        xvfb-run -a python -m bench.run --windows 4 --widgets 25 --baseline results.json
+
+    With `--backend recording`, layouts are built with a RecordingBackend, which needs no display
+    and times only the Python side of the build.
+
+    Times are in seconds, dispatch throughput is in events per second, and memory is in bytes.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tkinter
+
+import src.gui.main as gui
+from src.gui.main import WindowManager, TkBackend, RecordingBackend
+from bench.layout import generateRaw
+
+# Metrics where a larger value is better; the others are durations
+HIGHER = [ 'dispatch' ]
+
+def run(windows=1, widgets=10, depth=1, strokes=0, rows=0, commands=0, repeat=5, configures=1000, events=1000, backend='tk'):
+  """
+      Builds, updates and tears down the generated layout `repeat` times, measuring:
+
+      + `build` The time `WindowManager.buildRaw()` takes to build the layout
+      + `configure` The time per `WidgetCollection.configure()` call on the labels of the first window,
+        including the redraw once the calls are done
+      + `dispatch` The number of events dispatched per second to a handler bound through the
+        first window's EventDispatcher
+      + `teardown` The time to remove and destroy all the windows of the layout
+      + `peakRss` The peak resident set size of the process, and `baseRss` the size before building
+
+      Keyword arguments:
+      + `windows`, `widgets`, `depth`, `strokes`, `rows`, `commands` The layout parameters -- see `generate()`
+      + `repeat` The number of times the layout is built
+      + `configures` The number of configure calls timed per build
+      + `events` The number of events dispatched per build
+      + `backend` Either 'tk', or 'recording' to time the Python side only with a RecordingBackend
+
+      Returns: A dictionary of `meta`, `params` and `results`
+  """
+
+  params = {
+    'windows' : windows, 'widgets' : widgets, 'depth' : depth, 'strokes' : strokes, 'rows' : rows,
+    'commands' : commands, 'repeat' : repeat, 'configures' : configures, 'events' : events, 'backend' : backend
+  }
+  raw = generateRaw(windows, widgets, depth, strokes, rows, commands)
+
+  with (RecordingBackend() if backend == 'recording' else TkBackend()):
+    results = measure(raw, repeat, configures, events)
+
+  return { 'meta' : meta(), 'params' : params, 'results' : results }
+
+def measure(raw, repeat, configures, events):
+  """
+      Builds, updates and tears down the JSON-formatted layout `raw` with the active backend, as
+      described in `run()`.
+
+      Returns: A dictionary of (metric, result) pairs
+  """
+
+  # Keep a hidden root of our own, so every generated window is a Toplevel that can be destroyed
+  root = WindowManager.build({ 'bench' : { 'win' : { 'width' : 1, 'height' : 1, 'title' : 'bench' }, 'widgets' : { } } })
+  root.getWindow('bench').hide()
+  gui.TK.update()
+
+  baseRss = rss()
+  samples = { 'build' : [ ], 'configure' : [ ], 'dispatch' : [ ], 'teardown' : [ ] }
+
+  for i in range(repeat):
+    start = time.perf_counter()
+    man = WindowManager.buildRaw(raw)
+    samples['build'].append(time.perf_counter() - start)
+    gui.TK.update_idletasks()
+
+    win = man.getWindow('win0')
+    samples['configure'].append(timeConfigure(win, configures))
+    samples['dispatch'].append(timeDispatch(win, events))
+
+    start = time.perf_counter()
+    for name in list(man.windows):
+      man.removeWindow(name).gui.destroy()
+    man.updates.stop()
+    gui.TK.update_idletasks()
+    samples['teardown'].append(time.perf_counter() - start)
+
+  results = dict([(metric, summary(samples[metric])) for metric in samples])
+  results.update({ 'baseRss' : baseRss, 'peakRss' : rss() })
+
+  return results
+
+def timeConfigure(win, count):
+  """ Returns the time per configure call on the labels of `win`, or None if it has none. """
+
+  names = list(win.labels.widgets)
+  if not names or not count: return None
+
+  start = time.perf_counter()
+  for i in range(count):
+    win.labels.configure(names[i % len(names)], text=str(i))
+  win.gui.update_idletasks()
+
+  return (time.perf_counter() - start) / count
+
+def timeDispatch(win, count):
+  """ Returns the number of events per second dispatched to a handler bound on `win`. """
+
+  if not count: return None
+
+  fired = [ 0 ]
+  def handler(event): fired[0] += 1
+
+  win.events.bind(win.gui, '<<BenchEvent>>', handler)
+
+  start = time.perf_counter()
+  for i in range(count):
+    win.gui.event_generate('<<BenchEvent>>')
+  elapsed = time.perf_counter() - start
+
+  win.events.unbind(win.gui, '<<BenchEvent>>', handler)
+
+  if fired[0] != count:
+    raise Exception(f"Only {fired[0]} of {count} benchmark events were dispatched")
+  return count / elapsed
+
+def summary(values):
+  """ Returns the median, minimum and maximum of the measured values. """
+
+  values = [ v for v in values if v is not None ]
+  if not values: return None
+  return { 'median' : statistics.median(values), 'min' : min(values), 'max' : max(values) }
+
+def rss():
+  """ Returns the peak resident set size of the process, in bytes. """
+
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return peak if sys.platform == 'darwin' else peak * 1024
+
+def meta():
+  """ Returns the commit, interpreter and Tk versions the benchmark ran with. """
+
+  try:
+    commit = subprocess.run([ 'git', 'rev-parse', 'HEAD' ], capture_output=True, text=True).stdout.strip() or None
+  except OSError:
+    commit = None
+
+  return {
+    'commit' : commit, 'python' : platform.python_version(), 'tk' : tkinter.TkVersion,
+    'platform' : platform.platform(), 'time' : time.strftime('%Y-%m-%dT%H:%M:%S')
+  }
+
+def compare(old, new):
+  """
+      Compares two benchmark results. The ratio of each metric is its new median over its old one,
+      inverted for throughput, so a ratio above 1 is always a slowdown.
+
+      Returns: A dictionary of (metric, ratio) pairs
+  """
+
+  ratios = { }
+
+  for metric in new['results']:
+    a, b = old['results'].get(metric), new['results'][metric]
+    if a is None or b is None: continue
+
+    a, b = (a['median'], b['median']) if 'dict' in str(type(a)) else (a, b)
+    if a and b: ratios[metric] = a / b if metric in HIGHER else b / a
+
+  return ratios
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Benchmarks the build, update and teardown of synthetic layouts.')
+  parser.add_argument('--windows', type=int, default=1, help='windows in the layout')
+  parser.add_argument('--widgets', type=int, default=10, help='widgets per category in each window')
+  parser.add_argument('--depth', type=int, default=1, help='nesting depth of the frames')
+  parser.add_argument('--strokes', type=int, default=0, help='strokes per canvas')
+  parser.add_argument('--rows', type=int, default=0, help='rows per listbox')
+  parser.add_argument('--commands', type=int, default=0, help='commands per window')
+  parser.add_argument('--repeat', type=int, default=5, help='number of builds')
+  parser.add_argument('--configures', type=int, default=1000, help='configure calls timed per build')
+  parser.add_argument('--events', type=int, default=1000, help='events dispatched per build')
+  parser.add_argument('--backend', choices=[ 'tk', 'recording' ], default='tk', help='widget backend to build with')
+  parser.add_argument('--output', help='file to write the results to, instead of standard output')
+  parser.add_argument('--baseline', help='earlier results to compare against')
+  args = parser.parse_args(argv)
+
+  result = run(
+    args.windows, args.widgets, args.depth, args.strokes, args.rows, args.commands,
+    args.repeat, args.configures, args.events, args.backend
+  )
+  text = json.dumps(result, indent=2)
+
+  if args.output:
+    with open(args.output, 'w') as fw: fw.write(text)
+  else:
+    print(text)
+
+  if args.baseline:
+    with open(args.baseline, 'r') as fr: old = json.load(fr)
+
+    if old['params'] != result['params']:
+      print('Warning: the baseline was run with different parameters', file=sys.stderr)
+    for metric, ratio in compare(old, result).items():
+      print(f'{metric:>10} {ratio:6.2f}x {"slower" if ratio > 1 else "faster"}', file=sys.stderr)
+
+if __name__ == '__main__':
+  main()
@@ -3,10 +3,64 @@ from tkinter import messagebox
 from tkinter import ttk
 import json
 import types
+import hashlib
+import marshal
+import importlib.util
+import os
+import copy
+import time
+import bisect
+import itertools
+import contextlib
+import threading
+import asyncio
+import inspect
+import tokenize
+import io
+import math
+import concurrent.futures
+import sys
+import traceback
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 GEOMETRY_MODES = [ 'place', 'pack', 'grid', 'none' ]
 VARIABLES = { "StringVar" : tkinter.StringVar, "IntVar" : tkinter.IntVar, "DoubleVar" : tkinter.DoubleVar, "BooleanVar" : tkinter.BooleanVar, "Variable" : tkinter.Variable }
+RADIO_VARIABLES = { "bool" : "BooleanVar", "str" : "StringVar", "int" : "IntVar", "float" : "DoubleVar" }
+STROKE_TYPES = [ 'line', 'rectangle', 'oval', 'polygon', 'arc', 'image', 'text', 'widget' ]
+STROKE_CHUNK = 5000
+CULL_TAG = 'tkjsoncull'
+TCL_PROCS = """
+if {[info procs tkjson_strokes] eq ""} {
+  proc tkjson_strokes {canvas runs} {
+    set ids {}
+    foreach run $runs {
+      lassign $run type options coordslist
+      foreach coords $coordslist { lappend ids [$canvas create $type {*}$coords {*}$options] }
+    }
+    return $ids
+  }
+  proc tkjson_coords {canvas pairs} {
+    foreach {id coords} $pairs { $canvas coords $id {*}$coords }
+  }
+}
+"""
+CATEGORIES = {
+  "buttons" : tkinter.Button, "canvases" : tkinter.Canvas, "checkbuttons" : tkinter.Checkbutton,
+  "textboxes" : tkinter.Entry, "frames" : tkinter.Frame, "labels" : tkinter.Label, "listboxes" : tkinter.Listbox,
+  "menubuttons" : tkinter.Menubutton, "menus" : tkinter.Menu, "messages" : tkinter.Message,
+  "radiobuttons" : tkinter.Radiobutton, "scales" : tkinter.Scale, "scrollbars" : tkinter.Scrollbar,
+  "textareas" : tkinter.Text, "windows" : tkinter.Toplevel, "panes" : tkinter.PanedWindow,
+  "labelframes" : tkinter.LabelFrame, "progressbars" : ttk.Progressbar, "comboboxes" : ttk.Combobox,
+  "labelscales" : ttk.LabeledScale, "spinboxes" : ttk.Spinbox, "treeviews" : ttk.Treeview,
+  "sizegrips" : ttk.Sizegrip, "tabbedpane" : ttk.Notebook
+}
 TK = None
+TK_THREAD = None
+ASYNC = None
 
 class Menu():
   """
@@ -28,6 +82,192 @@ class Menu():
   def asDict(self):
     return { 'type' : self.mType, 'label' : self.label, 'options' : self.options, 'children' : self.children }
 
+class CodeCache():
+  """
+      CodeCache holds the compiled code of raw commands (see `Window.addCommandRaw()`), keyed by a
+      hash of the command's source. Windows that share command text compile it once, and binding a
+      cached command to a window only requires creating a function from the stored code.
+
+      The cache lives in memory, and may be attached to a file (using `attach()`) to persist the
+      compiled code in marshal format between runs -- typically alongside the layout, such as
+      `layout.json.cmdcache`. Files written by a different Python version are ignored.
+  """
+
+  def __init__(self, path=None):
+    self.codes = { }
+    self.path = None
+    self.dirty = False
+
+    if path: self.attach(path)
+
+  @staticmethod
+  def key(source): return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+  @staticmethod
+  def wrap(source):
+    """
+        Returns the source of the command function generated for the raw command `source`. Commands
+        using `await`, `async for` or `async with` become coroutine functions.
+    """
+
+    parsed = '\n'.join([' '+ln for ln in source.split('\n')])
+    return f"{'async ' if CodeCache.isAsync(source) else ''}def _command(self, event=None):\n{parsed}\n"
+
+  @staticmethod
+  def isAsync(source):
+    """ Returns whether the raw command `source` uses `await`, `async for` or `async with`. """
+
+    try:
+      names = [tok.string for tok in tokenize.generate_tokens(io.StringIO(source).readline) if tok.type == tokenize.NAME]
+    except (tokenize.TokenError, SyntaxError):
+      return False
+
+    return 'await' in names or any([a == 'async' and b in [ 'for', 'with' ] for a, b in zip(names, names[1:])])
+
+  def has(self, source): return CodeCache.key(source) in self.codes
+
+  def attach(self, path):
+    """
+        Associates the cache with a file, loading any code already stored in it.
+
+        Keyword arguments:
+        + `path` The filepath of the marshal-formatted cache
+
+        Returns: Self for chaining
+    """
+
+    self.path = path
+
+    if os.path.isfile(path):
+      with open(path, 'rb') as fr:
+        data = fr.read()
+
+      if data[:len(importlib.util.MAGIC_NUMBER)] == importlib.util.MAGIC_NUMBER:
+        try:
+          self.codes.update(marshal.loads(data[len(importlib.util.MAGIC_NUMBER):]))
+        except (EOFError, ValueError, TypeError):
+          pass
+
+    return self
+
+  def save(self):
+    """
+        Writes the cache to its attached file, if there is one and new code has been compiled.
+
+        Returns: Self for chaining
+    """
+
+    if self.path and self.dirty:
+      tmp = f"{self.path}.tmp"
+
+      with open(tmp, 'wb') as fw:
+        fw.write(importlib.util.MAGIC_NUMBER + marshal.dumps(self.codes))
+
+      os.replace(tmp, self.path)
+      self.dirty = False
+
+    return self
+
+  def compile(self, source):
+    """
+        Gets the compiled code of a raw command, compiling and caching it if needed.
+
+        Keyword arguments:
+        + `source` The raw Python code of the command
+
+        Returns: The code object of the command's function
+    """
+
+    return self.compileMany([source])[0]
+
+  def compileMany(self, sources):
+    """
+        Gets the compiled code of several raw commands. All commands that are not yet cached are
+        compiled together in a single pass.
+
+        Keyword arguments:
+        + `sources` A list of raw Python code strings
+
+        Returns: A list of code objects, in the same order as `sources`
+    """
+
+    keys = [CodeCache.key(src) for src in sources]
+    missing = dict([(key, src) for key, src in zip(keys, sources) if not key in self.codes])
+
+    if missing:
+      module = compile(''.join([CodeCache.wrap(src) for src in missing.values()]), '<command>', 'exec')
+      codes = [c for c in module.co_consts if isinstance(c, types.CodeType)]
+
+      self.codes.update(zip(missing.keys(), codes))
+      self.dirty = True
+
+    return [self.codes[key] for key in keys]
+
+CODE_CACHE = CodeCache()
+
+class Plan():
+  """
+      Plan is a precompiled layout generated by `WindowManager.compile()`. It holds, for each window
+      and in build order, a flat list of instructions whose parents, commands and variables were
+      validated and resolved to names when compiled, such that `WindowManager.fromPlan()` may build
+      the windows without parsing or validating the layout again.
+
+      Plans only contain JSON data, and may be saved to and loaded from a cache file. The plan keeps
+      the hash (`digest`) of the layout it was compiled from to detect stale cache files.
+  """
+
+  VERSION = 5
+
+  def __init__(self, digest, windows=[]):
+    self.digest = digest
+    self.windows = windows
+
+  @staticmethod
+  def key(raw): return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+  def asDict(self):
+    return { 'version' : Plan.VERSION, 'digest' : self.digest, 'windows' : self.windows }
+
+  def save(self, path):
+    """
+        Saves the plan to a cache file.
+
+        Keyword arguments:
+        + `path` The filepath to save the plan to
+
+        Returns: Self for chaining
+    """
+
+    tmp = f"{path}.tmp"
+
+    with open(tmp, 'w') as fw:
+      json.dump(self.asDict(), fw, separators=(',', ':'))
+
+    os.replace(tmp, path)
+    return self
+
+  @staticmethod
+  def load(path):
+    """
+        Loads a plan from a cache file.
+
+        Keyword arguments:
+        + `path` The filepath of the cache file
+
+        Returns: The plan, or None if the file doesn't exist or was written by another plan version
+    """
+
+    if not os.path.isfile(path): return None
+
+    try:
+      with open(path, 'r') as fr:
+        dic = json.load(fr)
+    except ValueError:
+      return None
+
+    if dic.__class__.__name__ != 'dict' or dic.get('version') != Plan.VERSION: return None
+    return Plan(dic['digest'], dic['windows'])
+
 class WidgetCollection():
   """
       WidgetCollection represents a set of widgets that are all of the same class. It bundles
@@ -39,17 +279,35 @@ class WidgetCollection():
       + Get widgets and metadata using `getWidget()` and `getMeta()`
       + Add a new widget of the collection's type using `addWidget()`
       + Reconfigure widget properties using `configure()`
+
+      When the collection belongs to a Window, every widget added or deleted is also recorded in
+      the window's name index (`Window.widgetIndex`), which keeps names unique across categories.
+
+      Collections are kept small, as windows may have many of them: the metadata and background
+      jobs of the widgets are only allocated once a widget has some.
   """
 
-  def __init__(self, _parent, _class):
+  __slots__ = ('widgets', 'meta', 'jobs', '_parent', '_class', '_category', '_window')
+
+  def __init__(self, _parent, _class, _category=None, _window=None):
     self.widgets = { }
-    self.meta = { }
+    self.meta = None
+    self.jobs = None
     self._parent = _parent
     self._class = _class
+    self._category = _category
+    self._window = _window
+
+  def hasWidget(self, name):
+    if name in self.widgets: return True
+    elif self._window and name in self._window.deferredNames:
+      # Widgets deferred by a lazy subtree are built when looked up
+      self._window.materialize(name)
+      return name in self.widgets
+    else:
+      return False
 
-  def hasWidget(self, name): return name in self.widgets
-
-  def hasMeta(self, name): return name in self.meta
+  def hasMeta(self, name): return self.meta is not None and name in self.meta
 
   def getWidget(self, name): return None if not self.hasWidget(name) else self.widgets[name]
 
@@ -64,7 +322,7 @@ class WidgetCollection():
     """
 
     if self.hasWidget(name):
-      if name in self.meta:
+      if self.hasMeta(name):
         return self.meta[name]
       else:
         return None
@@ -73,6 +331,7 @@ class WidgetCollection():
   
   def setMeta(self, name, meta):
     if self.hasWidget(name):
+      if self.meta is None: self.meta = { }
       self.meta[name] = meta
     else:
       raise Exception(f"No widget with the name '{name}' exists in this window.")
@@ -89,13 +348,17 @@ class WidgetCollection():
         + `geoOptions` The geometry options to supply the geometry functions
         + `options` The options to use in construction of the widget. These are based on widget type
         + `state` The state to set the widget to -- a list of options
-        + `events` A set of (event, functionlist) pairs, where each function is a response to the provided event
+        + `events` A set of (event, functionlist) pairs, where each function is a response to the provided event.
+          A function may also be given as a dictionary of `command` (the function) and `throttle` or
+          `debounce` in milliseconds -- see `EventDispatcher`
 
         The default geometry mode is 'none', which means that no geometry functions are called. The 'none'
         option is useful for widgets like Menus, etc.
         
         Exceptions:
         + If an invalid geomode is provided, an exception is raised.
+        + If the name is already used by a widget in this or another category of the window, an
+          exception is raised.
         + If the value of state is not None (default) or a list/tuple, an exception is raised.
         + If one of the values of the function list for an event in events is not a function, an exception is raised.
 
@@ -107,24 +370,44 @@ class WidgetCollection():
     if not geoMode.lower() in GEOMETRY_MODES:
       raise Exception(f"Geometry mode {geoMode} is not valid mode. Valid: {GEOMETRY_MODES}")
 
-    if not name in self.widgets:
-      if self._class == tkinter.Toplevel:
-        self.widgets[name] = self._class(**options)
-      else:
-        self.widgets[name] = self._class(root if root else self._parent, **options)
-    else:
+    index = self._window.widgetIndex if self._window else None
+
+    if name in self.widgets:
       raise Exception(f"Widget {str(self._class).split(' ')[1][:-1]}, Name '{name}' already exists")
+    elif index is not None and name in index:
+      raise Exception(f"A widget named '{name}' already exists in the '{index[name][0]}' category of this window")
+
+    profiler = self._window.profiler if self._window else NULL_PROFILER
+    pool = self._window.pool if self._window else None
+
+    with profiler.phase('construct'):
+      key = pool.key(self._category, root if root else self._parent, options, state) if pool is not None else None
+      widget = pool.take(key) if key is not None else None
+
+      if widget is not None:
+        if WidgetPool.dynamic(options): BACKEND.configure(widget, WidgetPool.dynamic(options))
+      elif self._class == tkinter.Toplevel:
+        widget = BACKEND.construct(self._class, None, options)
+      else:
+        widget = BACKEND.construct(self._class, root if root else self._parent, options)
+
+      if key is not None: pool.keys[str(widget)] = key
+      self.widgets[name] = widget
+
+    # The construction options count as written, so rewriting them is a no-op -- see `Window.flush()`
+    if self._window: self._window.applied[name] = dict(options)
+
+    if index is not None:
+      index[name] = (self._category, self.widgets[name])
+      self._window.widgetNames[str(self.widgets[name])] = name
 
     # Execute the proper geometry function based on the mode selected and given geometry options
     mode = geoMode.lower()
-    if mode == 'place':
-        self.widgets[name].place(**geoOptions)
-    elif mode == 'pack':
-        self.widgets[name].pack(**geoOptions)
-    elif mode == 'grid':
-        self.widgets[name].grid(**geoOptions)
-    elif mode != 'none':
-      raise Exception(f"The provided geoMode '{mode}' is not valid")
+    with profiler.phase('geometry'):
+      if mode in GEOMETRY_MODES:
+        BACKEND.geometry(self.widgets[name], mode, geoOptions)
+      else:
+        raise Exception(f"The provided geoMode '{mode}' is not valid")
     
     # Modify the state
     if state:
@@ -133,19 +416,25 @@ class WidgetCollection():
       else:
         raise Exception(f"The structure of the widget's state is invalid -- use a list or tuple")
     
-    # Bind events
-    for ev in events:
-      for func in events[ev]:
-        if func.__class__.__name__ in [ 'function', 'method' ]:
-          self.widgets[name].bind(ev, func)
-        else:
-          raise Exception(f"'{func}' is not a function bindable to the widget")
+    # Bind events, through the window's dispatcher if there is one
+    with profiler.phase('events'):
+      for ev in events:
+        for func in events[ev]:
+          handler = func['command'] if func.__class__.__name__ == 'dict' else func
+
+          if not handler.__class__.__name__ in [ 'function', 'method' ]:
+            raise Exception(f"'{func}' is not a function bindable to the widget")
+          elif self._window:
+            self._window.events.bind(self.widgets[name], ev, handler, *Window._limits(func))
+          else:
+            BACKEND.bind(self.widgets[name], ev, handler)
 
     return self.widgets[name]
 
   def deleteWidget(self, name):
     """
-        Accepts a widget name, and deletes it.
+        Accepts a widget name, and deletes it. If the collection belongs to a Window, the widgets
+        built inside it are deleted too -- see `Window.removeWidget()`.
 
         Keyword arguments:
         + `name` The name of the widget to be deleted
@@ -153,18 +442,34 @@ class WidgetCollection():
         Returns: Self for chaining
     """
 
-    if hasWidget(name):
-      wid = self.getWidget(name)
-
-      del self.widgets[name]
-      if name in self.meta: del self.meta[name]
-      wid.delete()
+    # Deferred widgets are dropped by the window without being built
+    if self._window and (name in self._window.widgetIndex or name in self._window.deferredNames):
+      self._window.removeWidget(name)
+    elif name in self.widgets:
+      self._delete(name)
     
     return self
+
+  def _delete(self, name, destroy=True):
+    """ Removes a widget from the collection and the window's index, and destroys it unless `destroy` is false. """
+
+    wid = self.widgets.pop(name)
+    if self.hasMeta(name): del self.meta[name]
+
+    if self._window and name in self._window.widgetIndex:
+      del self._window.widgetIndex[name]
+      self._window.events.forget(wid, unbind=not destroy)
+      self._window.applied.pop(name, None)
+      self._window.widgetNames.pop(str(wid), None)
+
+    if destroy:
+      if self._window and self._window.pool is not None: self._window.pool.drop(wid)
+      wid.destroy()
   
   def configure(self, name, **options):
     """
-        Reconfigures a widget using the given options
+        Reconfigures a widget using the given options. Inside a `Window.batch()` block, the options
+        are queued and applied once the block ends, as with `configureMany()`.
 
         Keyword arguments:
         + `name` The name of the widget to configure
@@ -173,215 +478,2997 @@ class WidgetCollection():
         Returns: Self for chaining
     """
 
-    if self.hasWidget(name): self.getWidget(name).configure(**options)
+    if self._window and self._window.batching:
+      if self.hasWidget(name): self._window.queueConfigure(name, options)
+    elif self.hasWidget(name) and self._window:
+      self._window._reconfigure(name, self.getWidget(name), options)
+      self._window.applied.setdefault(name, { }).update(options)
+    elif self.hasWidget(name):
+      BACKEND.configure(self.getWidget(name), options)
     return self
 
-class WindowManager():
-  """
-      WindowManager is a simple class that collects together a series of windows. It
-      updates a window to refer to itself when added such that windows can intercommunicate
-      through their commands or other actions (such as a button on window 'A' changing the
-      text of a label on window 'B').
-  """
-
-  def __init__(self):
-    self.windows = { }
-  
-  def hasWindow(self, name): return name in self.windows
-
-  def getWindow(self, name): return None if not self.hasWindow(name) else self.windows[name]
-
-  def addWindow(self, name, win):
+  def configureMany(self, widgets):
     """
-        Adds a window to this manager under the given name.
+        Queues the reconfiguration of several widgets, which is applied once when tkinter is next
+        idle. Repeated writes to the same option are merged, and writes of the value the widget was
+        built with or last written through the window are dropped. See `Window.batch()`.
 
         Keyword arguments:
-        + `name` The name that will be used in reference to the window added
-        + `win` The Window instance to be associated with the name
+        + `widgets` A dictionary of (widget name, options dictionary) pairs
 
         Returns: Self for chaining
     """
 
-    if not self.hasWindow(name):
-      self.windows[name] = win
-      win.setManager(self)
-    else:
-      raise Exception(f"A window named '{name}' already exists for this manager")
-    
+    for name in widgets:
+      if not self.hasWidget(name): continue
+
+      if self._window:
+        self._window.queueConfigure(name, widgets[name])
+      else:
+        BACKEND.configure(self.getWidget(name), widgets[name])
     return self
-  
-  def createWindow(self, name, win):
+
+  def bulkInsert(self, name, rows, chunk=200, budget=8, replace=False, onProgress=None, onDone=None):
     """
-        Adds a window to this manager from raw JSON-formatted text.
+        Inserts many rows into a Listbox or Treeview without blocking the event loop. Rows are read
+        from `rows` in chunks, and inserted in slices of at most `budget` milliseconds scheduled with
+        `after()`, so the window stays responsive and repaints during the load. Starting a new bulk
+        insert on the same widget cancels the one in progress.
 
-        Keyword arguments:
-        + `name` The name to associate with the newly-built window
-        + `win` The raw JSON-formatted text representing the window to be added
+        Treeview rows may be a dictionary of arguments for `Treeview.insert()` (such as `text`,
+        `values` and `iid`, and optionally `parent`), a list or tuple of values, or a string for the
+        item text; Listbox rows are inserted as given.
 
-        Returns: Self for chaining
+        Keyword arguments:
+        + `name` The name of the Listbox or Treeview
+        + `rows` An iterable of rows
+        + `chunk` The number of rows inserted between checks of the time budget
+        + `budget` The number of milliseconds each slice may take
+        + `replace` Whether the existing rows of the widget are deleted first
+        + `onProgress` A function called with the number of rows inserted after each slice
+        + `onDone` A function called with the number of rows inserted once all rows are inserted
+
+        Returns: The BulkInsert job, which may be cancelled using `cancel()`
     """
 
-    self.addWindow(name, Window.buildFromDict(win))
-    return self
-  
-  def removeWindow(self, name):
-    """
-        Removes a window from this manager.
+    if self.jobs and name in self.jobs: self.jobs[name].cancel()
 
-        Keyword arguments:
-        + `name` The name of the window to remove
+    widget = self.getWidget(name)
+    if widget is None:
+      raise Exception(f"No widget with the name '{name}' exists in this collection")
 
-        Returns: The Window instance associated with `name`, or None if not found
-    """
+    if replace:
+      if 'Treeview' == widget.__class__.__name__:
+        widget.delete(*widget.get_children())
+      else:
+        widget.delete(0, 'end')
 
-    if self.hasWindow(name):
-      win = self.getWindow(name)
-      win.setManager()
-      del self.windows[name]
-      return win
-    else:
-      return None
-  
-  @staticmethod
-  def build(dic):
-    """
-        Builds a WindowManager from a dictionary of name-window entries, where each window is a
-        dictionary of information that `Window.build()` can parse.
+    def done(count):
+      if self.jobs.get(name) is job: del self.jobs[name]
+      if onDone: onDone(count)
 
-        Keyword arguments:
-        + `dic` The dictionary of name-windowdict pairs
+    job = BulkInsert(widget, rows, chunk, budget, onProgress, done)
+    if self.jobs is None: self.jobs = { }
+    self.jobs[name] = job
+    return job.start()
 
-        Returns: The WindowManager generated from the dictionary
-    """
+class WidgetPool():
+  """
+      WidgetPool keeps removed widgets for reuse, as turned on by `Window.recycle()`. A widget is
+      pooled under its category, its parent and the signature of the options and state it was
+      built with, and is unmapped until a widget with the same key is added. Only the variables and
+      functions given in the options of the new widget are reconfigured, so the other options must
+      be equal for widgets to be reused.
+
+      Only widgets of the `POOLED` categories, whose contents are fully described by their options,
+      are kept; there are at most `limit` widgets per key.
+  """
 
-    man = WindowManager()
+  POOLED = [ 'buttons', 'labels', 'checkbuttons', 'radiobuttons', 'frames', 'labelframes', 'messages', 'progressbars', 'scrollbars', 'sizegrips' ]
 
-    for win in sorted(dic):
-      man.createWindow(win, dic[win])
+  def __init__(self, limit=32):
+    self.limit = limit
+    self.widgets = { }
+    self.keys = { }
+    self.reused = 0
 
-    return man
+  @staticmethod
+  def signature(value):
+    """ Returns a hashable description of an option value, where variables and functions are placeholders. """
+
+    value = TkBackend.describe(value)
+
+    if value.__class__.__name__ == 'dict':
+      return tuple([(key, WidgetPool.signature(value[key])) for key in sorted(value)])
+    elif value.__class__.__name__ == 'list':
+      return tuple([WidgetPool.signature(item) for item in value])
+    return value
 
   @staticmethod
-  def buildRaw(raw=''):
-    """
-        Builds a WindowManager from raw, JSON-formatted text. The format should be a dictionary of
-        name-Window pairs, where 'Window' is JSON-formatted text that `Window.build()` can parse.
+  def dynamic(options):
+    """ Returns the options that aren't part of the signature -- the variables and functions. """
 
-        Keyword arguments:
-        + `raw` JSON-formatted text that can build a WindowManager
+    return dict([(k, v) for k, v in options.items() if WidgetPool.signature(v) in [ '<variable>', '<function>' ]])
 
-        Returns: The manager built from the JSON
+  def key(self, category, parent, options, state=None):
+    """ Returns the pool key of a widget specification, or None if widgets of the category aren't pooled. """
+
+    if not category in WidgetPool.POOLED: return None
+    return (category, str(parent), WidgetPool.signature(options), tuple(state) if state else None)
+
+  def take(self, key):
+    """ Returns a pooled widget with the given key, or None if there is none. """
+
+    if not self.widgets.get(key): return None
+
+    self.reused += 1
+    return self.widgets[key].pop()
+
+  def put(self, widget, applied=None):
     """
+        Unmaps a widget and keeps it for reuse. The options in `applied`, those written since the
+        widget was built along with those it was built with, are reset to the values it was built
+        with, or to their defaults, unless they still hold them.
 
-    if not raw: return None
-    else:
-      dic = json.loads(raw)
-      man = WindowManager()
+        Returns: False if the widget can't be pooled, in which case it should be destroyed
+    """
 
-      for win in sorted(dic):
-        man.createWindow(win, dic[win])
+    key = self.keys.pop(str(widget), None)
+    manager = widget.winfo_manager()
 
-      return man
+    if key is None or len(self.widgets.get(key, [ ])) >= self.limit or not manager in [ '', 'place', 'pack', 'grid' ]:
+      return False
 
-class Window():
-  """
-      Window is a one-stop shop for generating tkinter graphical user interfaces, including the
-      parsing of raw JSON to generate an interface, and holding variables and the widgets of the
-      interface in a uniform, organized manner. Windows may be built using the `build(json)`
-      function, but the most specific way to generate a window is to instantiate the Window class
-      and use its functions...
+    built, reset = dict(key[2]), { }
 
-      Short, and sweet:
-      ```
-      Window(width, height, title, icon) # Creates the window
-      .addMenu(menu)                     # Sets up a menu
-      .addCommands(cmdList)              # Associates python functions with names as 'commands'
-      .addWidgets(widgets)               # Builds the interface using JSON-formatted properties
-      .run()                             # Opens the interface using the mainloop() function
-      ```
+    try:
+      for option in applied or { }:
+        if not option in built:
+          reset[option] = widget.configure(option)[3]
+        elif not built[option] in [ '<variable>', '<function>', WidgetPool.signature(applied[option]) ]:
+          reset[option] = built[option]
+      if reset: BACKEND.configure(widget, reset)
+    except Exception:
+      return False
 
-      Extra functionality in the way of adding raw Python code (as strings) for commands is
-      available as `addCommandsRaw(...)`, but is not recommended versus the above method due to
-      potential security issues and memory management.
+    if manager: getattr(widget, manager + '_forget')()
+    self.widgets.setdefault(key, [ ]).append(widget)
+    self.keys[str(widget)] = key
+    return True
 
-      Extra functionality in the way of managing variables used in widgets is available; however,
-      once a variable is added, it may NOT be removed using the API.
+  def drop(self, widget):
+    """ Forgets a widget that's being destroyed, along with the pooled widgets inside it. """
+
+    path = str(widget)
+    self.keys.pop(path, None)
+
+    for key in [key for key in self.widgets if key[1] == path or key[1].startswith(path + '.')]:
+      for pooled in self.widgets.pop(key): self.keys.pop(str(pooled), None)
+
+  def clear(self):
+    """ Destroys every pooled widget. """
+
+    for key in list(self.widgets):
+      for widget in self.widgets.pop(key): widget.destroy()
+    self.keys = { }
+
+class BulkInsert():
+  """
+      BulkInsert is a job inserting rows from an iterable into a Listbox or Treeview, in time-budgeted
+      slices run from the tkinter event loop. See `WidgetCollection.bulkInsert()`.
   """
 
-  def __init__(self, width=480, height=320, title="PUI", icon=""):
-    # Instantiate TK root if not already created; otherwise, generate a Toplevel
-    global TK
+  def __init__(self, widget, rows, chunk=200, budget=8, onProgress=None, onDone=None):
+    self.widget = widget
+    self.rows = iter(rows)
+    self.chunk = chunk
+    self.budget = budget / 1000
+    self.onProgress = onProgress
+    self.onDone = onDone
+    self.count = 0
+    self.done = False
+    self.cancelled = False
+    self._job = None
+    self._tree = 'Treeview' == widget.__class__.__name__
+
+  def start(self):
+    """ Schedules the first slice of the job. Returns self for chaining. """
+
+    self._job = self.widget.after(0, self._step)
+    return self
 
-    if not TK:
-      TK = tkinter.Tk()
-      self.gui = TK
-    else:
-      self.gui = tkinter.Toplevel(TK)
-      self.hide()
+  def cancel(self):
+    """ Stops the job; rows already inserted are kept. Returns self for chaining. """
 
-    # Instantiation of window
-    self.guiIcon = None
-    self.variables = { }
-    self.manager = None
+    if self._job: self.widget.after_cancel(self._job)
+    self._job, self.cancelled = None, True
+    return self
 
-    self.messageboxes = messagebox
-    self.buttons = WidgetCollection(self.gui, tkinter.Button)
-    self.canvases = WidgetCollection(self.gui, tkinter.Canvas)
-    self.checkbuttons = WidgetCollection(self.gui, tkinter.Checkbutton)
-    self.textboxes = WidgetCollection(self.gui, tkinter.Entry)
-    self.frames = WidgetCollection(self.gui, tkinter.Frame)
-    self.labels = WidgetCollection(self.gui, tkinter.Label)
-    self.listboxes = WidgetCollection(self.gui, tkinter.Listbox)
-    self.menubuttons = WidgetCollection(self.gui, tkinter.Menubutton)
-    self.menus = WidgetCollection(self.gui, tkinter.Menu)
-    self.messages = WidgetCollection(self.gui, tkinter.Message)
-    self.radiobuttons = WidgetCollection(self.gui, tkinter.Radiobutton)
-    self.scales = WidgetCollection(self.gui, tkinter.Scale)
-    self.scrollbars = WidgetCollection(self.gui, tkinter.Scrollbar)
-    self.textareas = WidgetCollection(self.gui, tkinter.Text)
-    self.windows = WidgetCollection(self.gui, tkinter.Toplevel)
-    self.spinboxes = WidgetCollection(self.gui, tkinter.Spinbox)
-    self.panes = WidgetCollection(self.gui, tkinter.PanedWindow)
-    self.labelframes = WidgetCollection(self.gui, tkinter.LabelFrame)
-    self.progressbars = WidgetCollection(self.gui, ttk.Progressbar)
-    self.comboboxes = WidgetCollection(self.gui, ttk.Combobox)
-    self.labelscales = WidgetCollection(self.gui, ttk.LabeledScale)
-    self.spinboxes = WidgetCollection(self.gui, ttk.Spinbox)
-    self.treeviews = WidgetCollection(self.gui, ttk.Treeview)
-    self.sizegrips = WidgetCollection(self.gui, ttk.Sizegrip)
-    self.tabbedpane = WidgetCollection(self.gui, ttk.Notebook)
+  def _insert(self, rows):
+    if not self._tree:
+      self.widget.insert('end', *rows)
+      return
+
+    for row in rows:
+      if row.__class__.__name__ == 'dict':
+        row = dict(row)
+        self.widget.insert(row.pop('parent', ''), row.pop('index', 'end'), **row)
+      elif row.__class__.__name__ in ['list', 'tuple']:
+        self.widget.insert('', 'end', values=row)
+      else:
+        self.widget.insert('', 'end', text=row)
 
-    self.gui.geometry(f"{width}x{height}")
-    self.gui.title(title)
-    self.setIcon(icon)
+  def _step(self):
+    self._job = None
+    if self.cancelled: return
 
-  @property
-  def categories(self):
-    """ Returns a dictionary of (category, WidgetCollection) pairs for the window. """
-    
-    return dict([(e, self.__dict__[e]) for e in self.__dict__ if self.__dict__[e].__class__.__name__ == 'WidgetCollection' ])
+    start = time.perf_counter()
+    while time.perf_counter() - start < self.budget:
+      rows = list(itertools.islice(self.rows, self.chunk))
+      if rows:
+        self._insert(rows)
+        self.count += len(rows)
 
-  def run(self): self.gui.mainloop()
+      if len(rows) < self.chunk:
+        self.done = True
+        break
 
-  def setManager(self, man=None):
-    if man.__class__.__name__ == 'WindowManager':
-      self.manager = man
+    if self.onProgress: self.onProgress(self.count)
+
+    if self.done:
+      if self.onDone: self.onDone(self.count)
     else:
-      raise Exception("The provided parameter is not an instance of WindowManager.")
+      self._job = self.widget.after(1, self._step)
 
-  def setIcon(self, icon=""):
+class UpdateQueue():
+  """
+      UpdateQueue lets any thread hand work to the tkinter thread. Updates are posted as a function
+      and its arguments, and run on the tkinter thread by a poller scheduled with `after()`, which
+      runs updates for at most `budget` milliseconds before yielding back to the event loop. The
+      poller runs every `interval` milliseconds while there are updates, and backs off to every
+      `idle` milliseconds while there are none. An update posted from the thread that started the
+      queue wakes it at once, while those posted from other threads are picked up within `idle`
+      milliseconds, since only that thread may reschedule the poller. It stops when its widget is
+      destroyed.
+
+      An update may be given a key, in which case it replaces any pending update with the same key
+      (the last write wins) while keeping that update's place in the queue. `Window.postConfigure()`
+      and `Window.postVariable()` key their updates by widget option and by variable.
+
+      The depth of the queue and the latency between posting and running an update are available
+      through `metrics()`.
+  """
+
+  def __init__(self, widget=None, interval=10, budget=8, idle=100):
+    self.widget = widget
+    self.interval = interval
+    self.idle = idle
+    self.budget = budget / 1000
+    self.posted = 0
+    self.coalesced = 0
+    self.drained = 0
+    self.latency = 0.0
+    self.maxLatency = 0.0
+    self._updates = { }
+    self._lock = threading.Lock()
+    self._job = None
+    self._wait = interval
+    self._thread = None
+    self._bound = None
+
+  def post(self, fn, *args, key=None):
     """
-        Sets the icon for the window. Does nothing if the provided argument is an empty string
+        Queues `fn(*args)` to run on the tkinter thread. Safe to call from any thread.
 
         Keyword arguments:
-        + `icon` A string representing the path to the icon to be used
+        + `fn` The function to run
+        + `args` The arguments to call the function with
+        + `key` An optional key; a pending update with the same key is replaced by this one
+
+        Returns: Self for chaining
+    """
+
+    with self._lock:
+      if key is None: key = object()
+      elif key in self._updates: self.coalesced += 1
+
+      self._updates[key] = (fn, args, self._updates[key][2] if key in self._updates else time.monotonic())
+      self.posted += 1
+
+    # An idle poller is woken at once, but only the thread that started it may reschedule it
+    if self._job is not None and self._wait > self.interval and threading.get_ident() == self._thread:
+      self.widget.after_cancel(self._job)
+      self._wait, self._job = self.interval, self.widget.after(self.interval, self.drain)
+
+    return self
+
+  def start(self, widget=None):
+    """ Starts draining the queue using `widget` (or the queue's widget). Call from the tkinter thread, which is recorded. """
+
+    if widget is not None and widget is not self.widget:
+      self.stop()
+      self.widget = widget
+
+    if self._job is None and self.widget is not None:
+      self._thread, self._wait = threading.get_ident(), self.interval
+      self._job = self.widget.after(self.interval, self.drain)
+
+      if self._bound is not self.widget:
+        BACKEND.bind(self.widget, '<Destroy>', self._destroyed)
+        self._bound = self.widget
+    return self
+
+  def stop(self):
+    """ Stops draining the queue; pending updates are kept. Call from the tkinter thread. """
+
+    if self._job is not None: self.widget.after_cancel(self._job)
+    self._job = None
+    return self
+
+  def transfer(self, queue):
+    """
+        Moves the pending updates to another queue, after its own. An update keyed like one already
+        pending in that queue is dropped, as the other is the later one.
+
+        Returns: Self for chaining
+    """
+
+    with self._lock: updates, self._updates = self._updates, { }
+
+    with queue._lock:
+      for key in updates:
+        if key in queue._updates: self.coalesced += 1
+        else: queue._updates[key] = updates[key]
+    return self
+
+  def _destroyed(self, event):
+    # <Destroy> reaches a window for its descendants too; only the widget itself stops the poller
+    if str(event.widget) == str(self.widget): self.stop()
+
+  def drain(self):
+    """ Runs pending updates until the time budget is spent, then reschedules itself. """
+
+    with self._lock:
+      updates, self._updates = self._updates, { }
+
+    items = iter(list(updates.items()))
+    start = time.perf_counter()
+    self._wait = self.interval if updates else min(self._wait * 2, self.idle)
+
+    try:
+      for key, (fn, args, posted) in items:
+        del updates[key]
+        self.drained += 1
+        self.latency = time.monotonic() - posted
+        self.maxLatency = max(self.maxLatency, self.latency)
+
+        fn(*args)
+        if time.perf_counter() - start >= self.budget: break
+    finally:
+      # Updates left over keep their place ahead of those posted while draining
+      if updates:
+        with self._lock:
+          for key in self._updates:
+            if key in updates: self.coalesced += 1
+            updates[key] = self._updates[key]
+          self._updates = updates
+
+      if self._job is not None: self._job = self.widget.after(self._wait, self.drain)
+
+  def metrics(self):
+    """
+        Returns a dictionary of the queue's metrics -- `depth` (pending updates), `posted`,
+        `coalesced` (updates replaced before they ran), `drained`, and `latency` and `maxLatency`,
+        the seconds between posting and running the last update and the longest such wait.
+    """
+
+    with self._lock: depth = len(self._updates)
+
+    return {
+      'depth' : depth, 'posted' : self.posted, 'coalesced' : self.coalesced, 'drained' : self.drained,
+      'latency' : self.latency, 'maxLatency' : self.maxLatency
+    }
+
+class AsyncRunner():
+  """
+      AsyncRunner drives an asyncio event loop from the tkinter event loop, on the tkinter thread, so
+      coroutines are free to use widgets and variables. Coroutine commands and event handlers are
+      scheduled as tasks of the loop (see `wrap()`), and the runner is shared by every window --
+      use `AsyncRunner.get()` to fetch it.
+
+      The loop isn't polled. It's stepped when a task is started, when one of its timers is due, and,
+      on platforms whose tkinter supports `createfilehandler()`, when its selector reports I/O. On
+      other platforms, the loop is stepped every `interval` milliseconds while tasks are pending.
+      Exceptions raised by tasks are reported like those of any tkinter callback.
+
+      asyncio has no public way to wait on a loop from another event loop, so the runner reads the
+      selector, ready queue and timer heap (`_selector`, `_ready` and `_scheduled`) of asyncio's
+      selector event loops, the default on Unix. Loops without them, such as the proactor loop on
+      Windows or uvloop, are stepped every `interval` milliseconds instead, like the platforms above.
+      Both cases are pinned by tests/test_async_runner.py.
+  """
+
+  def __init__(self, widget, loop=None, interval=10):
+    self.widget = widget
+    self.loop = loop if loop else asyncio.new_event_loop()
+    self.interval = interval
+    self.tasks = { }
+    self._job = None
+    self._due = None
+    self._fd = None
+
+    # The selector's descriptor becomes readable when any of the loop's descriptors is ready. The
+    # selector is private to asyncio's selector event loops; other loops are polled (see `step()`)
+    fileno = getattr(getattr(self.loop, '_selector', None), 'fileno', None)
+    if fileno and hasattr(widget.tk, 'createfilehandler'):
+      self._fd = fileno()
+      widget.tk.createfilehandler(self._fd, tkinter.READABLE, lambda fd, mask: self.step())
+
+  @staticmethod
+  def get(loop=None):
+    """ Returns the shared runner, creating it for the tkinter root (and `loop`, if given) if needed. """
+
+    global ASYNC
+
+    if ASYNC is None or ASYNC.loop.is_closed():
+      if not TK: raise Exception("An asyncio loop can't be run before a window exists")
+      ASYNC = AsyncRunner(TK, loop)
+    return ASYNC
+
+  @staticmethod
+  def wrap(func, key=None):
+    """
+        Wraps a coroutine function so that calling it schedules it as a task of the shared runner,
+        cancelling the unfinished task started with the same `key` first, if a key is given.
+
+        Returns: The wrapping function, which returns the task
+    """
+
+    def spawn(*args, **kwargs): return AsyncRunner.get().spawn(func(*args, **kwargs), key)
+    return spawn
+
+  def spawn(self, coro, key=None):
+    """
+        Schedules a coroutine as a task of the loop.
+
+        Keyword arguments:
+        + `coro` The coroutine to run
+        + `key` An optional key; the unfinished task started with the same key is cancelled
+
+        Returns: The task
+    """
+
+    if key is not None and key in self.tasks: self.tasks[key].cancel()
+
+    task = self.loop.create_task(coro)
+    task.add_done_callback(lambda task: self._done(task, key))
+    if key is not None: self.tasks[key] = task
+
+    self.schedule()
+    return task
+
+  def _done(self, task, key):
+    if key is not None and self.tasks.get(key) is task: del self.tasks[key]
+
+    if not task.cancelled() and task.exception() is not None:
+      exc = task.exception()
+      self.widget.report_callback_exception(type(exc), exc, exc.__traceback__)
+
+  def schedule(self, delay=0):
+    """ Schedules a step of the loop in `delay` milliseconds, unless one is due sooner. Returns self for chaining. """
+
+    due = time.monotonic() + delay / 1000
+
+    if self._job is not None:
+      if self._due <= due: return self
+      self.widget.after_cancel(self._job)
+
+    self._due = due
+    self._job = self.widget.after(int(delay), self.step)
+    return self
+
+  def step(self):
+    """ Runs one iteration of the loop, without blocking, and schedules the next step if needed. """
+
+    if self._job is not None:
+      self.widget.after_cancel(self._job)
+      self._job = None
+
+    if self.loop.is_closed() or self.loop.is_running(): return
+
+    self.loop.call_soon(self.loop.stop)
+    self.loop.run_forever()
+
+    # Step again at once for ready callbacks, or when the next timer is due. Without the private
+    # queues of a selector event loop, or without a file handler, fall back to polling
+    ready, scheduled = getattr(self.loop, '_ready', None), getattr(self.loop, '_scheduled', None)
+    delay = None
+
+    if ready:
+      delay = 0
+    elif scheduled:
+      delay = max(0, math.ceil((scheduled[0].when() - self.loop.time()) * 1000))
+
+    if (self._fd is None or ready is None or scheduled is None) and asyncio.all_tasks(self.loop):
+      delay = self.interval if delay is None else min(delay, self.interval)
+
+    if delay is not None: self.schedule(delay)
+
+  def close(self):
+    """ Cancels the pending tasks, waits for them to finish and closes the loop. """
+
+    global ASYNC
+
+    if self._job is not None: self.widget.after_cancel(self._job)
+    if self._fd is not None: self.widget.tk.deletefilehandler(self._fd)
+    self._job, self._fd = None, None
+
+    if not self.loop.is_closed():
+      tasks = asyncio.all_tasks(self.loop)
+      for task in tasks: task.cancel()
+
+      if tasks: self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+      self.loop.close()
+
+    if ASYNC is self: ASYNC = None
+
+class Offload():
+  """
+      Offload runs the bodies of offloaded commands (see `Window.addCommand()`) in executors shared
+      by every window -- a process pool for `process` commands and a thread pool for `thread`
+      commands -- so heavy work doesn't block the tkinter event loop.
+
+      The body of an offloaded command is called with a dictionary of (variable name, value) pairs
+      taken from the window's variables when the command is called, in place of the window. The
+      values must be picklable for process commands, as must the function itself, so it has to be
+      defined at module level; raw commands are sent as marshalled code. Once the body returns, its
+      result is passed as `event` to the command named `done` on the tkinter thread, and exceptions
+      are reported like those of any tkinter callback. While any call is running, the progressbar
+      named `progress` runs in indeterminate mode.
+  """
+
+  KINDS = [ 'process', 'thread' ]
+  EXECUTORS = { }
+
+  @staticmethod
+  def executor(kind):
+    """ Returns the shared executor for `kind`, either `process` or `thread`, creating it if needed. """
+
+    if not kind in Offload.KINDS:
+      raise Exception(f"Invalid offload '{kind}'. Valid: {Offload.KINDS}")
+
+    if not kind in Offload.EXECUTORS:
+      Offload.EXECUTORS[kind] = concurrent.futures.ProcessPoolExecutor() if kind == 'process' else concurrent.futures.ThreadPoolExecutor()
+    return Offload.EXECUTORS[kind]
+
+  @staticmethod
+  def call(code, values):
+    """ Runs marshalled command code with a dictionary of values, in a worker process. """
+
+    return types.FunctionType(marshal.loads(code), globals(), '_command', (None,))(values)
+
+  @staticmethod
+  def wrap(func, kind, done=None, progress=None, inputs=None):
+    """
+        Wraps a command function so that calling it on a window submits the function, called with
+        the window's variable values, to the executor for `kind`.
+
+        Keyword arguments:
+        + `func` The function of the command
+        + `kind` Either `process` or `thread`
+        + `done` The name of the command given the result, if any
+        + `progress` The name of the progressbar shown busy while the command runs, if any
+        + `inputs` The names of the variables passed to the function, or None for all of them
+
+        Returns: The wrapping function, which returns the future of the call
+    """
+
+    executor = Offload.executor(kind)
+
+    # Functions built from raw code can't be pickled by reference, so their code is sent instead
+    raw = func.__code__.co_filename == '<command>'
+    code = marshal.dumps(func.__code__) if kind == 'process' and raw else None
+
+    def submit(win, event=None):
+      values = win.values(inputs)
+      future = executor.submit(Offload.call, code, values) if code else executor.submit(func, values)
+
+      win.busy(progress, True)
+      future.add_done_callback(lambda future: win.post(Offload._finished, win, future, done, progress))
+      return future
+
+    return submit
+
+  @staticmethod
+  def _finished(win, future, done, progress):
+    win.busy(progress, False)
+
+    if future.cancelled(): return
+
+    exc = future.exception()
+    if exc is not None:
+      win.gui.report_callback_exception(type(exc), exc, exc.__traceback__)
+    elif done:
+      win.getCommand(done)(future.result())
+
+class ThrottledVariable():
+  """
+      ThrottledVariable is mixed into tkinter variable classes (see `of()`) to limit how often the
+      variable is written to tkinter. Values given to `set()` are kept in Python, and the latest one
+      is written to tkinter at most `maxRate` times per second, so widgets using the variable and its
+      traces are updated once per write rather than once per `set()`. `get()` returns the pending
+      value while a write is pending, and reads tkinter otherwise; writes made by tkinter itself,
+      such as typing in an Entry, replace the pending value. A `maxRate` of 0 (or None) writes every
+      value straight through.
+  """
+
+  CLASSES = { }
+
+  def __init__(self, master=None, value=None, name=None, maxRate=30):
+    if maxRate is not None and maxRate < 0:
+      raise Exception(f"The maximum rate of a variable must not be negative, not {maxRate}")
+
+    super().__init__(master, value, name)
+
+    self.maxRate = maxRate
+    self._value = super().get()
+    self._dirty = False
+    self._writing = False
+    self._last = 0.0
+    self._job = None
+    self.trace_add('write', self._written)
+
+  @staticmethod
+  def of(_class):
+    """ Returns the throttled subclass of the tkinter variable class `_class`. """
+
+    if not _class in ThrottledVariable.CLASSES:
+      ThrottledVariable.CLASSES[_class] = type('Throttled' + _class.__name__, (ThrottledVariable, _class), { })
+    return ThrottledVariable.CLASSES[_class]
+
+  def set(self, value):
+    self._value = value
+    self._dirty = True
+
+    if not self.maxRate:
+      self.flush()
+    elif self._job is None:
+      wait = max(0.0, self._last + 1 / self.maxRate - time.monotonic())
+      self._job = self._root.after(int(wait * 1000), self.flush)
+
+  def get(self): return self._value if self._dirty else super().get()
+
+  def flush(self):
+    """ Writes the latest value to tkinter now, if it hasn't been written yet. """
+
+    if self._job is not None: self._root.after_cancel(self._job)
+    self._job = None
+
+    if self._dirty:
+      self._dirty, self._writing = False, True
+      try:
+        super().set(self._value)
+      finally:
+        self._writing = False
+      self._last = time.monotonic()
+
+  def _written(self, *args):
+    # A write from tkinter replaces the cached value, and any value not yet written
+    if not self._writing:
+      self._value, self._dirty = super().get(), False
+
+class Histogram():
+  """
+      Histogram counts durations in logarithmic buckets, a quarter of an octave wide, so recording a
+      duration is cheap and percentiles are accurate to about 20%.
+  """
+
+  def __init__(self):
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+    self.buckets = { }
+
+  def add(self, seconds):
+    self.count += 1
+    self.total += seconds
+    if seconds > self.max: self.max = seconds
+
+    bucket = int(math.log2(max(seconds, 1e-6) * 1e6) * 4)
+    self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+  def percentile(self, p):
+    """ Returns the duration, in seconds, below which `p` percent of the durations fall. """
+
+    rank, seen = p / 100 * self.count, 0
+
+    for bucket in sorted(self.buckets):
+      seen += self.buckets[bucket]
+      if seen >= rank: return min(2 ** ((bucket + 1) / 4) / 1e6, self.max)
+    return self.max
+
+  def asDict(self):
+    return {
+      'count' : self.count, 'mean' : self.total / self.count if self.count else 0.0,
+      'p50' : self.percentile(50), 'p99' : self.percentile(99), 'max' : self.max
+    }
+
+class Metrics():
+  """
+      Metrics keeps a Histogram of the durations of each command and event binding, keyed by the
+      command name or by a label of the event and widget such as `<Button-1> on btnOne`. Every
+      command and event binding of a window is timed; the metrics are kept by the window's manager,
+      or by the window if it has none.
+  """
+
+  def __init__(self):
+    self.histograms = { }
+
+  def add(self, key, seconds):
+    if not key in self.histograms: self.histograms[key] = Histogram()
+    self.histograms[key].add(seconds)
+
+  def report(self):
+    """ Returns a dictionary of (key, { `count`, `mean`, `p50`, `p99`, `max` }) pairs, in seconds, slowest p99 first. """
+
+    stats = [(key, self.histograms[key].asDict()) for key in list(self.histograms)]
+    return dict(sorted(stats, key=lambda item: -item[1]['p99']))
+
+  def reset(self):
+    self.histograms = { }
+    return self
+
+class Watchdog():
+  """
+      Watchdog notices when the tkinter thread stops processing events. The tkinter thread beats a
+      heartbeat every `interval` seconds using `after()`, and a watchdog thread checks on it; when a
+      heartbeat is late by `threshold` seconds or more, the Python stack of the tkinter thread is
+      captured and recorded as a stall, along with how long the stall lasted once it's over.
+
+      Stalls are kept in `stalls` (the latest `limit` of them) as dictionaries of `at` (the time it
+      was noticed, from `time.time()`), `duration` (in seconds, growing until the stall is over)
+      and `stack` (formatted stack lines). `onStall`, if given, is called with each stall from the
+      watchdog thread, so it must not use tkinter.
+  """
+
+  def __init__(self, widget, threshold=0.5, interval=0.1, onStall=None, limit=50):
+    self.widget = widget
+    self.threshold = threshold
+    self.interval = interval
+    self.onStall = onStall
+    self.limit = limit
+    self.stalls = [ ]
+    self._beat = time.monotonic()
+    self._ident = None
+    self._job = None
+    self._stop = threading.Event()
+    self._thread = None
+
+  def start(self):
+    """ Starts the heartbeat and the watchdog thread. Call from the tkinter thread. Returns self for chaining. """
+
+    if self._thread is not None: return self
+
+    # Each run has its own stop event, so a thread that's still winding down from the last run
+    # isn't restarted along with the new one
+    self._ident, self._stop = threading.get_ident(), threading.Event()
+    self._heartbeat()
+
+    self._thread = threading.Thread(target=self._watch, args=(self._stop, ), name='tkjson-watchdog', daemon=True)
+    self._thread.start()
+    return self
+
+  def stop(self):
+    """ Stops the watchdog. Call from the tkinter thread. Returns self for chaining. """
+
+    self._stop.set()
+    if self._job is not None: self.widget.after_cancel(self._job)
+    self._job, self._thread = None, None
+    return self
+
+  def _heartbeat(self):
+    self._beat = time.monotonic()
+    self._job = self.widget.after(int(self.interval * 1000), self._heartbeat)
+
+  def _watch(self, stop):
+    stall = None
+
+    while not stop.wait(self.interval):
+      late = time.monotonic() - self._beat - self.interval
+
+      if late < self.threshold:
+        stall = None
+      elif stall is not None:
+        stall['duration'] = late
+      else:
+        frame = sys._current_frames().get(self._ident)
+        stall = { 'at' : time.time(), 'duration' : late, 'stack' : traceback.format_stack(frame) if frame else [ ] }
+
+        self.stalls = (self.stalls + [ stall ])[-self.limit:]
+        if self.onStall: self.onStall(stall)
+
+class EventDispatcher():
+  """
+      EventDispatcher binds event handlers to widgets and canvas tags with a single tkinter binding
+      per (widget, event) or (canvas, tag, event), which calls every handler in turn -- unlike
+      `bind()` without `add`, a handler never replaces the one bound before it. Handlers may be
+      throttled or debounced (see `limit()`), and the handlers of motion events are called at most
+      once per frame (`MOTION_FRAME` milliseconds) with the latest event. If any handler returns
+      'break', the event isn't passed on to the next binding tags, except for motion events.
+  """
+
+  MOTION_FRAME = 16
+
+  def __init__(self, widget, window=None):
+    self.widget = widget
+    self.window = window
+    self.bindings = { }
+
+  def bind(self, target, sequence, func, throttle=None, debounce=None, tag=None):
+    """
+        Adds a handler for an event of a widget, or of the items of a canvas with a tag.
+
+        Keyword arguments:
+        + `target` The widget
+        + `sequence` The event sequence, as defined by tkinter
+        + `func` The handler, called with the event. Coroutine functions are scheduled as tasks
+        + `throttle` If given, the handler runs at most once every `throttle` milliseconds
+        + `debounce` If given, the handler only runs once no event came for `debounce` milliseconds
+        + `tag` The canvas tag, for canvas item events
+
+        Returns: Self for chaining
+    """
+
+    key = (str(target), tag, sequence)
+
+    if not key in self.bindings:
+      def dispatch(event, key=key): return self._dispatch(key, event)
+
+      funcid = BACKEND.bind(target, sequence, dispatch, tag)
+      self.bindings[key] = { 'target' : target, 'funcid' : funcid, 'handlers' : [ ], 'pending' : None, 'label' : self._label(target, sequence, tag) }
+
+    call = AsyncRunner.wrap(func) if inspect.iscoroutinefunction(func) else func
+    self.bindings[key]['handlers'].append((func, self.limit(call, throttle, debounce)))
+    return self
+
+  def unbind(self, target, sequence, func=None, tag=None):
+    """
+        Removes a handler added with `bind()`, or every handler of the event if `func` is None. The
+        tkinter binding is removed along with the last handler, leaving other bindings in place.
+
+        Returns: Self for chaining
+    """
+
+    key = (str(target), tag, sequence)
+    if not key in self.bindings: return self
+
+    binding = self.bindings[key]
+    binding['handlers'] = [h for h in binding['handlers'] if func is not None and h[0] != func]
+
+    if not binding['handlers']:
+      del self.bindings[key]
+      BACKEND.unbind(target, sequence, binding['funcid'], tag)
+
+    return self
+
+  def forget(self, target, unbind=False):
+    """
+        Drops the bindings of a widget, of its canvas tags included. When the widget is destroyed,
+        tkinter removes its bindings; for a widget that lives on, use `unbind` to remove them too.
+
+        Returns: Self for chaining
+    """
+
+    for key in [key for key in self.bindings if key[0] == str(target)]:
+      binding = self.bindings.pop(key)
+      if unbind: BACKEND.unbind(binding['target'], key[2], binding['funcid'], key[1])
+    return self
+
+  def limit(self, func, throttle=None, debounce=None):
+    """
+        Wraps an event handler so that it runs at most once every `throttle` milliseconds, with the
+        last event of each interval delivered at its end, or only once no event came for `debounce`
+        milliseconds, with the last event.
+
+        Returns: The wrapping function, or `func` itself if neither is given
+    """
+
+    state = { 'job' : None, 'event' : None, 'last' : 0.0 }
+
+    def run():
+      state['job'], state['last'] = None, time.monotonic()
+      func(state['event'])
+
+    def debounced(event):
+      if state['job'] is not None: self.widget.after_cancel(state['job'])
+      state['event'], state['job'] = event, self.widget.after(int(debounce), run)
+
+    def throttled(event):
+      wait = state['last'] + throttle / 1000 - time.monotonic()
+
+      if wait <= 0 and state['job'] is None:
+        state['last'] = time.monotonic()
+        return func(event)
+
+      state['event'] = event
+      if state['job'] is None: state['job'] = self.widget.after(max(1, int(wait * 1000)), run)
+
+    if debounce: return debounced
+    elif throttle: return throttled
+    else: return func
+
+  def _dispatch(self, key, event):
+    binding = self.bindings.get(key)
+    if binding is None: return None
+
+    # Motion events are delivered once per frame, with the latest position
+    if 'Motion' in key[2]:
+      if binding['pending'] is None: self.widget.after(EventDispatcher.MOTION_FRAME, lambda: self._fire(key))
+      binding['pending'] = event
+      return None
+
+    return self._fire(key, event)
+
+  def _fire(self, key, event=None):
+    binding = self.bindings.get(key)
+    if binding is None: return None
+
+    if event is None: event, binding['pending'] = binding['pending'], None
+
+    result, start = None, time.perf_counter()
+
+    try:
+      for func, call in list(binding['handlers']):
+        if call(event) == 'break': result = 'break'
+    finally:
+      if self.window is not None: self.window.metrics.add(binding['label'], time.perf_counter() - start)
+
+    return result
+
+  def _label(self, target, sequence, tag=None):
+    """ Returns the metrics key of a binding, such as `<Button-1> on btnOne`. """
+
+    name = 'window' if target is self.widget else (self.window.findName(target) if self.window else None) or str(target)
+    return f"{sequence} on {name}{'/' + tag if tag else ''}"
+
+class Profiler():
+  """
+      Profiler records the wall time and call count of the phases of building windows -- `parse`,
+      `window`, `commands`, `events`, `menu`, `variables`, `construct`, `geometry` and `strokes` --
+      per window, along with the time spent building each widget and each category of widgets.
+      Phase times are exclusive, so a phase nested in another isn't counted twice.
+
+      A manager profiles its builds when created with `profile=True` (see `WindowManager.buildRaw()`)
+      or when the `TKJSON_PROFILE` environment variable is set to anything but an empty string, '0',
+      'false' or 'no'; otherwise, it uses `NULL_PROFILER`, whose methods do nothing. The data is
+      available through `report()` and `json()`.
+  """
+
+  enabled = True
+
+  def __init__(self):
+    self.current = None
+    self.phases = { }
+    self.categories = { }
+    self.widgets = { }
+    self._stack = [ ]
+
+  @staticmethod
+  def requested():
+    """ Returns whether the `TKJSON_PROFILE` environment variable turns profiling on. """
+
+    return not os.environ.get('TKJSON_PROFILE', '').strip().lower() in [ '', '0', 'false', 'no' ]
+
+  @staticmethod
+  def _add(table, key, seconds):
+    entry = table.setdefault(key, [ 0, 0.0 ])
+    entry[0] += 1
+    entry[1] += seconds
+
+  @contextlib.contextmanager
+  def phase(self, name):
+    """ Times a build phase of the current window. """
+
+    start = time.perf_counter()
+    self._stack.append(0.0)
+
+    try:
+      yield
+    finally:
+      elapsed = time.perf_counter() - start
+      Profiler._add(self.phases, (self.current, name), elapsed - self._stack.pop())
+      if self._stack: self._stack[-1] += elapsed
+
+  @contextlib.contextmanager
+  def widget(self, category, name):
+    """ Times the build of a widget of the current window. """
+
+    start = time.perf_counter()
+
+    try:
+      yield
+    finally:
+      elapsed = time.perf_counter() - start
+      Profiler._add(self.categories, (self.current, category), elapsed)
+      self.widgets[(self.current, name)] = [ category, self.widgets.get((self.current, name), [ None, 0.0 ])[1] + elapsed ]
+
+  @contextlib.contextmanager
+  def window(self, name):
+    """ Attributes what's recorded inside the block to the window `name`. """
+
+    previous, self.current = self.current, name
+
+    try:
+      yield
+    finally:
+      self.current = previous
+
+  def report(self, top=10):
+    """
+        Returns the recorded data as a dictionary of:
+        + `total` The seconds spent in all phases
+        + `phases` A dictionary of (phase, { `count`, `seconds` }) pairs, over every window
+        + `windows` A dictionary of (window, { `phases`, `categories` }) pairs, where `phases` is as
+          above and `categories` is a dictionary of (category, { `count`, `seconds` }) pairs
+        + `slowest` The `top` slowest widgets, as dictionaries of `window`, `name`, `category` and
+          `seconds`
+    """
+
+    entry = lambda e: { 'count' : e[0], 'seconds' : e[1] }
+    phases, windows = { }, { }
+
+    for (win, name), (count, seconds) in self.phases.items():
+      total = phases.setdefault(name, [ 0, 0.0 ])
+      total[0], total[1] = total[0] + count, total[1] + seconds
+      if win is not None: windows.setdefault(win, { 'phases' : { }, 'categories' : { } })['phases'][name] = entry((count, seconds))
+
+    for (win, category), e in self.categories.items():
+      windows.setdefault(win, { 'phases' : { }, 'categories' : { } })['categories'][category] = entry(e)
+
+    slowest = sorted(self.widgets.items(), key=lambda item: -item[1][1])[:top]
+
+    return {
+      'total' : sum([e[1] for e in phases.values()]),
+      'phases' : dict([(name, entry(e)) for name, e in phases.items()]),
+      'windows' : windows,
+      'slowest' : [ { 'window' : win, 'name' : name, 'category' : category, 'seconds' : seconds }
+        for (win, name), (category, seconds) in slowest ]
+    }
+
+  def json(self, top=10, indent=2):
+    """ Returns `report()` as JSON-formatted text. """
+
+    return json.dumps(self.report(top), indent=indent)
+
+class NullProfiler():
+  """ NullProfiler stands in for Profiler when profiling is off. Its methods do nothing. """
+
+  enabled = False
+  _context = contextlib.nullcontext()
+
+  def phase(self, name): return NullProfiler._context
+
+  def widget(self, category, name): return NullProfiler._context
+
+  def window(self, name): return NullProfiler._context
+
+  def report(self, top=10): return None
+
+  def json(self, top=10, indent=2): return None
+
+NULL_PROFILER = NullProfiler()
+
+class StrokeIndex():
+  """
+      StrokeIndex is a uniform grid over the bounding boxes of canvas strokes. It finds the strokes
+      that intersect an area, or contain a point, without creating or asking tkinter about any
+      canvas item. Strokes are referred to by the order in which they were added.
+  """
+
+  def __init__(self, cell=256):
+    self.cell = cell
+    self.cells = { }
+    self.boxes = [ ]
+
+  def _keys(self, box):
+    c = self.cell
+    return [(cx, cy) for cx in range(int(box[0] // c), int(box[2] // c) + 1) for cy in range(int(box[1] // c), int(box[3] // c) + 1)]
+
+  def add(self, box):
+    """ Adds a (x0, y0, x1, y1) bounding box to the index, and returns its stroke index. """
+
+    self.boxes.append(box)
+    for key in self._keys(box): self.cells.setdefault(key, set()).add(len(self.boxes) - 1)
+    return len(self.boxes) - 1
+
+  def move(self, i, box):
+    """ Replaces the bounding box of the stroke with index `i`. """
+
+    for key in self._keys(self.boxes[i]): self.cells[key].discard(i)
+    self.boxes[i] = box
+    for key in self._keys(box): self.cells.setdefault(key, set()).add(i)
+
+  def query(self, x0, y0, x1, y1):
+    """ Returns the set of indices of the strokes whose bounding boxes intersect the given area. """
+
+    found = set()
+    for key in self._keys((x0, y0, x1, y1)):
+      if key in self.cells: found.update(self.cells[key])
+
+    boxes = self.boxes
+    return set([i for i in found if boxes[i][0] <= x1 and boxes[i][2] >= x0 and boxes[i][1] <= y1 and boxes[i][3] >= y0])
+
+  def at(self, x, y):
+    """ Returns the indices of the strokes whose bounding boxes contain a point, topmost first. """
+
+    return sorted(self.query(x, y, x, y), reverse=True)
+
+  @staticmethod
+  def bounds(coords, pad=0):
+    """ Returns the bounding box of a flat list of coordinates, grown by `pad` on each side. """
+
+    xs, ys = coords[0::2], coords[1::2]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+class CulledCanvas():
+  """
+      CulledCanvas keeps the strokes of a canvas in a StrokeIndex, and only creates canvas items for
+      the strokes that intersect the visible part of the canvas, plus a margin. Items are created,
+      and hidden for recycling, as the canvas is resized, scrolled or zoomed; a hidden item is reused
+      by the next stroke with the same type and options.
+
+      Because items come and go, stroke events are bound to the canvas itself, through the window's
+      EventDispatcher, and dispatched by hit testing the pointer against the stroke bounding boxes,
+      topmost stroke first. As the pointer doesn't enter or leave the canvas when it moves between
+      strokes, `<Enter>` and `<Leave>` can't be bound to the strokes of a culled canvas. Strokes are
+      named and addressed by their index rather than by item id -- use `item()` for the current item.
+
+      Scrolling is detected through the canvas' `xscrollcommand` and `yscrollcommand`, which are
+      wrapped (and still called) when the canvas is culled, and again whenever they're configured
+      through the window. Call `refresh()` after any other change of the view.
+  """
+
+  POOL_LIMIT = 256
+  SCROLL_OPTIONS = [ 'xscrollcommand', 'yscrollcommand' ]
+
+  def __init__(self, window, name, cell=256, margin=128):
+    self.window = window
+    self.name = name
+    self.canvas: tkinter.Canvas = window.canvases.getWidget(name)
+    self.index = StrokeIndex(cell)
+    self.margin = margin
+    self.strokes = [ ]
+    self.pads = [ ]
+    self.names = { }
+    self.live = { }
+    self.pool = { }
+    self.scale = 1.0
+    self.offset = (0.0, 0.0)
+    self._events = set()
+    self._job = None
+    self._scrollCommands = { }
+
+    window.events.bind(self.canvas, '<Configure>', self.schedule)
+    options = dict([(option, self.canvas.cget(option)) for option in CulledCanvas.SCROLL_OPTIONS])
+    self.canvas.configure(**self.scrollOptions(options))
+
+  def scrollOptions(self, options):
+    """
+        Returns the canvas options `options`, with the scroll commands in them wrapped so that they
+        also refresh the view. The window passes the options it configures the canvas with through here.
+    """
+
+    return dict([(k, self._wrapScroll(k, v) if k in CulledCanvas.SCROLL_OPTIONS else v) for k, v in options.items()])
+
+  def _wrapScroll(self, option, command):
+    original = self.canvas.tk.splitlist(str(command)) if command and not callable(command) else ()
+
+    def scrolled(*args):
+      if callable(command): command(*args)
+      elif original: self.canvas.tk.call(*(original + args))
+      self.schedule()
+
+    # The wrapper replaced by this one is no longer needed
+    if option in self._scrollCommands: self.canvas.deletecommand(self._scrollCommands[option])
+    self._scrollCommands[option] = self.canvas.register(scrolled)
+    return self._scrollCommands[option]
+
+  def add(self, strokes):
+    """
+        Adds strokes to the index, creating items for those that are visible on the next refresh.
+
+        Keyword arguments:
+        + `strokes` The list of stroke dictionaries to add, as described in `Window.addWidgets()`
+
+        Returns: A dictionary of (stroke name, stroke index) pairs for the named strokes
+    """
+
+    names = { }
+
+    for stroke in strokes:
+      if stroke['type'] == 'widget': continue
+      if not stroke['type'] in STROKE_TYPES:
+        raise Exception(f"Invalid stroke type provided: '{stroke['type']}'")
+
+      named = stroke['named'] if 'named' in stroke else { }
+      coords = CulledCanvas.values(stroke['unnamed'])
+      width = named['width'] if 'width' in named and named['width'].__class__.__name__ in ['int', 'float'] else 1
+      events = stroke['events'] if 'events' in stroke else { }
+
+      options = Window._options(dict(named, tags=Window._tags(named.get('tags')) + (CULL_TAG,)))
+      handlers = dict([(ev, [self.window._resolveHandler(func) for func in events[ev]]) for ev in events])
+
+      i = self.index.add(StrokeIndex.bounds(coords, width / 2))
+      self.strokes.append((stroke['type'], options, coords, handlers))
+      self.pads.append(width / 2)
+      if 'name' in stroke: names[stroke['name']] = i
+
+      for ev in handlers:
+        if ev.strip('<>').split('-')[-1] in [ 'Enter', 'Leave' ]:
+          raise Exception(f"'{ev}' can't be bound to the strokes of the culled canvas '{self.name}'")
+        if not ev in self._events:
+          self._events.add(ev)
+          self.window.events.bind(self.canvas, ev, lambda event, ev=ev: self._hit(ev, event))
+
+    self.names.update(names)
+    self.schedule()
+    return names
+
+  def update(self, coords):
+    """
+        Replaces the coordinates of strokes, moving their items if they're live.
+
+        Keyword arguments:
+        + `coords` A dictionary of (stroke name or index, coordinates) pairs
+
+        Returns: Self for chaining
+    """
+
+    pairs = [ ]
+
+    for name in coords:
+      i = name if 'int' in str(type(name)) else self.names.get(name)
+      if i is None or i >= len(self.strokes):
+        raise Exception(f"No stroke named '{name}' was found on the canvas")
+
+      sType, options, old, handlers = self.strokes[i]
+      values = CulledCanvas.values(coords[name])
+
+      self.strokes[i] = (sType, options, values, handlers)
+      self.index.move(i, StrokeIndex.bounds(values, self.pads[i]))
+      if i in self.live: pairs += [ self.live[i], self._project(values) ]
+
+    if pairs:
+      self.canvas.tk.eval(TCL_PROCS)
+      self.canvas.tk.call('tkjson_coords', self.canvas._w, tuple(pairs))
+
+    self.schedule()
+    return self
+
+  def item(self, name):
+    """ Returns the current item id of a stroke, by name or index, or None if it isn't live. """
+
+    return self.live.get(name if 'int' in str(type(name)) else self.names.get(name))
+
+  def schedule(self, event=None):
+    """ Schedules a refresh of the live items for when tkinter is idle. """
+
+    if self._job is None: self._job = self.canvas.after_idle(self.refresh)
+
+  def refresh(self):
+    """
+        Creates items for the strokes in view, and recycles the items of strokes out of view.
+
+        Returns: Self for chaining
+    """
+
+    self._job = None
+    canvas, m, s, (tx, ty) = self.canvas, self.margin, self.scale, self.offset
+
+    x0, y0 = canvas.canvasx(0), canvas.canvasy(0)
+    x1, y1 = x0 + canvas.winfo_width(), y0 + canvas.winfo_height()
+    visible = self.index.query((x0 - m - tx) / s, (y0 - m - ty) / s, (x1 + m - tx) / s, (y1 + m - ty) / s)
+
+    for i in [i for i in self.live if not i in visible]:
+      self._recycle(i)
+
+    new = sorted([i for i in visible if not i in self.live])
+    runs, created = [ ], [ ]
+
+    for i in new:
+      sType, options, coords, handlers = self.strokes[i]
+      pool = self.pool.get((sType, options))
+
+      if pool:
+        item = pool.pop()
+        canvas.coords(item, self._project(coords))
+        canvas.itemconfigure(item, state='normal')
+        self.live[i] = item
+      else:
+        created.append(i)
+        if runs and runs[-1][0] == sType and runs[-1][1] == options:
+          runs[-1][2].append(self._project(coords))
+        else:
+          runs.append((sType, options, [ self._project(coords) ]))
+
+    if runs:
+      for i, item in zip(created, Window._createStrokes(canvas, runs)): self.live[i] = item
+
+    # Keep the stacking order of the strokes by lowering new items below the next live stroke
+    if new:
+      order = sorted(self.live)
+      for i in new:
+        k = bisect.bisect_right(order, i)
+        if k < len(order):
+          canvas.tag_lower(self.live[i], self.live[order[k]])
+        else:
+          canvas.tag_raise(self.live[i])
+
+    return self
+
+  def zoom(self, factor, x=0, y=0):
+    """
+        Scales the canvas strokes by `factor` around the canvas point (x, y).
+
+        Returns: Self for chaining
+    """
+
+    self.canvas.scale(CULL_TAG, x, y, factor, factor)
+    self.scale *= factor
+    self.offset = ((self.offset[0] - x) * factor + x, (self.offset[1] - y) * factor + y)
+
+    self.schedule()
+    return self
+
+  def _project(self, coords):
+    if self.scale == 1.0 and self.offset == (0.0, 0.0): return coords
+
+    s, (tx, ty) = self.scale, self.offset
+    return [v * s + (ty if k % 2 else tx) for k, v in enumerate(coords)]
+
+  def _recycle(self, i):
+    item = self.live.pop(i)
+    pool = self.pool.setdefault(self.strokes[i][:2], [ ])
+
+    if len(pool) < CulledCanvas.POOL_LIMIT:
+      self.canvas.itemconfigure(item, state='hidden')
+      pool.append(item)
+    else:
+      self.canvas.delete(item)
+
+  def _hit(self, ev, event):
+    s, (tx, ty) = self.scale, self.offset
+    x, y = (self.canvas.canvasx(event.x) - tx) / s, (self.canvas.canvasy(event.y) - ty) / s
+
+    for i in self.index.at(x, y):
+      if ev in self.strokes[i][3]:
+        for func in self.strokes[i][3][ev]: func(event)
+        return
+
+  @staticmethod
+  def values(coords):
+    """ Converts stroke coordinates, from a list or a buffer of numbers, to a flat list of floats. """
+
+    if coords.__class__.__name__ in ['list', 'tuple']: return [float(v) for v in coords]
+
+    if numpy is not None and isinstance(coords, numpy.ndarray):
+      coords = numpy.ascontiguousarray(coords).reshape(-1)
+
+    view = memoryview(coords)
+    if view.ndim != 1: view = view.cast('B').cast(view.format)
+
+    return [float(v) for v in view.tolist()]
+
+class RowSource():
+  """
+      RowSource gives indexed access to the rows of a virtual Listbox or Treeview. The source may be
+      a sequence (anything with a length and indexing), a function of the row index together with a
+      row count, or an iterator together with a row count. Rows read from an iterator are kept as
+      they're consumed, so that earlier rows stay available.
+  """
+
+  def __init__(self, source, count=None):
+    self.source = source
+    self.rows = None
+    self.count = count
+
+    if hasattr(source, '__getitem__') and hasattr(source, '__len__'):
+      self.count = len(source) if count is None else count
+    elif count is None:
+      raise Exception("A row count is required for row sources without a length")
+    elif not callable(source):
+      self.source, self.rows = iter(source), [ ]
+
+  def __len__(self): return self.count
+
+  def __getitem__(self, i):
+    if self.rows is not None:
+      try:
+        while len(self.rows) <= i: self.rows.append(next(self.source))
+      except StopIteration:
+        # The iterator ended before the declared count, so the rows read are all there are
+        self.count = len(self.rows)
+        raise IndexError(f"Row {i} is past the end of the source, which has {self.count} rows")
+      return self.rows[i]
+    elif hasattr(self.source, '__getitem__'):
+      return self.source[i]
+    else:
+      return self.source(i)
+
+class VirtualView():
+  """
+      VirtualView binds a Listbox or Treeview to a large RowSource without inserting every row. Only
+      the visible rows, plus `buffer` rows, exist in the widget; scrolling with the mouse wheel, the
+      keyboard or an attached scrollbar refills them from the source. Selected rows are tracked by
+      row index, so a selection survives scrolling.
+
+      Treeview rows may be a dictionary of `text` and `values`, a list or tuple of values, or a
+      string for the item text; Listbox rows are converted to strings.
+  """
+
+  def __init__(self, window, name, source, count=None, buffer=5):
+    self.window = window
+    self.name = name
+    self.widget = window.findWidget(name)
+    self.tree = 'Treeview' == self.widget.__class__.__name__
+    self.buffer = buffer
+    self.top = 0
+    self.selected = set()
+    self.scrollbar = None
+    self._items = [ ]
+    self.source = RowSource(source, count)
+
+    events = window.events
+    for ev in [ '<MouseWheel>', '<Button-4>', '<Button-5>', '<Prior>', '<Next>', '<Home>', '<End>' ]:
+      events.bind(self.widget, ev, self._scrolled)
+    for ev in [ '<Up>', '<Down>' ]:
+      events.bind(self.widget, ev, self._stepped)
+    events.bind(self.widget, '<<TreeviewSelect>>' if self.tree else '<<ListboxSelect>>', self._selected)
+    events.bind(self.widget, '<Configure>', lambda event: self.refresh())
+
+    if not self.tree: self.widget.delete(0, 'end')
+    self.refresh()
+
+  @property
+  def page(self):
+    """ The number of rows fully visible in the widget, or its `height` option until it's displayed. """
+
+    rows = self._items[:2] if self.tree else [ 0, 1 ][:self.widget.size()]
+    boxes = [self.widget.bbox(row) for row in rows] if self.widget.winfo_ismapped() else [ ]
+
+    # The distance between two rows includes their spacing, which the height of a box leaves out
+    if len(boxes) == 2 and boxes[0] and boxes[1] and boxes[1][1] > boxes[0][1]:
+      return max(1, (self.widget.winfo_height() - boxes[0][1]) // (boxes[1][1] - boxes[0][1]))
+    return int(self.widget.cget('height') or 10)
+
+  def setSource(self, source, count=None):
+    """
+        Replaces the rows of the view, clearing the selection and scrolling to the top.
+
+        Returns: Self for chaining
+    """
+
+    self.source = RowSource(source, count)
+    self.selected, self.top = set(), 0
+    return self.refresh()
+
+  def attachScrollbar(self, scrollbar):
+    """
+        Connects a Scrollbar to the view, so that it reflects and controls the scroll position.
+
+        Returns: Self for chaining
+    """
+
+    self.scrollbar = scrollbar
+    scrollbar.configure(command=self.yview)
+    return self.refresh()
+
+  def selection(self): return sorted(self.selected)
+
+  def select(self, rows):
+    """ Selects the given row indices, replacing the selection. Returns self for chaining. """
+
+    self.selected = set(rows)
+    return self.refresh()
+
+  def see(self, row):
+    """ Scrolls the view so that the row with index `row` is visible. Returns self for chaining. """
+
+    if row < self.top or row >= self.top + self.page:
+      self.top = row
+    return self.refresh()
+
+  def yview(self, *args):
+    """ Scrolls the view using the same arguments as tkinter's `yview`, e.g. from a Scrollbar. """
+
+    if args and args[0] == 'moveto':
+      self.top = int(float(args[1]) * len(self.source))
+    elif args and args[0] == 'scroll':
+      self.top += int(args[1]) * (self.page if args[2] == 'pages' else 1)
+    self.refresh()
+
+  def refresh(self):
+    """
+        Refills the widget with the rows in view, and updates its selection and scrollbar.
+
+        Returns: Self for chaining
+    """
+
+    total, page = len(self.source), self.page
+    self.top = max(0, min(self.top, total - page))
+    rows = self._rows(page + self.buffer)
+
+    # The source turned out shorter than its count, which has been corrected
+    if len(self.source) < total: return self.refresh()
+
+    if self.tree:
+      self._fillTree(rows)
+    else:
+      self.widget.delete(0, 'end')
+      if rows: self.widget.insert(0, *rows)
+      self.widget.selection_clear(0, 'end')
+
+    inView = [i - self.top for i in self.selected if self.top <= i < self.top + len(rows)]
+    if self.tree:
+      self.widget.selection_set([self._items[i] for i in inView])
+    else:
+      for i in inView: self.widget.selection_set(i)
+
+    if self.scrollbar and total:
+      self.scrollbar.set(self.top / total, min(1.0, (self.top + page) / total))
+
+    return self
+
+  def _rows(self, count):
+    """ Returns up to `count` rows of the source, starting with the top row of the view. """
+
+    rows = [ ]
+    for i in range(self.top, min(len(self.source), self.top + count)):
+      try:
+        rows.append(self.source[i])
+      except IndexError:
+        break
+    return rows
+
+  def _fillTree(self, rows):
+    tree = self.widget
+
+    # Reuse the items of the view, creating or deleting the difference
+    while len(self._items) < len(rows): self._items.append(tree.insert('', 'end'))
+    if len(self._items) > len(rows):
+      tree.delete(*self._items[len(rows):])
+      del self._items[len(rows):]
+
+    for item, row in zip(self._items, rows):
+      if row.__class__.__name__ == 'dict':
+        tree.item(item, text=row['text'] if 'text' in row else '', values=row['values'] if 'values' in row else ())
+      elif row.__class__.__name__ in ['list', 'tuple']:
+        tree.item(item, values=row)
+      else:
+        tree.item(item, text=row)
+
+    tree.selection_set(())
+
+  def _scrolled(self, event):
+    keys = { 'Prior' : -self.page, 'Next' : self.page, 'Home' : -len(self.source), 'End' : len(self.source) }
+
+    if event.num == 4:
+      self.top -= 3
+    elif event.num == 5:
+      self.top += 3
+    elif event.keysym in keys:
+      self.top += keys[event.keysym]
+    elif event.delta:
+      self.top -= 3 if event.delta > 0 else -3
+
+    self.refresh()
+    return 'break'
+
+  def _stepped(self, event):
+    # Within the view, tkinter moves the active row and the selection itself
+    step = -1 if event.keysym == 'Up' else 1
+    row = self._active() + step
+    if 0 <= row < self.page: return None
+
+    # At its edges, scroll by a row and do what tkinter would, on the row now at the edge
+    if not 0 <= self.top + row < len(self.source): return 'break'
+    self.top += step
+    row = min(max(0, row), self.page - 1)
+
+    if str(self.widget.cget('selectmode') or 'browse') in [ 'browse', 'extended' ]:
+      self.selected = set([ self.top + row ])
+    self.refresh()
+
+    if self.tree:
+      if row < len(self._items): self.widget.focus(self._items[row])
+    else:
+      self.widget.activate(row)
+    self.widget.event_generate('<<TreeviewSelect>>' if self.tree else '<<ListboxSelect>>')
+    return 'break'
+
+  def _active(self):
+    """ Returns the position of the active row of the widget, within the view. """
+
+    if self.tree:
+      item = self.widget.focus()
+      return self._items.index(item) if item in self._items else 0
+    return int(self.widget.index('active') or 0)
+
+  def _selected(self, event=None):
+    # Rows of the view follow the selection of the widget; rows out of view keep their state
+    if self.tree:
+      current = [self._items.index(item) for item in self.widget.selection() if item in self._items]
+    else:
+      current = self.widget.curselection()
+
+    count = len(self._items) if self.tree else self.widget.size()
+    if current and str(self.widget.cget('selectmode')) in [ 'browse', 'single' ]:
+      self.selected = set()
+
+    self.selected = set([i for i in self.selected if not self.top <= i < self.top + count])
+    self.selected.update([self.top + i for i in current])
+
+class TkBackend():
+  """
+      TkBackend is the widget backend windows are built with. Windows construct, place, bind and
+      configure their widgets, and create their variables and images, through the active backend,
+      which is `BACKEND` -- see `useBackend()`. This backend uses tkinter itself.
+
+      If `record` is true, every construction, placement, binding and configuration is appended to
+      `log` as a tuple of the action, the widget's path and the arguments, where functions are
+      written as `'<function>'` and variables as `'<variable>'`. The paths of the widgets are those
+      given by tkinter, so the logs of two runs can be compared directly.
+
+      A backend may be used as a context manager, which makes it the active backend for the block.
+  """
+
+  def __init__(self, record=False):
+    self.log = [ ] if record else None
+    self.tk = None
+    self.thread = None
+    self._previous = [ ]
+
+  def __enter__(self):
+    self._previous.append(useBackend(self))
+    return self
+
+  def __exit__(self, *exc):
+    useBackend(self._previous.pop())
+
+  def record(self, action, widget, *args):
+    if self.log is not None: self.log.append((action, str(widget)) + tuple(TkBackend.describe(arg) for arg in args))
+
+  @staticmethod
+  def describe(value):
+    """ Returns a comparable description of an option value, as used in the log. """
+
+    if value.__class__.__name__ == 'dict':
+      return dict([(key, TkBackend.describe(value[key])) for key in value])
+    elif value.__class__.__name__ in [ 'list', 'tuple' ]:
+      return [ TkBackend.describe(item) for item in value ]
+    elif isinstance(value, (tkinter.Variable, RecordedVariable)):
+      return '<variable>'
+    elif hasattr(value, '_w'):
+      return str(value)
+    elif callable(value):
+      return '<function>'
+    return value
+
+  def widgetClass(self, _class): return _class
+
+  def createRoot(self):
+    """ Creates the root window of the application. Returns: The root window """
+
+    self.tk = self.widgetClass(tkinter.Tk)()
+    self.record('construct', self.tk, 'Tk', { })
+    return self.tk
+
+  def construct(self, _class, master=None, options={}):
+    """
+        Constructs a widget.
+
+        Keyword arguments:
+        + `_class` The tkinter class of the widget, such as `tkinter.Button`
+        + `master` The parent of the widget, or None for the root window
+        + `options` The options passed to the widget's constructor
+
+        Returns: The widget
+    """
+
+    _class, name = self.widgetClass(_class), _class.__name__
+    widget = _class(**options) if master is None else _class(master, **options)
+    self.record('construct', widget, name, options)
+    return widget
+
+  def geometry(self, widget, mode, options={}):
+    """ Places a widget using the `place`, `pack` or `grid` geometry mode. Does nothing for the 'none' mode. """
+
+    if mode == 'none': return
+    getattr(widget, mode)(**options)
+    self.record('geometry', widget, mode, options)
+
+  def bind(self, widget, sequence, func, tag=None):
+    """ Adds a binding of `func` to a widget, or to a tag of a canvas if `tag` is given. Returns: The binding's id """
+
+    self.record('bind', widget, sequence, tag)
+    return widget.bind(sequence, func, add='+') if tag is None else widget.tag_bind(tag, sequence, func, add='+')
+
+  def unbind(self, widget, sequence, funcid, tag=None):
+    """ Removes a single binding made by `bind()`, keeping the other bindings of the sequence. """
+
+    self.record('unbind', widget, sequence, tag)
+
+    # Remove only the binding's line of the binding script
+    args = ('bind', widget._w, sequence) if tag is None else (widget._w, 'bind', tag, sequence)
+    script = widget.tk.call(*args)
+    widget.tk.call(*(args + ('\n'.join([ln for ln in str(script).split('\n') if not funcid in ln]),)))
+    widget.deletecommand(funcid)
+
+  def configure(self, widget, options):
+    widget.configure(**options)
+    self.record('configure', widget, options)
+
+  def variable(self, _class, maxRate=None):
+    """ Creates a variable of the given tkinter class, throttled if `maxRate` is given -- see `ThrottledVariable`. """
+
+    return ThrottledVariable.of(_class)(maxRate=maxRate) if maxRate else _class()
+
+  def image(self, path): return tkinter.PhotoImage(file=path)
+
+class RecordingBackend(TkBackend):
+  """
+      RecordingBackend builds windows out of RecordedWidgets, which keep their options, geometry,
+      bindings and children in Python instead of tkinter, so layouts can be built, validated and
+      timed without a display. Every action is recorded in `log`, as with `TkBackend(record=True)`.
+
+      Timers are kept in `jobs`, in milliseconds of a virtual clock, `clock`, which only moves
+      through `run()`. `update()`, `update_idletasks()` and `mainloop()` of a recorded widget run the
+      jobs that are due without moving the clock. Events can be sent to recorded widgets with
+      `event_generate()`, which calls the bindings of the widget and of its window.
+  """
+
+  def __init__(self):
+    super().__init__(True)
+    self.jobs = [ ]
+    self.clock = 0
+    self.classes = { }
+
+  def widgetClass(self, _class):
+    if not _class in self.classes:
+      self.classes[_class] = type(_class.__name__, (RecordedWidget,), { 'backend' : self })
+    return self.classes[_class]
+
+  def variable(self, _class, maxRate=None):
+    if not _class in self.classes:
+      self.classes[_class] = type(_class.__name__, (RecordedVariable,), { '_default' : _class._default })
+    return self.classes[_class]()
+
+  def unbind(self, widget, sequence, funcid, tag=None):
+    self.record('unbind', widget, sequence, tag)
+    widget._unbind(tag, sequence, funcid)
+
+  def image(self, path): return path
+
+  def run(self, elapse=0, limit=100000):
+    """
+        Moves the virtual clock forward by `elapse` milliseconds, running the jobs that fall due in
+        order of their due time, including the ones they schedule.
+
+        Returns: The number of jobs run
+    """
+
+    end, count = self.clock + elapse, 0
+
+    while count < limit:
+      due = [job for job in self.jobs if job[1] <= end]
+      if not due: break
+
+      job = min(due, key=lambda job: job[1])
+      self.jobs.remove(job)
+      self.clock = max(self.clock, job[1])
+      job[2](*job[3])
+      count += 1
+
+    self.clock = end
+    return count
+
+class RecordedWidget():
+  """
+      RecordedWidget stands in for a tkinter widget in a RecordingBackend. It supports configuration,
+      geometry, bindings, timers, and the items and rows of canvases, listboxes and treeviews; other
+      widget methods are accepted and do nothing. Paths are given as tkinter gives them.
+  """
+
+  backend = None
+
+  def __init__(self, master=None, cnf={ }, **options):
+    if master is None and self.__class__.__name__ != 'Tk': master = self.backend.tk
+
+    self.master = master
+    self.options = dict(cnf, **options)
+    self.children = { }
+    self.bindings = { }
+    self.items = { }
+    self.rows = { }
+    self.manager = ''
+    self.wmState = 'normal'
+    self.widgetState = set()
+    self.selected = [ ]
+    self._ids = itertools.count(1)
+    self._counts = { }
+
+    if master is None:
+      self._name, self._w = '', '.'
+      self.tk = RecordedTk(self)
+    else:
+      name = '!' + self.__class__.__name__.lower()
+      master._counts[name] = master._counts.get(name, 0) + 1
+      self._name = name if master._counts[name] == 1 else f'{name}{master._counts[name]}'
+      self._w = ('' if master._w == '.' else master._w) + '.' + self._name
+      self.tk = master.tk
+      master.children[self._name] = self
+
+  def __str__(self): return self._w
+
+  def __getattr__(self, name):
+    if name.startswith('_'): raise AttributeError(name)
+    if name.startswith('create_'): return lambda *args, **options: self._create(name[7:], args, options)
+    return lambda *args, **options: None
+
+  def __getitem__(self, key): return self.cget(key)
+
+  def __setitem__(self, key, value): self.configure(**{ key : value })
+
+  def configure(self, cnf=None, **options):
+    if cnf is None and not options: return dict(self.options)
+    if 'str' in str(type(cnf)): return (cnf, cnf, cnf.capitalize(), '', self.options.get(cnf, ''))
+    self.options.update(dict(cnf or { }, **options))
+
+  config = configure
+
+  def cget(self, key): return self.options.get(key, '')
+
+  def keys(self): return list(self.options)
+
+  def place(self, **options): self.manager = 'place'
+
+  def pack(self, **options): self.manager = 'pack'
+
+  def grid(self, **options): self.manager = 'grid'
+
+  def place_forget(self): self.manager = ''
+
+  def pack_forget(self): self.manager = ''
+
+  def grid_forget(self): self.manager = ''
+
+  def winfo_manager(self): return self.manager
+
+  def winfo_children(self): return list(self.children.values())
+
+  def winfo_exists(self): return self.master is None or self._name in self.master.children
+
+  def winfo_ismapped(self): return self.master is None or self.manager != ''
+
+  def winfo_width(self): return int(self.options.get('width', 1) or 1)
+
+  def winfo_height(self): return int(self.options.get('height', 1) or 1)
+
+  def winfo_toplevel(self):
+    widget = self
+    while widget.master is not None and not widget.__class__.__name__ in [ 'Tk', 'Toplevel' ]: widget = widget.master
+    return widget
+
+  def destroy(self):
+    for child in list(self.children.values()): child.destroy()
+    self.event_generate('<Destroy>')
+    if self.master is not None: self.master.children.pop(self._name, None)
+
+  def bind(self, sequence=None, func=None, add=None):
+    return self._bind(None, sequence, func, add)
+
+  def tag_bind(self, tag, sequence=None, func=None, add=None):
+    return self._bind(tag, sequence, func, add)
+
+  def unbind(self, sequence, funcid=None): self._unbind(None, sequence, funcid)
+
+  def tag_unbind(self, tag, sequence, funcid=None): self._unbind(tag, sequence, funcid)
+
+  def _bind(self, tag, sequence, func, add):
+    if func is None: return ''
+
+    funcid = f'{id(func)}_{sequence}'
+    handlers = self.bindings.setdefault((tag, sequence), [ ])
+    if not add: handlers.clear()
+    handlers.append((funcid, func))
+    return funcid
+
+  def _unbind(self, tag, sequence, funcid):
+    handlers = self.bindings.get((tag, sequence), [ ])
+    handlers[:] = [ ] if funcid is None else [h for h in handlers if h[0] != funcid]
+
+  def event_generate(self, sequence, **fields):
+    """ Calls the bindings of `sequence` on the widget and then on its window, until one returns 'break'. """
+
+    event = tkinter.Event()
+    event.widget, event.type = self, sequence
+    for field in [ 'x', 'y', 'x_root', 'y_root', 'delta', 'keysym', 'char', 'state', 'num' ]:
+      setattr(event, field, fields.get(field, '' if field in [ 'keysym', 'char' ] else 0))
+
+    for widget in dict.fromkeys([ self, self.winfo_toplevel() ]):
+      for funcid, func in list(widget.bindings.get((None, sequence), [ ])):
+        if func(event) == 'break': return
+
+  def after(self, ms, func=None, *args):
+    job = [ f'after#{next(self.tk.ids)}', self.backend.clock + int(ms), func, args ]
+    self.backend.jobs.append(job)
+    return job[0]
+
+  def after_idle(self, func, *args): return self.after(0, func, *args)
+
+  def after_cancel(self, id):
+    self.backend.jobs[:] = [job for job in self.backend.jobs if job[0] != id]
+
+  def update(self): self.backend.run()
+
+  def update_idletasks(self): self.backend.run()
+
+  def mainloop(self, n=0): self.backend.run()
+
+  def register(self, func, subst=None, needcleanup=1):
+    name = f'py{id(func)}'
+    self.tk.commands[name] = func
+    return name
+
+  def deletecommand(self, name): self.tk.commands.pop(name, None)
+
+  def state(self, spec=None):
+    """ Returns or sets the window state of windows, and the ttk state flags of other widgets. """
+
+    if self.__class__.__name__ in [ 'Tk', 'Toplevel' ]: return self.wmState
+
+    for flag in spec or [ ]:
+      self.widgetState.discard(flag[1:]) if flag.startswith('!') else self.widgetState.add(flag)
+    return tuple(self.widgetState)
+
+  def withdraw(self): self.wmState = 'withdrawn'
+
+  def iconify(self): self.wmState = 'iconic'
+
+  def deiconify(self): self.wmState = 'normal'
+
+  def _create(self, kind, coords, options):
+    item = next(self._ids)
+    self.items[item] = [ kind, list(coords), options ]
+    return item
+
+  def coords(self, item, *coords):
+    if item in self.items and coords: self.items[item][1] = list(coords[0] if len(coords) == 1 else coords)
+    return self.items[item][1] if item in self.items else [ ]
+
+  def find_all(self): return tuple(self.items)
+
+  def insert(self, index, *values, **options):
+    if self.__class__.__name__ == 'Treeview': values = [ options.get('values', options.get('text', '')) ]
+
+    ids = [ f'I{next(self._ids):03X}' for value in values ]
+    self.rows.update(zip(ids, values))
+    return ids[-1] if ids else ''
+
+  def delete(self, *items):
+    if self.__class__.__name__ == 'Canvas':
+      for item in items: self.items = { } if item == 'all' else dict([(i, self.items[i]) for i in self.items if i != item])
+    elif self.__class__.__name__ == 'Treeview':
+      for item in items: self.rows.pop(item, None)
+      self.selected = [item for item in self.selected if item in self.rows]
+    else:
+      self.rows, self.selected = { }, [ ]
+
+  def get_children(self, item=''): return tuple(self.rows)
+
+  def size(self): return len(self.rows)
+
+  def canvasx(self, x, gridspacing=None): return float(x)
+
+  def canvasy(self, y, gridspacing=None): return float(y)
+
+  def bbox(self, *args):
+    """ Returns the box of a row of a listbox or treeview, where every row is one unit high. """
+
+    if self.__class__.__name__ == 'Canvas' or not args: return None
+
+    if self.__class__.__name__ == 'Treeview':
+      if not args[0] in self.rows: return ''
+      row = list(self.rows).index(args[0])
+    else:
+      row = int(args[0])
+      if not 0 <= row < len(self.rows): return None
+
+    return (0, row, self.winfo_width(), 1)
+
+  def nearest(self, y): return min(max(0, int(y)), self.size() - 1)
+
+  def see(self, index): pass
+
+  def yview(self, *args): return (0.0, 1.0) if not args else None
+
+  def curselection(self): return tuple(self.selected)
+
+  def selection(self): return tuple(self.selected)
+
+  def selection_set(self, first, last=None):
+    if self.__class__.__name__ == 'Treeview':
+      self.selected = list(first) if first.__class__.__name__ in [ 'list', 'tuple' ] else [ first ]
+    else:
+      last = len(self.rows) - 1 if last == 'end' else (first if last is None else last)
+      self.selected = sorted(set(self.selected) | set(range(int(first), int(last) + 1)))
+
+  def selection_clear(self, first=None, last=None):
+    if self.__class__.__name__ == 'Treeview' or first is None or last == 'end':
+      self.selected = [ ]
+    else:
+      last = first if last is None else last
+      self.selected = [i for i in self.selected if not int(first) <= i <= int(last)]
+
+class RecordedVariable():
+  """ RecordedVariable stands in for a tkinter variable in a RecordingBackend, keeping its value and write traces in Python. """
+
+  _default = ''
+  _names = itertools.count()
+
+  def __init__(self, master=None, value=None, name=None):
+    self._name = name or f'PY_VAR{next(RecordedVariable._names)}'
+    self._value = self._default if value is None else value
+    self._traces = [ ]
+
+  def __str__(self): return self._name
+
+  def get(self): return self._value
+
+  def set(self, value):
+    self._value = value
+    for mode, callback in list(self._traces):
+      if 'write' in mode: callback(self._name, '', 'write')
+
+  def trace_add(self, mode, callback):
+    self._traces.append((mode, callback))
+    return str(id(callback))
+
+  def trace_remove(self, mode, cbname):
+    self._traces = [trace for trace in self._traces if str(id(trace[1])) != cbname]
+
+class RecordedTk():
+  """ RecordedTk stands in for the Tcl interpreter of recorded widgets, running the stroke procedures and registered commands in Python. """
+
+  def __init__(self, root):
+    self.root = root
+    self.ids = itertools.count()
+    self.commands = { }
+
+  def widget(self, path):
+    widget = self.root
+    for name in [name for name in path.split('.') if name]: widget = widget.children[name]
+    return widget
+
+  def call(self, *args):
+    if args[0] in self.commands:
+      return self.commands[args[0]](*args[1:])
+    elif args[0] == 'tkjson_strokes':
+      canvas = self.widget(args[1])
+      return tuple(canvas._create(kind, coords, options) for kind, options, coordsList in args[2] for coords in coordsList)
+    elif args[0] == 'tkjson_coords':
+      canvas = self.widget(args[1])
+      for item, coords in zip(args[2][0::2], args[2][1::2]): canvas.coords(item, *coords)
+    return ''
+
+  def eval(self, script): return ''
+
+  def splitlist(self, value): return tuple(value) if value.__class__.__name__ in [ 'list', 'tuple' ] else tuple(str(value).split())
+
+  def getboolean(self, value): return bool(value)
+
+BACKEND = TkBackend()
+
+def useBackend(backend):
+  """
+      Makes `backend` the backend new windows and widgets are built with. Each backend has a root
+      window of its own, so windows built with different backends don't mix.
+
+      Returns: The previous backend
+  """
+
+  global BACKEND, TK, TK_THREAD
+
+  previous = BACKEND
+  previous.tk, previous.thread = TK, TK_THREAD
+  BACKEND, TK, TK_THREAD = backend, backend.tk, backend.thread
+  return previous
+
+class WindowManager():
+  """
+      WindowManager is a simple class that collects together a series of windows. It
+      updates a window to refer to itself when added such that windows can intercommunicate
+      through their commands or other actions (such as a button on window 'A' changing the
+      text of a label on window 'B').
+
+      The manager also keeps a registry of shared commands. A command added through
+      `WindowManager.addCommand()` is defined once and may be resolved by name from any window
+      that belongs to the manager, just like the window's own commands.
+
+      A lazy manager (`WindowManager(lazy=True)`) keeps the specification of each window created
+      through `createWindow()` and only builds the Window on first access through `getWindow()`
+      or `show()`. Lazily-built windows that stay hidden may be released with `release()`, and
+      are rebuilt from their specification when next needed. Bear in mind that the first window
+      built becomes the tkinter root, and is never released.
+  """
+
+  def __init__(self, lazy=False, profile=False):
+    self.profiler = Profiler() if profile or Profiler.requested() else NULL_PROFILER
+    self.windows = { }
+    self.commands = { }
+    self.specs = { }
+    self.lazy = lazy
+    self._releaseJob = None
+    self._stream = None
+    self._streamJob = None
+    self._streamed = [ ]
+    self.updates = UpdateQueue()
+    self.metrics = Metrics()
+    self.watchdog = None
+
+    # The queue is served by the thread that owns the interpreter, so it's started on that thread
+    if TK and threading.get_ident() == TK_THREAD: self.updates.start(TK)
+  
+  def hasWindow(self, name):
+    if self._stream and not (name in self.windows or name in self.specs): self._streamUntil(name)
+    return name in self.windows or name in self.specs
+
+  def isBuilt(self, name): return name in self.windows
+
+  def hasCommand(self, name): return name in self.commands
+
+  def getCommand(self, name): return self.commands.get(name)
+
+  def addCommand(self, name, com, cancel=False):
+    """
+        Adds a command shared by every window of this manager. The function should have the same
+        header as commands given to `Window.addCommand()`, and is bound to whichever window
+        resolves it.
+
+        Keyword arguments:
+        + `name` The name to represent the function `com` as
+        + `com` The function, prior-defined, to share between windows
+        + `cancel` For coroutine functions, whether calling the command cancels its unfinished task
+
+        Returns: Self for chaining
+    """
+
+    if not self.hasCommand(name):
+      com = AsyncRunner.wrap(com, (self, name) if cancel else None) if inspect.iscoroutinefunction(com) else com
+      self.commands[name] = Window._timed(name, com)
+    else:
+      raise Exception(f"A shared command with the name '{name}' already exists for this manager.")
+
+    return self
+
+  def removeCommand(self, name):
+    """
+        Removes a shared command from this manager.
+
+        Keyword arguments:
+        + `name` The name of the command to remove
+
+        Returns: The function associated with `name`, or None if not found
+    """
+
+    return self.commands.pop(name, None)
+
+  def getWindow(self, name):
+    """
+        Gets a window by name, building it first if it's a lazy window that hasn't been built.
+
+        Keyword arguments:
+        + `name` The name of the window to fetch
+
+        Returns: The Window associated with `name`, or None if not found
+    """
+
+    if self._stream and not (name in self.windows or name in self.specs): self._streamUntil(name)
+
+    if name in self.windows: return self.windows[name]
+    elif name in self.specs:
+      spec = self.specs[name]
+
+      with self.profiler.window(name):
+        if 'list' in str(type(spec)):
+          win = Window.buildFromPlan(spec, self)
+        else:
+          win = Window.buildFromDict(copy.deepcopy(spec), self)
+
+      self.windows[name] = win
+      self.updates.start(TK)
+      if not self.lazy: del self.specs[name]
+      return win
+    else:
+      return None
+
+  def show(self, name):
+    """
+        Shows the window with the given name, building it first if required.
+
+        Keyword arguments:
+        + `name` The name of the window to show
+
+        Returns: Self for chaining
+    """
+
+    if self.hasWindow(name):
+      self.getWindow(name).show()
+    else:
+      raise Exception(f"No window named '{name}' exists for this manager")
+
+    return self
+
+  def addWindow(self, name, win):
+    """
+        Adds a window to this manager under the given name.
+
+        Keyword arguments:
+        + `name` The name that will be used in reference to the window added
+        + `win` The Window instance to be associated with the name
+
+        Returns: Self for chaining
+    """
+
+    if not self.hasWindow(name):
+      self.windows[name] = win
+      win.setManager(self)
+      self.updates.start(TK)
+    else:
+      raise Exception(f"A window named '{name}' already exists for this manager")
+    
+    return self
+  
+  def createWindow(self, name, win):
+    """
+        Adds a window to this manager from raw JSON-formatted text. If the manager is lazy, the
+        window is only built when first accessed.
+
+        Keyword arguments:
+        + `name` The name to associate with the newly-built window
+        + `win` The raw JSON-formatted text representing the window to be added
+
+        Returns: Self for chaining
+    """
+
+    if self.lazy:
+      if self.hasWindow(name):
+        raise Exception(f"A window named '{name}' already exists for this manager")
+      self.specs[name] = win
+    else:
+      with self.profiler.window(name):
+        self.addWindow(name, Window.buildFromDict(win, self))
+    return self
+  
+  def removeWindow(self, name):
+    """
+        Removes a window from this manager.
+
+        Keyword arguments:
+        + `name` The name of the window to remove
+
+        Returns: The Window instance associated with `name`, or None if not found or not built
+    """
+
+    if name in self.specs: del self.specs[name]
+
+    if name in self.windows:
+      win = self.getWindow(name)
+      win.setManager()
+      del self.windows[name]
+      return win
+    else:
+      return None
+
+  def release(self, age=0):
+    """
+        Destroys lazily-built windows that have been hidden for at least `age` seconds. Their
+        specifications are kept, so they're rebuilt on next access.
+
+        Keyword arguments:
+        + `age` The number of seconds a window must have been hidden for to be released
+
+        Returns: A list of the names of the released windows
+    """
+
+    now = time.monotonic()
+    released = []
+
+    for name in [name for name in self.windows if name in self.specs]:
+      win = self.windows[name]
+
+      if win.gui is not TK and win.hiddenAt is not None and now - win.hiddenAt >= age:
+        del self.windows[name]
+        win.setManager()
+        win.gui.destroy()
+        released.append(name)
+
+    return released
+
+  def autoRelease(self, age=60, interval=30):
+    """
+        Periodically releases windows that have been hidden for at least `age` seconds, checking
+        every `interval` seconds using the tkinter root. Use an interval of 0 to stop releasing.
+
+        Keyword arguments:
+        + `age` The number of seconds a window must have been hidden for to be released
+        + `interval` The number of seconds between checks
+
+        Returns: Self for chaining
+    """
+
+    if self._releaseJob and TK:
+      TK.after_cancel(self._releaseJob)
+      self._releaseJob = None
+
+    if interval and TK:
+      def tick():
+        self.release(age)
+        self._releaseJob = TK.after(int(interval * 1000), tick)
+
+      self._releaseJob = TK.after(int(interval * 1000), tick)
+
+    return self
+  
+  def post(self, fn, *args, key=None):
+    """
+        Queues `fn(*args)` to run on the tkinter thread, from any thread. Updates are run once the
+        manager has a window, as the queue is started on the tkinter thread when the manager is
+        created after the root window, or else when its first window is added or built; see
+        `UpdateQueue.post()` for the use of `key`. The manager's queue also serves the updates
+        posted to its windows.
+
+        Returns: Self for chaining
+    """
+
+    self.updates.post(fn, *args, key=key)
+    return self
+
+  def watch(self, threshold=0.5, interval=0.1, onStall=None):
+    """
+        Starts a Watchdog on the tkinter root, recording stalls of the tkinter thread of at least
+        `threshold` seconds -- see `Watchdog`. Call once a window exists, from the tkinter thread.
+        Starting a new watchdog stops the previous one.
+
+        Returns: The Watchdog
+    """
+
+    if not TK: raise Exception("A watchdog can't be started before a window exists")
+
+    if self.watchdog is not None: self.watchdog.stop()
+    self.watchdog = Watchdog(TK, threshold, interval, onStall).start()
+    return self.watchdog
+
+  def latency(self):
+    """ Returns the latency report of the commands and event bindings of the manager's windows -- see `Metrics`. """
+
+    return self.metrics.report()
+
+  def applyRaw(self, raw):
+    """
+        Updates the manager in place to match new raw, JSON-formatted text in the format accepted by
+        `buildRaw()`. Windows missing from the text are removed and destroyed (the tkinter root is
+        hidden instead), new windows are created, and built windows are updated using
+        `Window.apply()`, so only the widgets, strokes, menus, commands and events that changed are
+        touched. Windows that aren't built yet simply have their specification replaced.
+
+        Keyword arguments:
+        + `raw` JSON-formatted text that can build a WindowManager
+
+        Returns: Self for chaining
+    """
+
+    dic = json.loads(raw)
+    if self._stream: self._streamUntil(None)
+
+    for name in [name for name in list(self.windows) + list(self.specs) if not name in dic]:
+      if name in self._streamed: self._streamed.remove(name)
+      win = self.removeWindow(name)
+
+      if win is None: continue
+      elif win.gui is TK:
+        win.hide()
+      else:
+        win.gui.destroy()
+
+    for name in sorted(dic):
+      if name in self.windows:
+        self.windows[name].apply(dic[name])
+        if name in self.specs: self.specs[name] = dic[name]
+      elif name in self.specs:
+        self.specs[name] = dic[name]
+      else:
+        self.createWindow(name, dic[name])
+
+    return self
+
+  @staticmethod
+  def build(dic, commands=[], lazy=False, profile=False):
+    """
+        Builds a WindowManager from a dictionary of name-window entries, where each window is a
+        dictionary of information that `Window.build()` can parse.
+
+        Keyword arguments:
+        + `dic` The dictionary of name-windowdict pairs
+        + `commands` A list of (name, function) pairs to register as shared commands before any
+          window is built
+        + `lazy` Whether windows are only built when first accessed
+        + `profile` Whether to record build timings in the manager's `profiler` -- see `Profiler`
+
+        Returns: The WindowManager generated from the dictionary
+    """
+
+    man = WindowManager(lazy, profile)
+    for name, com in commands: man.addCommand(name, com)
+
+    for win in sorted(dic):
+      man.createWindow(win, dic[win])
+
+    return man
+
+  @staticmethod
+  def buildRaw(raw='', commands=[], lazy=False, profile=False):
+    """
+        Builds a WindowManager from raw, JSON-formatted text. The format should be a dictionary of
+        name-Window pairs, where 'Window' is JSON-formatted text that `Window.build()` can parse.
+
+        Keyword arguments:
+        + `raw` JSON-formatted text that can build a WindowManager
+        + `commands` A list of (name, function) pairs to register as shared commands before any
+          window is built
+        + `lazy` Whether windows are only built when first accessed
+        + `profile` Whether to record build timings in the manager's `profiler` -- see `Profiler`.
+          Profiling is also turned on by the `TKJSON_PROFILE` environment variable -- see `Profiler`
+
+        Returns: The manager built from the JSON
+    """
+
+    if not raw: return None
+    else:
+      man = WindowManager(lazy, profile)
+      with man.profiler.phase('parse'): dic = json.loads(raw)
+      for name, com in commands: man.addCommand(name, com)
+
+      for win in sorted(dic):
+        man.createWindow(win, dic[win])
+
+      return man
+
+  @staticmethod
+  def buildStream(fileobj, first=None, commands=[], lazy=False, chunk=65536, profile=False):
+    """
+        Builds a WindowManager from a file of JSON-formatted text in the format accepted by
+        `buildRaw()`, parsing the top-level window entries incrementally. The entries are read until
+        the window named `first` is found, which is then built and shown; the remaining entries are
+        parsed and built one at a time from the tkinter event loop, in the order of the file.
+        Accessing a window that hasn't been read yet reads the file up to that window.
+
+        Bear in mind that the file must stay open until every entry has been read -- typically,
+        until the event loop stops.
+
+        Keyword arguments:
+        + `fileobj` A file object, opened for reading text, with the layout
+        + `first` The name of the window to show first, or None for the first window in the file
+        + `commands` A list of (name, function) pairs to register as shared commands before any
+          window is built
+        + `lazy` Whether windows are only built when first accessed
+        + `chunk` The minimum number of characters read from the file at once
+        + `profile` Whether to record build timings in the manager's `profiler` -- see `Profiler`
+
+        Returns: The manager built from the file
+    """
+
+    man = WindowManager(lazy, profile)
+    for name, com in commands: man.addCommand(name, com)
+
+    man._stream = WindowManager.streamEntries(fileobj, chunk)
+
+    # Read entries until the first window is found, then build and show it
+    if first is None:
+      entry = next(man._stream, None)
+      if entry is None: return man
+
+      first = entry[0]
+      man._queueStreamed(*entry)
+    elif not man._streamUntil(first):
+      raise Exception(f"No window named '{first}' was found in the layout")
+
+    man.show(first)
+
+    if man._stream or man._streamed: man._streamJob = TK.after(0, man._continueStream)
+    return man
+
+  @staticmethod
+  def streamEntries(fileobj, chunk=65536):
+    """
+        Generates the (name, window dictionary) pairs of a JSON object read incrementally from a
+        file, parsing each value as soon as it has been read completely.
+
+        Keyword arguments:
+        + `fileobj` A file object, opened for reading text, containing a JSON object
+        + `chunk` The minimum number of characters read from the file at once
+
+        Returns: A generator of (name, value) pairs
+    """
+
+    decoder = json.JSONDecoder()
+    buf, pos = '', 0
+
+    def read():
+      # Read at least as much as is buffered, so that large values are decoded a bounded number of times
+      nonlocal buf, pos
+      data = fileobj.read(max(chunk, len(buf) - pos))
+
+      if data:
+        buf, pos = buf[pos:] + data, 0
+      return bool(data)
+
+    def skip():
+      nonlocal pos
+
+      while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n': pos += 1
+        if pos < len(buf): return buf[pos]
+        if not read(): raise Exception("Unexpected end of the layout while reading windows")
+
+    def decode():
+      nonlocal pos
+
+      while True:
+        try:
+          value, pos = decoder.raw_decode(buf, pos)
+          return value
+        except ValueError:
+          if not read(): raise
+
+    if skip() != '{': raise Exception("The layout is not a JSON object of windows")
+    pos += 1
+
+    while True:
+      c = skip()
+
+      if c == '}': return
+      elif c == ',':
+        pos += 1
+        skip()
+
+      name = decode()
+      if skip() != ':': raise Exception(f"Expected ':' after the window name '{name}' in the layout")
+      pos += 1
+      skip()
+
+      yield name, decode()
+
+  def _queueStreamed(self, name, win):
+    """ Keeps the specification of a streamed window until it's built. """
+
+    if name in self.windows or name in self.specs:
+      raise Exception(f"A window named '{name}' already exists for this manager")
+
+    self.specs[name] = win
+    if not self.lazy: self._streamed.append(name)
+
+  def _streamUntil(self, name):
+    """ Reads streamed entries until the window `name` is found, and returns whether it was found. """
+
+    for entry in self._stream:
+      self._queueStreamed(*entry)
+      if entry[0] == name: return True
+
+    self._stream = None
+    return False
+
+  def _continueStream(self):
+    """ Builds the next streamed window, or reads the next entry, rescheduling itself until done. """
+
+    self._streamJob = None
+
+    if self._streamed:
+      name = self._streamed.pop(0)
+      if name in self.specs: self.getWindow(name)
+    elif self._stream:
+      entry = next(self._stream, None)
+
+      if entry is None:
+        self._stream = None
+      else:
+        self._queueStreamed(*entry)
+
+    if self._stream or self._streamed: self._streamJob = TK.after(0, self._continueStream)
+
+  @staticmethod
+  def compile(raw, cache=None, shared=[]):
+    """
+        Compiles raw, JSON-formatted text in the format accepted by `buildRaw()` into a Plan. The
+        layout is parsed and validated once, and the plan can then be built by `fromPlan()` any
+        number of times.
+
+        Keyword arguments:
+        + `raw` JSON-formatted text that can build a WindowManager
+        + `cache` An optional filepath for caching the plan. If the file holds a plan compiled from
+          the same text, it's returned instead of compiling; otherwise, the new plan is saved to it
+        + `shared` Names of the shared commands that will be available to the windows
+
+        Returns: The compiled Plan
+    """
+
+    digest = Plan.key(raw)
+
+    if cache:
+      plan = Plan.load(cache)
+      if plan and plan.digest == digest: return plan
+
+    dic = json.loads(raw)
+    plan = Plan(digest, [ [ name, Window.compile(dic[name], shared) ] for name in sorted(dic) ])
+
+    if cache: plan.save(cache)
+    return plan
+
+  @staticmethod
+  def fromPlan(plan, commands=[], lazy=False, profile=False):
+    """
+        Builds a WindowManager from a Plan generated by `compile()`.
+
+        Keyword arguments:
+        + `plan` The Plan to build
+        + `commands` A list of (name, function) pairs to register as shared commands before any
+          window is built
+        + `lazy` Whether windows are only built when first accessed
+        + `profile` Whether to record build timings in the manager's `profiler` -- see `Profiler`
+
+        Returns: The manager built from the plan
+    """
+
+    man = WindowManager(lazy, profile)
+    for name, com in commands: man.addCommand(name, com)
+
+    for name, instructions in plan.windows:
+      if lazy:
+        man.specs[name] = instructions
+      else:
+        with man.profiler.window(name):
+          man.addWindow(name, Window.buildFromPlan(instructions, man))
+
+    return man
+
+class Window():
+  """
+      Window is a one-stop shop for generating tkinter graphical user interfaces, including the
+      parsing of raw JSON to generate an interface, and holding variables and the widgets of the
+      interface in a uniform, organized manner. Windows may be built using the `build(json)`
+      function, but the most specific way to generate a window is to instantiate the Window class
+      and use its functions...
+
+      Short, and sweet:
+      ```
+      Window(width, height, title, icon) # Creates the window
+      .addMenu(menu)                     # Sets up a menu
+      .addCommands(cmdList)              # Associates python functions with names as 'commands'
+      .addWidgets(widgets)               # Builds the interface using JSON-formatted properties
+      .run()                             # Opens the interface using the mainloop() function
+      ```
+
+      Extra functionality in the way of adding raw Python code (as strings) for commands is
+      available as `addCommandsRaw(...)`, but is not recommended versus the above method due to
+      potential security issues and memory management.
+
+      Extra functionality in the way of managing variables used in widgets is available; however,
+      once a variable is added, it may NOT be removed using the API.
+  """
+
+  def __init__(self, width=480, height=320, title="PUI", icon=""):
+    # Instantiate TK root if not already created; otherwise, generate a Toplevel
+    global TK, TK_THREAD
+
+    self.hiddenAt = None
+    if not TK:
+      TK, TK_THREAD = BACKEND.createRoot(), threading.get_ident()
+      self.gui = TK
+    else:
+      self.gui = BACKEND.construct(tkinter.Toplevel, TK)
+      self.hide()
+
+    # Instantiation of window
+    self.guiIcon = None
+    self.spec = None
+    self.variables = { }
+    self.commands = { }
+    self.manager = None
+    self.widgetIndex = { }
+    self.strokes = { }
+    self.culled = { }
+    self.applied = { }
+    self.batching = 0
+    self._pending = { }
+    self._flushJob = None
+    self.events = EventDispatcher(self.gui, self)
+    self._metrics = Metrics()
+    self._busy = { }
+    self.virtual = { }
+    self._strokeTags = { }
+    self._strokeTagIds = itertools.count()
+    self.widgetNames = { }
+    self.deferred = { }
+    self.deferredNames = { }
+    self.lazyNotebooks = set()
+    self.variableUsers = { }
+    self.ownedVariables = set()
+    self.pool = None
+
+    self.messageboxes = messagebox
+    self.collections = { }
+
+    self.gui.geometry(f"{width}x{height}")
+    self.gui.title(title)
+    self.setIcon(icon)
+
+    # The window's own queue serves it while it has no manager, and is started here, on the tkinter
+    # thread, so that `post()` is safe from any thread
+    self._updates = UpdateQueue(self.gui).start()
+
+  def __getattr__(self, name):
+    # The widget collection of a category, such as `self.buttons`, is created on first use
+    if name in CATEGORIES and 'collections' in self.__dict__:
+      collection = self.collections[name] = WidgetCollection(self.gui, CATEGORIES[name], name, self)
+      setattr(self, name, collection)
+      return collection
+
+    raise AttributeError(f"'Window' object has no attribute '{name}'")
+
+  @property
+  def categories(self):
+    """ Returns a dictionary of (category, WidgetCollection) pairs for the categories the window has used. """
+    
+    return self.collections
+
+  def run(self): self.gui.mainloop()
+
+  @property
+  def metrics(self):
+    """ The Metrics of the window's manager, or of the window itself if it has no manager. """
+
+    return self.manager.metrics if self.manager is not None else self._metrics
+
+  @property
+  def profiler(self):
+    """ The profiler of the window's manager, or `NULL_PROFILER` if the window has no manager. """
+
+    return self.manager.profiler if self.manager is not None else NULL_PROFILER
+
+  def runAsync(self, loop=None):
+    """
+        Runs the window like `run()`, along with an asyncio event loop driven by tkinter (see
+        `AsyncRunner`). Once the window closes, unfinished tasks are cancelled and the loop is closed.
+
+        Keyword arguments:
+        + `loop` The asyncio event loop to drive, or None for a new loop
+    """
+
+    runner = AsyncRunner.get(loop)
+
+    try:
+      self.gui.mainloop()
+    finally:
+      runner.close()
+
+  @property
+  def updates(self):
+    """ The UpdateQueue serving the window -- its manager's, or its own if it has no manager. """
+
+    return self.manager.updates if self.manager is not None else self._updates
+
+  def post(self, fn, *args, key=None):
+    """
+        Queues `fn(*args)` to run on the tkinter thread. This is the way for other threads, such as
+        socket readers, to update widgets and variables, since tkinter isn't thread-safe. See
+        `UpdateQueue.post()` for the use of `key`.
+
+        Returns: Self for chaining
+    """
+
+    self.updates.post(fn, *args, key=key)
+    return self
+
+  def postConfigure(self, name, **options):
+    """
+        Queues the reconfiguration of a widget from any thread. Pending writes to the same option of
+        the widget are replaced, so only the last one is applied.
+
+        Returns: Self for chaining
+    """
+
+    for option in options:
+      self.updates.post(self._configureOption, name, option, options[option], key=('configure', name, option))
+    return self
+
+  def postVariable(self, name, value):
+    """
+        Queues setting the window variable `name` to `value` from any thread. Pending writes to the
+        same variable are replaced, so only the last one is applied.
+
+        Returns: Self for chaining
+    """
+
+    self.updates.post(self._setVariable, name, value, key=('variable', name))
+    return self
+
+  def _configureOption(self, name, option, value):
+    category = self.findCategory(name)
+    if category: getattr(self, category).configure(name, **{ option : value })
+
+  def _setVariable(self, name, value):
+    if self.hasVariable(name): self.variables[name].set(value)
+
+  @contextlib.contextmanager
+  def batch(self):
+    """
+        Context manager that collects widget reconfigurations made through `WidgetCollection.configure()`
+        and `configureMany()`, and applies them once tkinter is idle after the outermost block ends.
+        Writes to the same widget option are merged (the last one wins), writes of the value an
+        option was built with or last written through the window are dropped, and each widget is
+        reconfigured in a single call.
+
+        ```
+        with win.batch():
+          win.labels.configure('lblOne', text='A')
+          win.buttons.configureMany({ 'btnOne' : { 'text' : 'B' }, 'btnTwo' : { 'state' : 'disabled' } })
+        ```
+
+        Changes made directly on tkinter widgets aren't known to the window, so values written that
+        way may cause a later, equal write to be dropped.
+    """
+
+    self.batching += 1
+    try:
+      yield self
+    finally:
+      self.batching -= 1
+      if not self.batching and self._pending: self._scheduleFlush()
+
+  def queueConfigure(self, name, options):
+    """
+        Queues options for the widget `name`, to be applied by the next `flush()`.
+
+        Returns: Self for chaining
+    """
+
+    self._pending.setdefault(name, { }).update(options)
+    if not self.batching: self._scheduleFlush()
+    return self
+
+  def _scheduleFlush(self):
+    if self._flushJob is None: self._flushJob = self.gui.after_idle(self.flush)
+
+  def flush(self):
+    """
+        Applies the queued widget reconfigurations immediately.
+
+        Returns: Self for chaining
+    """
+
+    if self._flushJob is not None:
+      self.gui.after_cancel(self._flushJob)
+      self._flushJob = None
+
+    pending, self._pending = self._pending, { }
+
+    for name in pending:
+      widget = self.findWidget(name)
+      if widget is None: continue
+
+      applied = self.applied.setdefault(name, { })
+      changed = dict([(k, v) for k, v in pending[name].items() if not (k in applied and applied[k] == v)])
+
+      if changed:
+        self._reconfigure(name, widget, changed)
+        applied.update(changed)
+
+    return self
+
+  def _reconfigure(self, name, widget, options):
+    """ Configures the widget `name` with `options`, keeping the scroll commands of a culled canvas wrapped. """
+
+    if name in self.culled: options = self.culled[name].scrollOptions(options)
+    BACKEND.configure(widget, options)
+
+  def findWidget(self, name):
+    """
+        Finds a widget of any category in this window by name, using the window's name index rather
+        than searching each category. Widgets deferred by a lazy subtree are built on lookup.
+
+        Keyword arguments:
+        + `name` The name of the widget to find
+
+        Returns: The widget if found, or None otherwise
+    """
+
+    if name in self.deferredNames: self.materialize(name)
+
+    entry = self.widgetIndex.get(name)
+    return entry[1] if entry else None
+
+  def findCategory(self, name):
+    """ Returns the category name of the widget named `name`, or None if the window has no such widget. """
+
+    if name in self.deferredNames: self.materialize(name)
+
+    entry = self.widgetIndex.get(name)
+    return entry[0] if entry else None
+
+  def findName(self, widget):
+    """ Returns the name of the given widget instance, or None if it doesn't belong to this window. """
+
+    return self.widgetNames.get(str(widget))
+
+  def materialize(self, name):
+    """
+        Builds the pending children of a lazy subtree. If `name` is a lazy widget, its deferred
+        descendants are built; if it's a deferred widget, the lazy subtrees enclosing it are built
+        until it exists.
+
+        Keyword arguments:
+        + `name` The name of a lazy widget or deferred widget
+
+        Returns: Self for chaining
+    """
+
+    while name in self.deferred or name in self.deferredNames:
+      owner = name if name in self.deferred else self.deferredNames[name]
+
+      # Lazy widgets nested in other lazy subtrees have to be built first
+      if owner in self.deferredNames:
+        self.materialize(owner)
+        continue
+
+      for ins in self.deferred.pop(owner):
+        del self.deferredNames[ins['name']]
+        self._buildWidget(ins)
+
+      if name == owner: break
+
+    return self
+
+  def _materializeTab(self, notebook):
+    """ Builds the deferred children of the selected tab of a lazy Notebook. """
+
+    name = self.findName(self.findWidget(notebook).select())
+    if name: self.materialize(name)
+
+  def setManager(self, man=None):
+    if not (man is None or man.__class__.__name__ == 'WindowManager'):
+      raise Exception("The provided parameter is not an instance of WindowManager.")
+
+    # Updates pending in the window's own queue move to its manager's, which serves it from then on
+    if man is not None:
+      self._updates.stop().transfer(man.updates)
+    elif self.manager is not None and self.gui.winfo_exists():
+      self._updates.start()
+
+    self.manager = man
+
+  def setIcon(self, icon=""):
+    """
+        Sets the icon for the window. Does nothing if the provided argument is an empty string
+
+        Keyword arguments:
+        + `icon` A string representing the path to the icon to be used
         
         Returns: Self for chaining
     """
 
     if icon:
       print(f"'{icon}'")
-      self.guiIcon = tkinter.PhotoImage(file=icon)
+      self.guiIcon = BACKEND.image(icon)
       self.gui.iconphoto(False, self.guiIcon)
     
     return self
@@ -405,280 +3492,734 @@ class Window():
               list of children that are also Menu instances
 
         Keyword arguments:
-        + `name` The name of the menu to be generated for the window
-        + `options` The options for the menu
-        + `children` Collection of `Menu()` instances or dictionaries defining children widgets
+        + `name` The name of the menu to be generated for the window
+        + `options` The options for the menu
+        + `children` Collection of `Menu()` instances or dictionaries defining children widgets
+
+        Returns: Self for chaining
+    """
+
+    self._buildMenu(Window.resolveMenu(name, options, children, self.hasCommand))
+    self.gui.config(menu=self.menus.getWidget(name))
+    return self
+
+  @staticmethod
+  def resolveMenu(name, options={ 'tearoff': 0 }, children=[], hasCommand=None):
+    """
+        Validates a menu as accepted by `addMenuRaw()`, and flattens it into a list of build
+        instructions. Each instruction is either `[ "menu", name, options ]`, creating a menu
+        widget, or `[ "entry", menu, type, label, options, command, variable, cascade ]`, adding an
+        entry to a menu, where `variable` is a (name, type, default) list or None and `cascade` is
+        the name of the child menu of a cascade entry.
+
+        Keyword arguments:
+        + `name` The name of the menu
+        + `options` The options for the menu
+        + `children` Collection of `Menu()` instances or dictionaries defining children widgets
+        + `hasCommand` A function that checks whether a command name may be used
+
+        Returns: The list of instructions, in build order
+    """
+
+    instructions = [ [ 'menu', name, options ] ]
+
+    # Reconfigure children collection to accomodate dictionaries and lists
+    if 'dict' in str(type(children)):
+      children = [(cName, children[cName]) for cName in children]
+    elif 'list' in str(type(children)):
+      children = [(child.name, child) for child in children]
+    else:
+      raise Exception("Unexpected collection type for children during menu creation")
+
+    for cName, child in children:
+      # Convert Menu instances to dictionaries for processing
+      if child.__class__.__name__ != 'dict': child = child.asDict()
+
+      if child['type'] == 'separator':
+        instructions.append([ 'entry', name, 'separator', None, { }, None, None, None ])
+        continue
+
+      entry = dict(child['options']) if 'options' in child and child['options'] else { }
+      command, variable, cascade = None, None, None
+
+      # Commands in the menu may be function pointers, or names of commands in the window
+      if 'command' in entry and entry['command']:
+        command = entry.pop('command')
+
+        if 'str' in str(type(command)) and not (hasCommand and hasCommand(command)):
+          raise Exception(f"There is no command named {command} in this window.")
+
+      # Act based on child type
+      if child['type'] == 'command':
+        pass
+      elif child['type'] == 'checkbutton':
+        # The variable of a checkbutton is a boolean, defaulting to the value of 'isOn'
+        variable = [ entry.pop('variable'), 'BooleanVar', entry.pop('isOn', None) ]
+      elif child['type'] == 'radiobutton':
+        # The variable of a radiobutton matches the type of its value
+        var = str(type(entry['value'])).split("'")[1]
+        if var in RADIO_VARIABLES:
+          variable = [ entry.pop('variable'), RADIO_VARIABLES[var], None ]
+        else:
+          raise Exception(f"The variable type for the variable '{entry['variable']}' is unknown.")
+      elif child['type'] == 'cascade':
+        cascade = cName
+        instructions += Window.resolveMenu(cName, entry, child['children'], hasCommand)
+        entry = { }
+      else:
+        raise Exception(f"Invalid menu entry type provided: '{child['type']}'")
+
+      instructions.append([ 'entry', name, child['type'], child['label'], entry, command, variable, cascade ])
+
+    return instructions
+
+  def _buildMenu(self, instructions):
+    """ Builds the menus described by a list of instructions from `resolveMenu()`. """
+
+    for ins in instructions:
+      if ins[0] == 'menu':
+        self.menus.addWidget(ins[1], options=ins[2])
+        continue
+
+      _, name, mType, label, options, command, variable, cascade = ins
+      menu : tkinter.Menu = self.menus.getWidget(name)
+
+      if command is not None:
+        options = dict(options, command=self._resolveCommand(command))
+
+      if variable is not None:
+        # Associate the variable for the checkbutton or radiobutton, creating it if needed
+        if not self.hasVariable(variable[0]):
+          self.addVariable(variable[0], VARIABLES[variable[1]], default=variable[2])
+        options = dict(options, variable=self.getVariable(variable[0]))
+        self.ownedVariables.discard(variable[0])
+
+      if mType == 'separator':
+        menu.add_separator()
+      elif mType == 'cascade':
+        menu.add_cascade(label=label, menu=self.menus.getWidget(cascade))
+      else:
+        getattr(menu, 'add_'+mType)(label=label, **options)
+
+  def addMenu(self, menu: Menu = None):
+    """
+        Wrapper for `addMenuRaw()` which allows the root menu widget containing all children
+        widget definitions to be used in a succinct, single call
+
+        Keyword arguments:
+        + `menu` The Menu to add to the window
+
+        Returns: Self for chaining
+    """
+
+    # Premature return -- no menu provided
+    if menu == None: return self
+
+    dic = menu.asDict()
+    self.addMenuRaw(menu.name, options=dic['options'], children=dic['children'])
+    return self
+  
+  def deleteWidgets(self, widgets=[]):
+    """
+        Accepts a list of widget names and sequentially deletes them from the window. If a widget is
+        not found, then an exception is raised indicating the window does not contain the widget
+
+        Keyword arguments:
+        + `widgets` A list of widget names as defined when adding widgets to the window
+
+        Returns: Self for chaining
+    """
+
+    for widget in widgets:
+      self.removeWidget(widget)
+    
+    return self
+
+  def removeWidget(self, name):
+    """
+        Removes a widget, and the widgets built inside it, from the window. Their event bindings,
+        name index entries, background jobs and pending lazy children are dropped, and variables no
+        longer used by any widget are released. The widgets are destroyed or, if recycling is on,
+        kept for reuse -- see `recycle()`.
+
+        Keyword arguments:
+        + `name` The name of the widget to remove
+
+        Returns: Self for chaining
+    """
+
+    if not (name in self.widgetIndex or name in self.deferredNames):
+      raise Exception(f"No widget with the name '{name}' was found in the window.")
+
+    for child in self.descendants(name): self._dropWidget(child)
+    self._dropWidget(name)
+    return self
+
+  def _deferredInside(self, name):
+    """ Returns the names of the deferred widgets inside the deferred widget `name`, children last. """
+
+    # Deferred widgets share the owner of their deferred parent, after which they're queued
+    inside = [ name ]
+    for ins in self.deferred[self.deferredNames[name]]:
+      if ins['root'] in inside and ins['name'] != name: inside.append(ins['name'])
+    return inside[1:]
+
+  def descendants(self, name):
+    """ Returns the names of the widgets inside the named widget, children after their own children. """
+
+    if name in self.deferredNames: return self._deferredInside(name)[::-1]
+
+    names = [ ]
+    entry = self.widgetIndex.get(name)
+    stack = list(entry[1].winfo_children()) if entry else [ ]
+
+    while stack:
+      widget = stack.pop()
+      stack += widget.winfo_children()
+
+      if str(widget) in self.widgetNames: names.append(self.widgetNames[str(widget)])
+
+    return sorted(names, key=lambda child: -str(self.widgetIndex[child][1]).count('.'))
+
+  def recycle(self, limit=32):
+    """
+        Turns on the recycling of removed widgets: instead of being destroyed, they're unmapped and
+        kept in a WidgetPool, and reused by the next widget added with the same category, parent,
+        options and state, which saves constructing them. A limit of 0 turns recycling off and
+        destroys the pooled widgets.
+
+        Keyword arguments:
+        + `limit` The number of widgets kept for each kind of widget
+
+        Returns: Self for chaining
+    """
+
+    if not limit:
+      if self.pool is not None: self.pool.clear()
+      self.pool = None
+    elif self.pool is None:
+      self.pool = WidgetPool(limit)
+    else:
+      self.pool.limit = limit
+
+    return self
+
+  def addWidgets(self, widgets):
+    """
+        Accepts a dictionary of (widget category, widget list) pairs that will be sequentially
+        added to this Window. Widgets are specified using the given sample below:
+
+        ```
+        {
+          "name" : "", "root" : "", "geoMode" : "",
+          "geoOptions" : { },
+          "options" : { },
+          "state" : [ ],
+          "events" : { }
+        }
+        ```
+
+        Where:
+        + `geoMode` is one of the three geometry function names, or 'none' for no placement
+          + Function names: `place`, `pack`, and `grid`
+        + `options` is name-based parameters passed to the widget's constructor
+        + `state` is values to manipulate the widget's state to (such as 'readonly' for comboboxes)
+        + `events` is a dictionary of (event, function list) pairs for binding to the widget
+        + `paneOptions` [optional] is named-based parameters given to PanedWindow's add function
+        + `tabOptions` [optional] is named-based parameters given to Notebook's add function
+        + `lazy` [optional] if true, the widget's children are only built when it's first mapped. For
+          a Notebook, the children of each tab are only built when the tab is first selected. Looking
+          up a deferred widget by name builds it immediately
+        + `values` [optional] is a list of string entries defining a Combobox's selectable values
+        + `strokes` [optional] is a list of dictionaries specifying stroke information for a Canvas
+          + Form: `{ "type" : "", "unnamed" : [ ], "named" : { "tags" : [ ] }, "events" : { } }`
+          + Where:
+            + `type` is any acceptable type of Canvas graphic, denoted by `create_*` functions
+            + `unnamed` is a list of unnamed parameters passed at the front of the `create_*` functions.
+              When adding strokes through the API, this may also be an `array.array`, NumPy array or
+              other buffer of numbers
+            + `named` is name-based parameters passed to `create_*`
+            + `events` is the same as for the widget itself, exempt applicable to Canvas elements
+            + `name` [optional] is a name for the stroke, whose item id is then available using
+              `getStroke()`
+        + `virtual` [optional] for listboxes and treeviews, binds the widget to a large row source, as in
+          `{ "source" : "", "count" : 0, "buffer" : 5, "scrollbar" : "" }`, where `source` is a command
+          returning the rows and `scrollbar` is an optional Scrollbar defined before the widget -- see
+          `virtualize()`
+        + `rows` [optional] for listboxes and treeviews, a list of rows inserted in the background once
+          the window runs -- see `WidgetCollection.bulkInsert()`
+        + `cull` [optional] for canvases, if true (or a dictionary of `cell` and `margin` options), only
+          the strokes in view are created as canvas items -- see `cullCanvas()`
+
+        Widget categories are any type of widget defined by tkinter, including Button and Frame. The
+        specification of these categories is simple -- in example: `'buttons': [ ... ]`. Any instance
+        of 'variable' specified in the widget's options will be generated according to the name, type,
+        and default value provided, as so: `{ "type" : "", "name" : "", "value" : <some value> }`. An
+        optional `"maxRate"` entry throttles the variable to that many updates per second -- see
+        `addVariable()`
+
+        Keyword arguments:
+        + `widgets` The collection of widgets to add to this window
+
+        Returns: Self for chaining
+    """
+
+    for category in widgets:
+      if not category in CATEGORIES:
+        raise Exception(f"The category '{category}' is not valid for widgets.")
+
+      for widget in widgets[category]:
+        self._addWidget(category, widget)
+
+    return self
+
+  def _addWidget(self, category, widget):
+    """
+        Adds a single widget specification of the given category, as described in `addWidgets()`.
+
+        Returns: The widget, or None if its construction was deferred by a lazy ancestor
+    """
+
+    return self._buildWidget(Window.resolveWidget(category, widget, self._isNamed, self.hasCommand))
+
+  def _isNamed(self, name): return name in self.widgetIndex or name in self.deferredNames
+
+  @staticmethod
+  def resolveWidget(category, widget, hasWidget=None, hasCommand=None):
+    """
+        Validates a single widget specification of the given category, as described in
+        `addWidgets()`, and converts it to a build instruction. The instruction is a dictionary that
+        holds the category, name, root, geometry, options, state and extras of the widget, where the
+        widget's command and the variables in its options are separated into the `command` and
+        `variables` entries. The specification itself is not modified.
+
+        Keyword arguments:
+        + `category` The category of the widget
+        + `widget` The widget specification
+        + `hasWidget` A function that checks whether a parent name may be used
+        + `hasCommand` A function that checks whether a command name may be used
+
+        Returns: The build instruction for the widget
+    """
+
+    name = widget['name']
+    options = dict(widget['options']) if 'options' in widget and widget['options'] else { }
+    geoMode = (widget['geoMode'] if 'geoMode' in widget else 'none').lower()
+
+    if not geoMode in GEOMETRY_MODES:
+      raise Exception(f"Geometry mode {geoMode} is not valid mode. Valid: {GEOMETRY_MODES}")
+
+    # Attempt to locate the parent widget for this widget
+    # If there is no parent specified, defaults to the window
+    # If there is a specified parent but it's not a string, assume its a widget
+    root = widget['root'] if 'root' in widget and widget['root'] else None
+    if 'str' in str(type(root)) and not (hasWidget and hasWidget(root)):
+      raise Exception(f"No widget with the name '{root}' was found to assign as parent.")
+
+    # Attempt to locate the command, if any
+    # If there is a specified command but its not a string, assume its a function
+    command = None
+    if 'command' in options and options['command']:
+      command = options.pop('command')
+
+      if 'str' in str(type(command)) and not (hasCommand and hasCommand(command)):
+        raise Exception(f"No command with the name '{command}' exists for this window.")
+
+    # Comb over the options and collect variables as (name, type, default) lists
+    variables = { }
+    for option in [option for option in options if 'variable' in option]:
+      var = options.pop(option)
+
+      if var['type'] in VARIABLES:
+        variables[option] = [ var['name'], var['type'], var['value'] if 'value' in var else None, var['maxRate'] if 'maxRate' in var else None ]
+      else:
+        raise Exception(f"The provided variable type {var['type']} is invalid.")
+
+    state = widget['state'] if 'state' in widget else None
+    if state and not state.__class__.__name__ in ['list', 'tuple']:
+      raise Exception(f"The structure of the widget's state is invalid -- use a list or tuple")
+
+    # Comb over the events list and check command substitutions
+    events = Window.resolveEvents(widget['events'] if 'events' in widget else { }, hasCommand)
+
+    # Check the row source of virtual listboxes and treeviews
+    virtual = widget['virtual'] if 'virtual' in widget else None
+    if virtual:
+      if not category in [ 'listboxes', 'treeviews' ]:
+        raise Exception(f"Only listboxes and treeviews may be virtual, not '{category}'")
+      if not (hasCommand and hasCommand(virtual['source'])):
+        raise Exception(f"No command with the name '{virtual['source']}' exists for this window.")
+      if 'scrollbar' in virtual and not (hasWidget and hasWidget(virtual['scrollbar'])):
+        raise Exception(f"No widget with the name '{virtual['scrollbar']}' was found to assign as scrollbar.")
+
+    # Check the rows of listboxes and treeviews
+    rows = widget['rows'] if 'rows' in widget else None
+    if rows is not None and not category in [ 'listboxes', 'treeviews' ]:
+      raise Exception(f"Only listboxes and treeviews may have rows, not '{category}'")
+
+    # Check the strokes of canvases
+    strokes = widget['strokes'] if 'strokes' in widget else [ ]
+    for stroke in strokes:
+      if not stroke['type'] in STROKE_TYPES:
+        raise Exception(f"Invalid stroke type provided: '{stroke['type']}'")
+      if 'events' in stroke: Window.resolveEvents(stroke['events'], hasCommand)
+
+    return {
+      'category' : category, 'name' : name, 'root' : root,
+      'geoMode' : geoMode, 'geoOptions' : widget['geoOptions'] if 'geoOptions' in widget else { },
+      'options' : options, 'command' : command, 'variables' : variables,
+      'state' : state, 'events' : events, 'strokes' : strokes,
+      'values' : widget['values'] if 'values' in widget else None,
+      'paneOptions' : widget['paneOptions'] if 'paneOptions' in widget else { },
+      'tabOptions' : widget['tabOptions'] if 'tabOptions' in widget else { },
+      'lazy' : bool(widget['lazy']) if 'lazy' in widget else False,
+      'cull' : widget['cull'] if 'cull' in widget else None,
+      'virtual' : virtual,
+      'rows' : rows
+    }
+
+  @staticmethod
+  def resolveEvents(events, hasCommand=None):
+    """
+        Validates a dictionary of (event, functionlist) pairs, where each function is a function
+        pointer, a command name, or a dictionary of `command` (either of those) and optionally
+        `throttle` or `debounce` in milliseconds -- as in `{ "command" : "", "throttle" : 50 }`.
+
+        Keyword arguments:
+        + `events` The dictionary of events to validate
+        + `hasCommand` A function that checks whether a command name may be used
+
+        Returns: A copy of the dictionary of events
+    """
+
+    for ev in events:
+      for entry in events[ev]:
+        func = entry['command'] if 'dict' in str(type(entry)) else entry
+
+        if 'str' in str(type(func)):
+          if not (hasCommand and hasCommand(func)):
+            raise Exception(f"There is no command '{func}' assigned to this window")
+        elif not callable(func):
+          raise Exception(f"'{func}' is not a bindable function for a widget event")
+
+    return dict([(ev, list(events[ev])) for ev in events])
+
+  @staticmethod
+  def _limits(entry):
+    """ Returns the (throttle, debounce) pair of an event handler entry, as accepted by `resolveEvents()`. """
+
+    return (entry.get('throttle'), entry.get('debounce')) if 'dict' in str(type(entry)) else (None, None)
+
+  def _resolveCommand(self, func):
+    """
+        Returns the window command named `func`, or `func` itself if it's already a function. A
+        coroutine function is wrapped to be scheduled as a task when called.
+    """
+
+    if 'str' in str(type(func)): return self.getCommand(func)
+    return AsyncRunner.wrap(func) if inspect.iscoroutinefunction(func) else func
+
+  def _resolveEntry(self, entry):
+    """ Resolves the command of an event handler entry, keeping the throttle or debounce of dictionaries. """
+
+    return dict(entry, command=self._resolveCommand(entry['command'])) if 'dict' in str(type(entry)) else self._resolveCommand(entry)
+
+  def _resolveHandler(self, entry):
+    """ Resolves an event handler entry to a function, wrapped to apply its throttle or debounce. """
+
+    return self.events.limit(self._resolveCommand(entry['command'] if 'dict' in str(type(entry)) else entry), *Window._limits(entry))
+
+  def _buildWidget(self, ins):
+    """
+        Builds a widget from a build instruction generated by `resolveWidget()`.
+
+        Returns: The widget, or None if its construction was deferred by a lazy ancestor
+    """
+
+    with self.profiler.widget(ins['category'], ins['name']): return self._createWidget(ins)
+
+  def _createWidget(self, ins):
+    """ Builds a widget for `_buildWidget()`, which times it. """
+
+    name, root = ins['name'], ins['root']
+
+    if name in self.deferredNames:
+      raise Exception(f"A widget named '{name}' already exists in this window")
+
+    if 'str' in str(type(root)):
+      # Defer the widget if its parent is lazy and not yet materialized, or is itself deferred
+      owner = root if root in self.deferred else self.deferredNames.get(root)
+
+      if owner is not None:
+        self.deferred[owner].append(ins)
+        self.deferredNames[name] = owner
+        return None
+
+      root = self.findWidget(root)
+      if root is None:
+        raise Exception(f"No widget with the name '{ins['root']}' was found to assign as parent.")
+    elif root is None:
+      root = self.gui
+
+    options = dict(ins['options'])
+    if ins['command'] is not None: options['command'] = self._resolveCommand(ins['command'])
+
+    # Make variable replacements. If a variable already exists, it gets used over creating a new variable
+    with self.profiler.phase('variables'):
+      for option in ins['variables']:
+        var, varType, default, maxRate = ins['variables'][option]
+
+        if not self.hasVariable(var):
+          self.addVariable(var, VARIABLES[varType], default=default, maxRate=maxRate)
+          self.ownedVariables.add(var)
+        options[option] = self.getVariable(var)
+        self.variableUsers.setdefault(var, set()).add(name)
+
+    events = dict([(ev, [self._resolveEntry(func) for func in ins['events'][ev]]) for ev in ins['events']])
+
+    # Add the widget
+    wid = getattr(self, ins['category']).addWidget(name, root, ins['geoMode'], ins['geoOptions'], options, ins['state'], events)
+
+    # Add listbox options
+    if 'listbox' == wid.__class__.__name__.lower():
+      if ins['values'].__class__.__name__ in ['tuple', 'list']:
+        wid.insert('end', *ins['values'])
+
+    # Add the widget to the panedwindow if the parent is a PanedWindow, or as a tab if it's a Notebook
+    if 'PanedWindow' == root.__class__.__name__: root.add(wid, **ins['paneOptions'])
+    if 'Notebook' == root.__class__.__name__: root.add(wid, **ins['tabOptions'])
+
+    # Register lazy subtrees. The children of a lazy widget are built when it's first mapped, and
+    # each tab of a lazy Notebook is a lazy subtree of its own
+    if 'Notebook' == wid.__class__.__name__ and ins['lazy']:
+      self.lazyNotebooks.add(name)
+      self.events.bind(wid, '<<NotebookTabChanged>>', lambda event, name=name: self._materializeTab(name))
+    elif ins['lazy'] or self.findName(root) in self.lazyNotebooks:
+      self.deferred[name] = []
+      self.events.bind(wid, '<Map>', lambda event, name=name: self.materialize(name))
+
+    # Bind virtual listboxes and treeviews to their row source
+    if ins['virtual']:
+      spec = ins['virtual']
+      view = self.virtualize(name, self.getCommand(spec['source'])(), spec.get('count'), spec.get('buffer', 5))
+      if 'scrollbar' in spec: view.attachScrollbar(self.findWidget(spec['scrollbar']))
+
+    # Insert rows in the background
+    if ins['rows']: getattr(self, ins['category']).bulkInsert(name, ins['rows'])
+
+    # Take care of canvas painting
+    if ins['category'] == 'canvases':
+      with self.profiler.phase('strokes'):
+        if ins['cull']: self.cullCanvas(name, **(ins['cull'] if 'dict' in str(type(ins['cull'])) else { }))
+        self.addStrokes(name, ins['strokes'])
+
+    return wid
+
+  def addStrokes(self, canvas, strokes, chunk=STROKE_CHUNK):
+    """
+        Paints a list of strokes on a canvas of this window. Strokes are specified as described in
+        `addWidgets()`.
+
+        Strokes are sent to tkinter in batches of up to `chunk` strokes, each batch being a single
+        call in which consecutive strokes of the same type and named options share their options.
+        Stacking order is preserved. Strokes with identical events share a tag, and each (tag, event)
+        pair is bound once rather than per stroke.
+
+        If the canvas is culled (see `cullCanvas()`), the strokes are added to its spatial index
+        instead, and the names map to stroke indices.
+
+        Keyword arguments:
+        + `canvas` The name of the canvas to paint on
+        + `strokes` The list of stroke dictionaries to paint
+        + `chunk` The maximum number of strokes sent to tkinter in a single call
+
+        Returns: A dictionary of (stroke name, item id) pairs for the named strokes
+    """
+
+    if canvas in self.culled: return self.culled[canvas].add(strokes)
+
+    name = canvas
+    canvas: tkinter.Canvas = self.canvases.getWidget(canvas)
+    items, names = [ ], { }
+
+    for stroke in strokes:
+      if stroke['type'] == 'widget': continue
+      if not stroke['type'] in STROKE_TYPES:
+        raise Exception(f"Invalid stroke type provided: '{stroke['type']}'")
+
+      named = stroke['named'] if 'named' in stroke else { }
+
+      # Strokes with the same events share a tag, which the events are bound to once
+      if 'events' in stroke and stroke['events']:
+        named = dict(named, tags=Window._tags(named.get('tags')) + (self._strokeTag(name, canvas, stroke['events']),))
+
+      items.append((stroke['type'], Window._options(named), Window._coords(stroke['unnamed'])))
+      if 'name' in stroke: names[stroke['name']] = len(items) - 1
+
+    # Group consecutive strokes of the same type and options into runs of (type, options, coordslist)
+    ids = [ ]
+    for start in range(0, len(items), chunk):
+      runs = [ ]
+
+      for sType, options, coords in items[start:start + chunk]:
+        if runs and runs[-1][0] == sType and runs[-1][1] == options:
+          runs[-1][2].append(coords)
+        else:
+          runs.append((sType, options, [ coords ]))
+
+      ids += Window._createStrokes(canvas, runs)
+
+    names = dict([(sName, ids[i]) for sName, i in names.items()])
+    self.strokes.setdefault(name, { }).update(names)
+    return names
+
+  def updateStrokes(self, canvas, coords):
+    """
+        Moves many strokes of a canvas at once by replacing their coordinates, in a single Tcl call.
+        Coordinates may be lists or tuples of numbers, or buffers such as `array.array` and NumPy
+        arrays, which are flattened and sent as-is without building per-point tuples.
+
+        Keyword arguments:
+        + `canvas` The name of the canvas the strokes belong to
+        + `coords` A dictionary of (stroke name or item id, coordinates) pairs. For culled canvases,
+          strokes are addressed by name or stroke index
 
         Returns: Self for chaining
     """
 
-    main : tkinter.Menu = self.menus.addWidget(name, options=options)
+    if canvas in self.culled:
+      self.culled[canvas].update(coords)
+      return self
 
-    # Reconfigure children collection to accomodate dictionaries and lists
-    if 'dict' in str(type(children)):
-      children = [(cName, children[cName]) for cName in children]
-    elif 'list' in str(type(children)):
-      children = [(child.name, child) for child in children]
-    else:
-      raise Exception("Unexpected collection type for children during menu creation")
+    names = self.strokes[canvas] if canvas in self.strokes else { }
+    canvas: tkinter.Canvas = self.canvases.getWidget(canvas)
+    pairs = [ ]
 
-    for cName, child in children:
-      # Convert Menu instances to dictionaries for processing
-      if child.__class__.__name__ != 'dict': child = child.asDict()
+    for name in coords:
+      if 'int' in str(type(name)):
+        pairs += [ name, Window._coords(coords[name]) ]
+      elif name in names:
+        pairs += [ names[name], Window._coords(coords[name]) ]
+      else:
+        raise Exception(f"No stroke named '{name}' was found on the canvas")
 
-      # Associate commands in the window with commands in the menu unless a command is already assigned
-      # This is discerned by checking the type of the command value is a function
-      if child['type'] != 'separator':
-        if 'command' in child['options'] and child['options']['command']:
-          if not 'function' in str(type(child['options']['command'])):
-            if self.hasCommand(child['options']['command']):
-              child['options']['command'] = self.getCommand(child['options']['command'])
-            else:
-              raise Exception(f"There is no command named {child['options']['command']} in this window.")
+    if pairs:
+      canvas.tk.eval(TCL_PROCS)
+      canvas.tk.call('tkjson_coords', canvas._w, tuple(pairs))
 
-      # Act based on child type
-      if child['type'] == 'separator':
-        main.add_separator()
-      elif child['type'] == 'command':
-        main.add_command(label=child['label'], **child['options'])
-      elif child['type'] == 'checkbutton':
-        # Associate the variable for the checkbox
-        if self.hasVariable(child['options']['variable']):
-          child['options']['variable'] = self.getVariable(child['options']['variable'])
-        else:
-          child['options']['variable'] = self.addVariable(child['options']['variable'], tkinter.BooleanVar, default=child['options']['isOn'])
+    return self
 
-        del child['options']['isOn']
+  @staticmethod
+  def _coords(value):
+    """
+        Converts stroke coordinates for tkinter. Lists and tuples are passed as tuples, while buffers
+        of numbers (`array.array`, NumPy arrays, memoryviews) are flattened into a Tcl list string.
+    """
 
-        main.add_checkbutton(label=child['label'], **child['options'])
-      elif child['type'] == 'radiobutton':
-        # Associate the variable for the radiobutton
-        if self.hasVariable(child['options']['variable']):
-          child['options']['variable'] = self.getVariable(child['options']['variable'])
-        else:
-          var = str(type(child['options']['value'])).split("'")[1]
-          if var == 'bool':
-            var = tkinter.BooleanVar
-          elif var == 'str':
-            var = tkinter.StringVar
-          elif var == 'int':
-            var = tkinter.IntVar
-          elif var == 'float':
-            var = tkinter.DoubleVar
-          else:
-            raise Exception(f"The variable type for the variable '{child['options']['variable']}' is unknown.")
+    if value.__class__.__name__ in ['list', 'tuple']: return tuple(value)
 
-          child['options']['variable'] = self.addVariable(child['options']['variable'], var)
+    # NumPy writes the whole array in a single call, as one row
+    if numpy is not None and isinstance(value, numpy.ndarray):
+      text = io.StringIO()
+      row = numpy.ascontiguousarray(value).reshape(1, -1)
+      numpy.savetxt(text, row, fmt='%d' if value.dtype.kind in 'biu' else '%.17g', delimiter=' ', newline='')
+      return text.getvalue()
 
-        main.add_radiobutton(label=child['label'], **child['options'])
-      elif child['type'] == "cascade":
-        self.addMenuRaw(cName, options=child['options'], children=child['children'])
-        main.add_cascade(label=child['label'], menu=self.menus.getWidget(cName))
-    
-    self.gui.config(menu=main)
-    return self
+    view = memoryview(value)
+    if view.ndim != 1: view = view.cast('B').cast(view.format)
 
-  def addMenu(self, menu: Menu = None):
+    return ' '.join(map(format, view))
+
+  def getStroke(self, canvas, name):
+    """ Returns the canvas item id of the stroke named `name` on the canvas `canvas`, or None. """
+
+    if canvas in self.culled: return self.culled[canvas].item(name)
+    return self.strokes[canvas].get(name) if canvas in self.strokes else None
+
+  def virtualize(self, name, source, count=None, buffer=5):
     """
-        Wrapper for `addMenuRaw()` which allows the root menu widget containing all children
-        widget definitions to be used in a succinct, single call
+        Binds a Listbox or Treeview of this window to a row source, only keeping the rows in view in
+        the widget. See `VirtualView` and `RowSource` for details.
 
         Keyword arguments:
-        + `menu` The Menu to add to the window
+        + `name` The name of the Listbox or Treeview
+        + `source` A sequence of rows, or a function of the row index or an iterator of rows
+        + `count` The number of rows, required if the source has no length
+        + `buffer` The number of rows kept in the widget beyond the visible rows
 
-        Returns: Self for chaining
+        Returns: The VirtualView managing the widget
     """
 
-    # Premature return -- no menu provided
-    if menu == None: return self
+    if name in self.virtual:
+      self.virtual[name].setSource(source, count)
+    else:
+      self.virtual[name] = VirtualView(self, name, source, count, buffer)
+    return self.virtual[name]
 
-    dic = menu.asDict()
-    self.addMenuRaw(menu.name, options=dic['options'], children=dic['children'])
-    return self
-  
-  def deleteWidgets(self, widgets=[]):
+  def cullCanvas(self, canvas, cell=256, margin=128):
     """
-        Accepts a list of widget names and sequentially deletes them from the window. If a widget is
-        not found, then an exception is raised indicating the window does not contain the widget
+        Turns on viewport culling for a canvas of this window. Strokes added to the canvas from then
+        on are kept in a spatial index, and canvas items only exist for the strokes in view. See
+        `CulledCanvas` for details.
 
         Keyword arguments:
-        + `widgets` A list of widget names as defined when adding widgets to the window
+        + `canvas` The name of the canvas to cull
+        + `cell` The size of the cells of the spatial index, in canvas units
+        + `margin` The distance around the view in which strokes are also created
 
-        Returns: Self for chaining
+        Returns: The CulledCanvas managing the canvas
     """
 
-    for widget in widgets:
-      found = False
-
-      for category in self.categories:
-        if self.categories[category].hasWidget(widget):
-          found = True
-          self.categories[category].deleteWidget(widget)
-      
-      if not found:
-        raise Exception(f"No widget with the name '{widget}' was found in the window.")
-    
-    return self
+    if not canvas in self.culled:
+      self.culled[canvas] = CulledCanvas(self, canvas, cell, margin)
+    return self.culled[canvas]
 
-  def addWidgets(self, widgets):
-    """
-        Accepts a dictionary of (widget category, widget list) pairs that will be sequentially
-        added to this Window. Widgets are specified using the given sample below:
+  def _strokeTag(self, name, canvas, events):
+    """ Gets the tag shared by strokes of the canvas `name` with the given events, binding it if new. """
 
-        ```
-        {
-          "name" : "", "root" : "", "geoMode" : "",
-          "geoOptions" : { },
-          "options" : { },
-          "state" : [ ],
-          "events" : { }
-        }
-        ```
+    entries = lambda ev: tuple([tuple(sorted(f.items())) if 'dict' in str(type(f)) else f for f in events[ev]])
+    signature = (name,) + tuple([(ev, entries(ev)) for ev in sorted(events)])
 
-        Where:
-        + `geoMode` is one of the three geometry function names, or 'none' for no placement
-          + Function names: `place`, `pack`, and `grid`
-        + `options` is name-based parameters passed to the widget's constructor
-        + `state` is values to manipulate the widget's state to (such as 'readonly' for comboboxes)
-        + `events` is a dictionary of (event, function list) pairs for binding to the widget
-        + `paneOptions` [optional] is named-based parameters given to PanedWindow's add function
-        + `values` [optional] is a list of string entries defining a Combobox's selectable values
-        + `strokes` [optional] is a list of dictionaries specifying stroke information for a Canvas
-          + Form: `{ "type" : "", "unnamed" : [ ], "named" : { "tags" : [ ] }, "events" : { } }`
-          + Where:
-            + `type` is any acceptable type of Canvas graphic, denoted by `create_*` functions
-            + `unnamed` is a list of unnamed parameters passed at the front of the `create_*` functions
-            + `named` is name-based parameters passed to `create_*`
-            + `events` is the same as for the widget itself, exempt applicable to Canvas elements
+    if not signature in self._strokeTags:
+      tag = f"tkjson{next(self._strokeTagIds)}"
+      self._strokeTags[signature] = tag
 
-        Widget categories are any type of widget defined by tkinter, including Button and Frame. The
-        specification of these categories is simple -- in example: `'buttons': [ ... ]`. Any instance
-        of 'variable' specified in the widget's options will be generated according to the name, type,
-        and default value provided, as so: `{ "type" : "", "name" : "", "value" : <some value> }`
+      for ev in events:
+        for entry in events[ev]:
+          func = entry['command'] if 'dict' in str(type(entry)) else entry
 
-        Keyword arguments:
-        + `widgets` The collection of widgets to add to this window
+          if 'str' in str(type(func)) and not self.hasCommand(func):
+            raise Exception(f"The window has no command named '{func}'")
+          elif not 'str' in str(type(func)) and not callable(func):
+            raise Exception(f"'{func}' is not a bindable function for a Canvas graphic")
 
-        Returns: Self for chaining
-    """
+          self.events.bind(canvas, ev, self._resolveCommand(func), *Window._limits(entry), tag=tag)
 
-    for category in widgets:
-      if not category in self.categories:
-        raise Exception(f"The category '{category}' is not valid for widgets.")
+    return self._strokeTags[signature]
 
-      for widget in widgets[category]:
-        # Attempt to locate the parent widget for this widget
-        # If there is no parent specified, defaults to the window
-        # If there is a specified parent but it's not a string, assume its a widget
-        if 'root' in widget and widget['root']:
-          if 'str' in str(type(widget['root'])):
-            for cat in self.categories:
-              if self.categories[cat].hasWidget(widget['root']): widget['root'] = self.categories[cat].getWidget(widget['root'])
-            
-            if 'str' in str(type(widget['root'])):
-              raise Exception(f"No widget with the name '{widget['root']}' was found to assign as parent.")
-        else:
-          widget['root'] = self.gui
-        
-        # Attempt to locate the command, if any
-        # If there is a specified command but its not a string, assume its a function
-        if 'command' in widget['options'] and widget['options']['command']:
-          if 'str' in str(type(widget['options']['command'])):
-            if self.hasCommand(widget['options']['command']):
-              widget['options']['command'] = self.getCommand(widget['options']['command'])
-            else:
-              raise Exception(f"No command with the name '{widget['options']['command']}' exists for this window.")
-
-        # Comb over the options and make variable replacements. If a variable already exists, it gets
-        # used over creating a new variable
-        for option in widget['options']:
-          if 'variable' in option:
-            global VARIABLES
-
-            if widget['options'][option]['type'] in VARIABLES:
-              if not self.hasVariable(widget['options'][option]['name']):
-                self.addVariable(widget['options'][option]['name'], VARIABLES[widget['options'][option]['type']],
-                  default = widget['options'][option]['value'] if 'value' in widget['options'][option] else None)
-
-              widget['options'][option] = self.getVariable(widget['options'][option]['name'])
-            else:
-              raise Exception(f"The provided variable type {widget['options'][option]['type']} is invalid.")
-
-        # Comb over the events list and perform command substitutions
-        if 'events' in widget:
-          for ev in widget['events']:
-            for i in range(len(widget['events'][ev])):
-              func = widget['events'][ev][i]
-
-              if 'str' in str(type(func)):
-                if self.hasCommand(func):
-                  widget['events'][ev][i] = self.getCommand(func)
-                else:
-                  raise Exception(f"There is no command '{func}' assigned to this window")
-              elif func.__class__.__name__ in [ 'function', 'method' ]:
-                raise Exception(f"'{func}' is not a bindable function for a widget event")
-
-        # Add the widget
-        wid = self.__dict__[category].addWidget(
-          widget['name'],
-          widget['root'],
-          widget['geoMode'] if 'geoMode' in widget else 'none',
-          widget['geoOptions'] if 'geoOptions' in widget else {},
-          widget['options'] if 'options' in widget else {},
-          widget['state'] if 'state' in widget else None,
-          widget['events'] if 'events' in widget else {}
-        )
-
-        # Add listbox options
-        if 'listbox' == wid.__class__.__name__.lower():
-          if 'values' in widget and widget['values'].__class__.__name__ in ['tuple', 'list']:
-            wid.insert('end', *widget['values'])
-
-        # Add the widget to the panedwindow if the parent is a PanedWindow
-        if 'PanedWindow' == widget['root'].__class__.__name__: widget['root'].add(wid, **(widget['paneOptions'] if 'paneOptions' in widget else {}))
-
-        # Take care of canvas painting
-        if category == 'canvases':
-          canvas: tkinter.Canvas = self.canvases.getWidget(widget['name'])
-          types = {
-            'line' : canvas.create_line,
-            'rectangle' : canvas.create_rectangle,
-            'oval' : canvas.create_oval,
-            'polygon' : canvas.create_polygon,
-            'arc' : canvas.create_arc,
-            'image' : canvas.create_image,
-            'text' : canvas.create_text
-          }
-
-          for stroke in widget['strokes']:
-            obj = None
-
-            # Perform the stroke using unnamed and named properties
-            if stroke['type'] in types:
-              obj = types[stroke['type']](*stroke['unnamed'], **(stroke['named'] if 'named' in stroke else {}))
-            elif stroke['type'] == 'widget':
-              # TODO Generate a new widget and associate with the canvas using create_image
-              pass
-            else:
-              raise Exception(f"Invalid stroke type provided: '{stroke['type']}'")
-            
-            # Assign event bindings, and perform substitutions for commands as needed
-            if 'events' in stroke:
-              for ev in stroke['events']:
-                for func in stroke['events'][ev]:
-                  if 'str' in str(type(func)):
-                    # Bind a window command
-                    if self.hasCommand(func):
-                      canvas.tag_bind(obj, ev, self.getCommand(func))
-                    else:
-                      raise Exception(f"The window has no command named '{func}'")
-                  elif func.__class__.__name__ in ['function', 'method']:
-                    # Bind a function
-                    canvas.tag_bind(obj, ev, func)
-                  else:
-                    raise Exception(f"'{func}' is not a bindable function for a Canvas graphic")
-    
-    return self
+  @staticmethod
+  def _tags(tags):
+    """ Converts the value of a stroke's `tags` option to a tuple. """
+
+    if not tags: return ()
+    elif 'str' in str(type(tags)): return tuple(tags.split())
+    else: return tuple(tags)
+
+  @staticmethod
+  def _options(named):
+    """ Converts named stroke options to a flat tuple of Tcl options, e.g. `('-fill', 'red')`. """
+
+    options = ()
+    for key in named:
+      options += ('-'+key, named[key])
+    return options
+
+  @staticmethod
+  def _createStrokes(canvas, runs):
+    """ Creates the canvas items of a list of (type, options, coordslist) runs in one Tcl call. """
+
+    canvas.tk.eval(TCL_PROCS)
+    return [int(i) for i in canvas.tk.splitlist(canvas.tk.call('tkjson_strokes', canvas._w, tuple(runs)))]
 
   def hasVariable(self, name): return name in self.variables
 
@@ -687,9 +4228,22 @@ class Window():
     else:
       return None
 
-  def addVariable(self, name, _class, default=None):
+  def addVariable(self, name, _class, default=None, maxRate=None):
+    """
+        Adds a variable to the window.
+
+        Keyword arguments:
+        + `name` The name of the variable
+        + `_class` The tkinter variable class, such as `tkinter.StringVar`
+        + `default` The initial value of the variable
+        + `maxRate` If given, the variable is throttled to this many writes to tkinter per second --
+          see `ThrottledVariable`
+
+        Returns: The variable
+    """
+
     if not self.hasVariable(name):
-      self.variables[name] = _class()
+      self.variables[name] = BACKEND.variable(_class, maxRate)
 
       if default: self.variables[name].set(default)
 
@@ -697,14 +4251,74 @@ class Window():
     else:
       raise Exception(f"Variable {name} already exists for this window")
   
-  def hasCommand(self, name): return 'com_'+name in dir(self)
+  def hasCommand(self, name):
+    return name in self.commands or (self.manager is not None and self.manager.hasCommand(name))
 
   def getCommand(self, name):
-    if self.hasCommand(name): return getattr(self, 'com_'+name)
+    """
+        Gets a command by name, looking first at this window's commands and then at the commands
+        shared through the window's manager. Shared commands are bound to this window on access.
+
+        Keyword arguments:
+        + `name` The name of the command to fetch
+
+        Returns: The bound command, or None if neither the window nor its manager has it
+    """
+
+    if name in self.commands: return self.commands[name]
+    elif self.manager is not None and self.manager.hasCommand(name):
+      return types.MethodType(self.manager.getCommand(name), self)
     else:
       return None
+
+  def removeCommand(self, name):
+    """
+        Removes a command from this window. Widgets and events already bound to the command keep
+        their reference to it.
+
+        Keyword arguments:
+        + `name` The name of the command to remove
+
+        Returns: The removed command, or None if the window has no command named `name`
+    """
+
+    com = self.commands.pop(name, None)
+    if com is not None and 'com_'+name in self.__dict__: delattr(self, 'com_'+name)
+    return com
+
+  @staticmethod
+  def _timed(name, func):
+    """ Wraps a command function to record how long each call takes in the metrics of the window it's bound to. """
+
+    def command(win, *args, **kwargs):
+      start = time.perf_counter()
+
+      try:
+        return func(win, *args, **kwargs)
+      finally:
+        win.metrics.add(name, time.perf_counter() - start)
+
+    return command
+
+  def _registerCommand(self, name, func, cancel=False, offload=None, done=None, progress=None, inputs=None):
+    """
+        Binds `func` to this window and records it in the command registry under `name`. Coroutine
+        functions are wrapped to be scheduled as tasks, cancelling the command's unfinished task
+        first if `cancel` is true, and offloaded functions are wrapped to be run by an executor.
+    """
+
+    if offload:
+      func = Offload.wrap(func, offload, done, progress, inputs)
+    elif inspect.iscoroutinefunction(func):
+      func = AsyncRunner.wrap(func, (self, name) if cancel else None)
+
+    func = Window._timed(name, func)
+
+    self.commands[name] = types.MethodType(func, self)
+    setattr(self, 'com_'+name, self.commands[name])
+    return self.commands[name]
     
-  def addCommand(self, name, com):
+  def addCommand(self, name, com, cancel=False, offload=None, done=None, progress=None, inputs=None):
     """
         Accepts a name and function already-defined using Python, and binds the function to
         this window for execution in widgets that use it. A function should be defined with
@@ -712,15 +4326,25 @@ class Window():
         and should not return values. `self` in the context of said function will be this
         window, and `event` will be assigned if the command is used for an event binding.
 
+        A coroutine function (`async def`) is scheduled as an asyncio task whenever the command is
+        called, and may await without freezing the window -- see `runAsync()` and `AsyncRunner`.
+
         Keyword arguments:
         + `name` The name to represent the function `com` as
         + `com` The function, prior-defined, to bind to this Window for usage
+        + `cancel` For coroutine functions, whether calling the command cancels its unfinished task,
+          as wanted for search-as-you-type
+        + `offload` Either `process` or `thread` to run the function in a process or thread pool,
+          called with a dictionary of the values of the window's variables -- see `Offload`
+        + `done` For offloaded commands, the name of the command receiving the result as `event`
+        + `progress` For offloaded commands, the name of a progressbar that runs while they do
+        + `inputs` For offloaded commands, the names of the variables passed, or None for all of them
 
         Returns: Self for chaining
     """
 
-    if not self.hasCommand(name):
-      setattr(self, 'com_'+name, types.MethodType(com, self))
+    if not name in self.commands:
+      self._registerCommand(name, com, cancel, offload, done, progress, inputs)
     else:
       raise Exception(f"A command with the name '{name}' already exists for this window.")
 
@@ -739,28 +4363,35 @@ class Window():
     for name, com in comList: self.addCommand(name, com)
     return self
   
-  def addCommandRaw(self, name, com):
+  def addCommandRaw(self, name, com, cancel=False, offload=None, done=None, progress=None, inputs=None):
     """
         Accepts a raw, single-line string (using `\\n` as line separators) alongside a name,
         and generates a command bound to this Window. The spacing of each line should follow
         the same constraints as any other Python code, exempting the line
         `def func(self, event=None)`.
 
+        Code using `await`, `async for` or `async with` becomes an `async def` command, scheduled as
+        an asyncio task when called (see `addCommand()`). The code may also be given as a dictionary
+        `{ "code" : "", "cancel" : false, "offload" : "", "done" : "", "progress" : "", "inputs" : [ ] }`,
+        where every entry but `code` is optional and as for `addCommand()`. The code of an offloaded
+        command gets the dictionary of variable values as `self`, and returns its result.
+
+        Compiled code is kept in the module's `CODE_CACHE`, so the same code is only compiled once.
+
         Keyword arguments:
         + `name` The name of the command which the code in `com` should be represented by
         + `com` The raw Python code to execute when the command is called by a widget
+        + `cancel` For asynchronous code, whether calling the command cancels its unfinished task
+        + `offload`, `done`, `progress`, `inputs` As for `addCommand()`
 
         Returns: Self for chaining
     """
 
-    if not self.hasCommand(name):
-      parsed = '\n'.join([' '+ln for ln in com.split('\n')])
-      _local = {}
-
-      exec(f"def com_{name}(self, event=None):\n{parsed}", None, _local)
+    options = { 'cancel' : cancel, 'offload' : offload, 'done' : done, 'progress' : progress, 'inputs' : inputs }
+    if 'dict' in str(type(com)): com, options = com['code'], dict(options, **Window._commandOptions(com))
 
-      for name, value in _local.items():
-        setattr(self, name, types.MethodType(value, self))
+    if not name in self.commands:
+      self._registerCommand(name, types.FunctionType(CODE_CACHE.compile(com), globals(), 'com_'+name, (None,)), **options)
     else:
       raise Exception(f"A command with the name '{name}' already exists for this window.")
   
@@ -768,15 +4399,64 @@ class Window():
   
   def addCommandsRaw(self, comList):
     """
-        Wrapper for executing multiple calls of `addCommandRaw()`
+        Equivalent to multiple calls of `addCommandRaw()`, except that all commands that aren't
+        already in `CODE_CACHE` are compiled together in one pass.
 
         Keyword arguments:
-        + `comList` A list of (name, code string) pairs for usage in `addCommandRaw()`
+        + `comList` A list of (name, code string or dictionary) pairs for usage in `addCommandRaw()`
 
         Returns: Self for chaining
     """
 
-    for name, com in comList: self.addCommandRaw(name, com)
+    for name, com in comList:
+      if name in self.commands:
+        raise Exception(f"A command with the name '{name}' already exists for this window.")
+
+    sources = [com['code'] if 'dict' in str(type(com)) else com for name, com in comList]
+
+    try:
+      codes = CODE_CACHE.compileMany(sources)
+    except SyntaxError:
+      # Compile each command on its own so the error is raised for the offending command
+      for name, com in comList: self.addCommandRaw(name, com)
+      return self
+
+    for (name, com), code in zip(comList, codes):
+      options = Window._commandOptions(com) if 'dict' in str(type(com)) else { }
+      self._registerCommand(name, types.FunctionType(code, globals(), 'com_'+name, (None,)), **options)
+    return self
+
+  @staticmethod
+  def _commandOptions(com):
+    """ Returns the options of a raw command dictionary, as passed to `_registerCommand()`. """
+
+    return dict([(k, com[k]) for k in [ 'cancel', 'offload', 'done', 'progress', 'inputs' ] if k in com])
+
+  def values(self, names=None):
+    """
+        Returns a dictionary of (variable name, value) pairs for the window's variables, or for the
+        variables named in `names`.
+    """
+
+    names = self.variables if names is None else names
+    return dict([(n, self.variables[n].get() if hasattr(self.variables[n], 'get') else self.variables[n]) for n in names])
+
+  def busy(self, progress, running):
+    """ Counts a running (or finished) offloaded call for the progressbar `progress`, starting or stopping it. """
+
+    if not progress: return self
+    bar = self.findWidget(progress)
+    if bar is None: raise Exception(f"No progressbar named '{progress}' exists in this window")
+
+    count = self._busy.get(progress, 0) + (1 if running else -1)
+    self._busy[progress] = max(count, 0)
+
+    if running and count == 1:
+      bar.configure(mode='indeterminate')
+      bar.start()
+    elif not running and count <= 0:
+      bar.stop()
+
     return self
   
   def addCommandsMixed(self, comList):
@@ -784,15 +4464,15 @@ class Window():
         Wrapper for executing multiple calls to both `addCommandRaw()` and `addCommand()`.
 
         Keyword arguments:
-        + `comList` A list of (name, code string or function) pairs
+        + `comList` A list of (name, code string, code dictionary or function) pairs
 
         Returns: Self for chaining
     """
 
+    self.addCommandsRaw([(name, com) for name, com in comList if com.__class__.__name__ in [ 'str', 'dict' ]])
+
     for name, com in comList:
-      if 'str' == com.__class__.__name__:
-        self.addCommandRaw(name, com)
-      else:
+      if not com.__class__.__name__ in [ 'str', 'dict' ]:
         self.addCommand(name, com)
     return self
   
@@ -832,18 +4512,26 @@ class Window():
     
     return self
   
-  def bindEvent(self, event, code):
+  def bindEvent(self, event, code, throttle=None, debounce=None):
     """
         Binds a single event for the window using either a command name or function pointer. If
         a command name is specified, and the command does not exist, an exception will be raised.
+        Functions bound to the same event are all called, in the order they were bound.
 
         Keyword arguments:
         + `event` The event name, as defined in tkinter, to assign the code to
-        + `code` A function pointer or command name to assign to the event
+        + `code` A function pointer or command name to assign to the event, or a dictionary of
+          `command` and `throttle` or `debounce` as accepted by `resolveEvents()`
+        + `throttle` If given, the code runs at most once every `throttle` milliseconds
+        + `debounce` If given, the code only runs once no event came for `debounce` milliseconds
 
         Returns: Self for chaining
     """
 
+    if 'dict' in str(type(code)):
+      throttle, debounce = code.get('throttle', throttle), code.get('debounce', debounce)
+      code = code['command']
+
     if 'str' in str(type(code)):
       if self.hasCommand(code):
         code = self.getCommand(code)
@@ -852,14 +4540,15 @@ class Window():
     elif not 'function' in str(type(code)):
       raise Exception("A function was not provided for binding to the window")
 
-    self.gui.bind(event, code)
+    self.events.bind(self.gui, event, code, throttle, debounce)
 
     return self
   
   def unbindEvent(self, event, code):
     """
-        Unbinds a single event for the window using either a command name or function pointer. If
-        a command name is specified, and the command does not exists, an exception will be raised.
+        Unbinds a single function from an event of the window using either a command name or
+        function pointer, leaving other functions bound to the event. If a command name is
+        specified, and the command does not exists, an exception will be raised.
 
         Keyword arguments:
         + `event` The event name, as defined in tkinter, to unbind the code from
@@ -868,6 +4557,8 @@ class Window():
         Returns: Self for chaining
     """
 
+    if 'dict' in str(type(code)): code = code['command']
+
     if 'str' in str(type(code)):
       if self.hasCommand(code):
         code = self.getCommand(code)
@@ -876,7 +4567,7 @@ class Window():
     elif not 'function' in str(type(code)):
       raise Exception("A function was not provided for unbinding to the window")
 
-    self.gui.unbind(event, code)
+    self.events.unbind(self.gui, event, code)
 
     return self
   
@@ -890,6 +4581,7 @@ class Window():
     if self.gui.state() in ['iconic', 'icon', 'withdrawn']:
       self.gui.deiconify()
 
+    self.hiddenAt = None
     return self
   
   def minimize(self):
@@ -913,10 +4605,11 @@ class Window():
     """
 
     self.gui.withdraw()
+    self.hiddenAt = time.monotonic()
     return self
 
   @staticmethod
-  def build(width=480, height=320, title='PUI', icon=None, menu=None, com=[], events={}, widgets={}):
+  def build(width=480, height=320, title='PUI', icon=None, menu=None, com=[], events={}, widgets={}, manager=None):
     """
         Builds a Window by shortening all critical function calls to this single call.
 
@@ -929,17 +4622,30 @@ class Window():
         + `com` The list of (name, function|code) pairs to associate with the window
         + `events` A dictionary of (event, functionlist) pairs for binding to the window
         + `widgets` The dictionary of (category, widgetlist) pairs for adding widgets
+        + `manager` The WindowManager the window is built for, so its shared commands resolve during
+          the build
 
         Returns: The Window built using the given parameters
     """
 
-    return Window(width, height, title).setIcon(icon).addCommandsMixed(com).bindEvents(events).addMenu(menu).addWidgets(widgets)
+    profiler = manager.profiler if manager else NULL_PROFILER
+
+    with profiler.phase('window'):
+      win = Window(width, height, title)
+      if manager: win.setManager(manager)
+      win.setIcon(icon)
+
+    with profiler.phase('commands'): win.addCommandsMixed(com)
+    with profiler.phase('events'): win.bindEvents(events)
+    with profiler.phase('menu'): win.addMenu(menu)
+
+    return win.addWidgets(widgets)
 
   @staticmethod
-  def buildFromDict(dic=None):
+  def buildFromDict(dic=None, manager=None):
     if not dic: return None
     else:
-      return Window.build(
+      win = Window.build(
         dic['win']['width'],
         dic['win']['height'],
         dic['win']['title'],
@@ -950,9 +4656,328 @@ class Window():
         [(k, dic['commands'][k]) for k in dic['commands']]
           if 'commands' in dic else [],
         dic['events'] if 'events' in dic else {},
-        dic['widgets']
+        dic['widgets'],
+        manager
       )
 
+      # Keep the dictionary, which apply() compares new dictionaries against
+      win.spec = dic
+      return win
+
+  def apply(self, dic):
+    """
+        Updates this window in place to match a new window dictionary, as accepted by
+        `buildFromDict()`, by comparing it with the dictionary the window was built from. Only what
+        differs is changed -- the size, title and icon, commands, window events, the menu, and
+        widgets:
+        + Widgets that are new are built, and widgets that are gone are destroyed
+        + Widgets whose category, parent, `lazy`, `virtual`, `cull`, `values`, `rows`,
+          `paneOptions` or `tabOptions` changed, or which lost an option, are rebuilt along with
+          their descendants
+        + Other widgets that changed are reconfigured, placed again, rebound, or have their strokes
+          repainted, as needed
+
+        Variables are kept, so untouched widgets -- and any widget sharing their variables -- keep
+        their values, and untouched widgets keep their scroll position. Widgets and events using a
+        command whose code changed are bound to the new command.
+
+        Keyword arguments:
+        + `dic` The new dictionary of the window
+
+        Returns: Self for chaining
+    """
+
+    if self.spec is None:
+      raise Exception("The window wasn't built from a dictionary, so it can't be updated from one")
+
+    old, new = self.spec, dic
+
+    # Window properties
+    if old['win'] != new['win']:
+      if (old['win']['width'], old['win']['height']) != (new['win']['width'], new['win']['height']):
+        self.gui.geometry(f"{new['win']['width']}x{new['win']['height']}")
+      if old['win']['title'] != new['win']['title']: self.gui.title(new['win']['title'])
+      if old['win'].get('icon') != new['win'].get('icon'): self.setIcon(new['win'].get('icon'))
+
+    # Commands that changed or were removed are replaced wherever they're used
+    oldCom, newCom = old.get('commands', { }), new.get('commands', { })
+    changed = set([name for name in oldCom if oldCom[name] != newCom.get(name)])
+
+    for name in changed: self.removeCommand(name)
+    self.addCommandsMixed([(name, newCom[name]) for name in newCom if name in changed or not name in oldCom])
+
+    # Window events
+    oldEv, newEv = old.get('events', { }), new.get('events', { })
+    if oldEv != newEv or Window._refers(oldEv, changed):
+      newEv = Window.resolveEvents(newEv, self.hasCommand)
+      for ev in oldEv: self.events.unbind(self.gui, ev)
+      self.bindEvents(newEv)
+
+    # Menu
+    oldMenu = Window.resolveMenu(old['menu']['name'], old['menu']['options'], old['menu']['children'], lambda n: True) if 'menu' in old else [ ]
+    newMenu = Window.resolveMenu(new['menu']['name'], new['menu']['options'], new['menu']['children'], self.hasCommand) if 'menu' in new else [ ]
+
+    if oldMenu != newMenu or [ins for ins in oldMenu if ins[0] == 'entry' and 'str' in str(type(ins[5])) and ins[5] in changed]:
+      for ins in reversed(oldMenu):
+        if ins[0] == 'menu': self.menus.deleteWidget(ins[1])
+
+      if newMenu:
+        self._buildMenu(newMenu)
+        self.gui.config(menu=self.menus.getWidget(new['menu']['name']))
+      else:
+        self.gui.config(menu='')
+
+    # Widgets
+    oldIns = dict([(widget['name'], Window.resolveWidget(category, widget, lambda n: True, lambda n: True))
+      for category, widget in Window.specWidgets(old)])
+    newIns = { }
+
+    known = set([ins[1] for ins in newMenu if ins[0] == 'menu'])
+    for category, widget in Window.specWidgets(new):
+      if widget['name'] in known:
+        raise Exception(f"A widget named '{widget['name']}' already exists in this window")
+
+      newIns[widget['name']] = Window.resolveWidget(category, widget, known.__contains__, self.hasCommand)
+      known.add(widget['name'])
+
+    # Parents come before their children, so a rebuilt parent marks its descendants as rebuilt
+    rebuild = set([name for name in oldIns if not name in newIns])
+    for name in newIns:
+      if name in oldIns and self._needsRebuild(oldIns[name], newIns[name], rebuild, changed): rebuild.add(name)
+
+    for name in reversed(list(oldIns)):
+      if name in rebuild: self._dropWidget(name)
+
+    for name in newIns:
+      if name in oldIns and not name in rebuild:
+        self._updateWidget(oldIns[name], newIns[name], changed)
+      else:
+        self._buildWidget(newIns[name])
+
+    self.spec = new
+    return self
+
+  @staticmethod
+  def specWidgets(dic):
+    """ Generates the (category, widget specification) pairs of a window dictionary, in build order. """
+
+    for category in dic['widgets']:
+      if not category in CATEGORIES:
+        raise Exception(f"The category '{category}' is not valid for widgets.")
+
+      for widget in dic['widgets'][category]: yield category, widget
+
+  @staticmethod
+  def _refers(events, names):
+    """ Returns whether a dictionary of (event, functionlist) pairs uses any of the given command names. """
+
+    funcs = [func['command'] if 'dict' in str(type(func)) else func for ev in events for func in events[ev]]
+    return any([func in names for func in funcs if 'str' in str(type(func))])
+
+  def _needsRebuild(self, old, new, rebuild, changed):
+    """ Returns whether a widget has to be rebuilt, rather than updated, to go from instruction `old` to `new`. """
+
+    if old['root'] != new['root'] or old['root'] in rebuild: return True
+
+    for key in [ 'category', 'lazy', 'virtual', 'cull', 'values', 'rows', 'paneOptions', 'tabOptions' ]:
+      if old[key] != new[key]: return True
+
+    if set(old['options']) - set(new['options']) or set(old['variables']) - set(new['variables']): return True
+    if old['command'] is not None and new['command'] is None: return True
+    if new['virtual'] and (new['virtual']['source'] in changed or new['virtual'].get('scrollbar') in rebuild): return True
+
+    events = old['events'] != new['events'] or Window._refers(old['events'], changed)
+    strokes = old['strokes'] != new['strokes'] or any([Window._refers(s.get('events', { }), changed) for s in old['strokes']])
+
+    # Widgets that aren't built yet are rebuilt on any change
+    if new['name'] in self.deferredNames:
+      return old != new or events or strokes or ('str' in str(type(old['command'])) and old['command'] in changed)
+    return bool(new['cull'] and strokes)
+
+  def _dropWidget(self, name):
+    """ Removes a widget, along with the lazy subtrees, strokes, jobs and variables the window keeps for it. """
+
+    if name in self.deferredNames:
+      owner = self.deferredNames.pop(name)
+      self.deferred[owner] = [ins for ins in self.deferred[owner] if ins['name'] != name]
+    else:
+      category = self.findCategory(name)
+      if category is None: return self
+
+      collection = getattr(self, category)
+      if collection.jobs and name in collection.jobs: collection.jobs.pop(name).cancel()
+      if name in self.culled and self.culled[name]._job: self.gui.after_cancel(self.culled[name]._job)
+
+      # Widgets with lazy children, strokes or row sources are never recycled
+      plain = not (name in self.deferred or name in self.lazyNotebooks or name in self.strokes or name in self.culled or name in self.virtual)
+      collection._delete(name, destroy=not (plain and self.pool is not None and self.pool.put(collection.widgets[name], self.applied.get(name))))
+
+    for child in [child for child in self.deferredNames if self.deferredNames[child] == name]: del self.deferredNames[child]
+    self._releaseVariables(name)
+    self.deferred.pop(name, None)
+    self.lazyNotebooks.discard(name)
+    self.strokes.pop(name, None)
+    self.culled.pop(name, None)
+    self.virtual.pop(name, None)
+    self._pending.pop(name, None)
+    return self
+
+  def _releaseVariables(self, name):
+    """
+        Releases the variables that were created by widget specifications, used by the widget `name`
+        and aren't used by any other widget. Variables added through `addVariable()` or used by
+        menus are kept, as are all variables once a menu uses them.
+    """
+
+    for var in [var for var in self.variableUsers if name in self.variableUsers[var]]:
+      self.variableUsers[var].discard(name)
+      if self.variableUsers[var]: continue
+
+      del self.variableUsers[var]
+      if not var in self.ownedVariables: continue
+
+      self.ownedVariables.discard(var)
+      variable = self.variables.pop(var, None)
+      if isinstance(variable, ThrottledVariable) and variable._job is not None: variable._root.after_cancel(variable._job)
+
+  def _updateWidget(self, old, new, changed):
+    """ Updates a built widget from instruction `old` to `new`, where `changed` are the replaced command names. """
+
+    name = new['name']
+    collection = getattr(self, new['category'])
+    wid = collection.getWidget(name)
+
+    # Options, the command and variables. Existing variables are reused, keeping their values
+    options = dict([(k, v) for k, v in new['options'].items() if not k in old['options'] or old['options'][k] != v])
+
+    if new['command'] is not None and (new['command'] != old['command'] or new['command'] in changed):
+      options['command'] = self._resolveCommand(new['command'])
+
+    for option in new['variables']:
+      var, varType, default, maxRate = new['variables'][option]
+
+      if old['variables'].get(option, [ None, None ])[:2] != [ var, varType ]:
+        if not self.hasVariable(var):
+          self.addVariable(var, VARIABLES[varType], default=default, maxRate=maxRate)
+          self.ownedVariables.add(var)
+        options[option] = self.getVariable(var)
+        self.variableUsers.setdefault(var, set()).add(name)
+
+    if options: collection.configure(name, **options)
+
+    # Geometry. Widgets keep their place in the packing order unless geometry options were removed
+    if old['geoMode'] != new['geoMode'] or old['geoOptions'] != new['geoOptions']:
+      if old['geoMode'] != 'none' and (old['geoMode'] != new['geoMode'] or set(old['geoOptions']) - set(new['geoOptions'])):
+        getattr(wid, old['geoMode'] + '_forget')()
+      if new['geoMode'] != 'none': getattr(wid, new['geoMode'])(**new['geoOptions'])
+
+    if old['state'] != new['state']:
+      wid.state([('!' + s) for s in (old['state'] or [ ]) if not s.startswith('!')] + list(new['state'] or [ ]))
+
+    if old['events'] != new['events'] or Window._refers(old['events'], changed):
+      for ev in old['events']: self.events.unbind(wid, ev)
+
+      for ev in new['events']:
+        for func in new['events'][ev]:
+          entry = self._resolveEntry(func)
+          self.events.bind(wid, ev, entry['command'] if 'dict' in str(type(entry)) else entry, *Window._limits(entry))
+
+    # Strokes are repainted when any of them changed
+    if new['category'] == 'canvases':
+      if old['strokes'] != new['strokes'] or any([Window._refers(s.get('events', { }), changed) for s in old['strokes']]):
+        wid.delete('all')
+        self.strokes.pop(name, None)
+
+        for signature in [signature for signature in self._strokeTags if signature[0] == name]:
+          tag = self._strokeTags.pop(signature)
+          for ev, funcs in signature[1:]: self.events.unbind(wid, ev, tag=tag)
+
+        self.addStrokes(name, new['strokes'])
+
+    return wid
+
+  @staticmethod
+  def compile(dic, shared=[]):
+    """
+        Validates a window dictionary, as accepted by `buildFromDict()`, and compiles it to a flat
+        list of build instructions for `buildFromPlan()`. Instructions are lists whose first item is
+        the operation -- `window`, `commands`, `events`, `menu` or `widget`.
+
+        Keyword arguments:
+        + `dic` The dictionary of the window
+        + `shared` Names of the shared commands that will be available to the window
+
+        Returns: The list of instructions
+    """
+
+    commands = [(k, dic['commands'][k]) for k in dic['commands']] if 'commands' in dic else []
+    names = set([name for name, com in commands] + list(shared))
+    widgets = set()
+
+    instructions = [
+      [ 'window', dic['win']['width'], dic['win']['height'], dic['win']['title'], dic['win']['icon'] if 'icon' in dic['win'] else None ],
+      [ 'commands', commands ],
+      [ 'events', Window.resolveEvents(dic['events'] if 'events' in dic else { }, names.__contains__) ]
+    ]
+
+    if 'menu' in dic:
+      menu = Window.resolveMenu(dic['menu']['name'], dic['menu']['options'], dic['menu']['children'], names.__contains__)
+      widgets.update([ins[1] for ins in menu if ins[0] == 'menu'])
+      instructions.append([ 'menu', dic['menu']['name'], menu ])
+
+    for category in dic['widgets']:
+      if not category in CATEGORIES:
+        raise Exception(f"The category '{category}' is not valid for widgets.")
+
+      for widget in dic['widgets'][category]:
+        if widget['name'] in widgets:
+          raise Exception(f"A widget named '{widget['name']}' already exists in this window")
+
+        instructions.append([ 'widget', Window.resolveWidget(category, widget, widgets.__contains__, names.__contains__) ])
+        widgets.add(widget['name'])
+
+    return instructions
+
+  @staticmethod
+  def buildFromPlan(instructions, manager=None):
+    """
+        Builds a Window from a list of instructions generated by `compile()`, without validating it
+        again.
+
+        Keyword arguments:
+        + `instructions` The list of instructions of the window
+        + `manager` The WindowManager the window is built for
+
+        Returns: The Window built from the instructions
+    """
+
+    win = None
+    profiler = manager.profiler if manager else NULL_PROFILER
+
+    for ins in instructions:
+      op = ins[0]
+
+      if op == 'widget':
+        win._buildWidget(ins[1])
+        continue
+
+      with profiler.phase(op):
+        if op == 'window':
+          win = Window(ins[1], ins[2], ins[3])
+          if manager: win.setManager(manager)
+          win.setIcon(ins[4])
+        elif op == 'commands':
+          win.addCommandsRaw(ins[1])
+        elif op == 'events':
+          win.bindEvents(ins[1])
+        elif op == 'menu':
+          win._buildMenu(ins[2])
+          win.gui.config(menu=win.menus.getWidget(ins[1]))
+        else:
+          raise Exception(f"Invalid plan instruction '{op}'")
+
+    return win
+
   @staticmethod
   def buildRaw(raw=''):
     """ 
@@ -971,7 +4996,8 @@ class Window():
         + `events` is a dictionary of (event, functionlist) pairs where each entry in the function list
           is assigned to the window as a responder to the event provided. It has a form similar to:
           + `{ "<Button-1>" : [ "sample" ] }`
-        + `commands` is a set of name-code pairs, where code is Python code separated by line with \\n
+        + `commands` is a set of name-code pairs, where code is Python code separated by line with \\n,
+          or a dictionary `{ "code" : "", "cancel" : false }` (see `addCommandRaw()`)
         + `menu` is the entire structure of the 'File' menu at the top of the window,
         + `widgets` is a dictionary of category-widgetlist pairs for adding widgets to the Window
 
@@ -982,5 +5008,3 @@ class Window():
     """
 
     return None if not raw else Window.buildFromDict(json.loads(raw))
-
-# TODO Modify canvas children using configure -- https://tkdocs.com/tutorial/canvas.html > Modifying Items
@@ -0,0 +1,82 @@
+import copy
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+LAYOUT = {
+  'win' : { 'width' : 320, 'height' : 240, 'title' : 'Apply' },
+  'commands' : { 'cmd' : "self.variables['out'].set('old')" },
+  'widgets' : {
+    'frames' : [ { 'name' : 'frm', 'geoMode' : 'pack' } ],
+    'buttons' : [ { 'name' : 'btn', 'root' : 'frm', 'geoMode' : 'pack', 'options' : { 'text' : 'Run', 'command' : 'cmd' } } ],
+    'labels' : [
+      {
+        'name' : 'lbl', 'root' : 'frm', 'geoMode' : 'pack', 'events' : { '<Button-1>' : [ 'cmd' ] },
+        'options' : { 'text' : 'Out', 'textvariable' : { 'name' : 'out', 'type' : 'StringVar', 'value' : '' } }
+      },
+      { 'name' : 'lblGone', 'root' : 'frm', 'geoMode' : 'pack', 'options' : { 'text' : 'Gone' }, 'events' : { '<Button-1>' : [ 'cmd' ] } }
+    ],
+    'canvases' : [
+      { 'name' : 'can', 'geoMode' : 'pack', 'strokes' : [ { 'type' : 'line', 'unnamed' : [ 0, 0, 10, 10 ], 'events' : { '<Button-1>' : [ 'cmd' ] } } ] }
+    ]
+  }
+}
+
+class ApplyTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.win = WindowManager.build({ 'main' : copy.deepcopy(LAYOUT) }).getWindow('main')
+    self.new = copy.deepcopy(LAYOUT)
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def logged(self, action):
+    return [entry for entry in self.backend.log if entry[0] == action]
+
+  def widgets(self, category):
+    return dict([(widget['name'], widget) for widget in self.new['widgets'][category]])
+
+  def test_changed_option_reconfigures(self):
+    label, built = self.win.labels.getWidget('lbl'), len(self.logged('construct'))
+    self.win.variables['out'].set('kept')
+
+    self.widgets('labels')['lbl']['options']['text'] = 'Changed'
+    self.win.apply(self.new)
+
+    self.assertIs(self.win.labels.getWidget('lbl'), label)
+    self.assertEqual(label.cget('text'), 'Changed')
+    self.assertEqual(len(self.logged('construct')), built)
+    self.assertEqual(self.win.variables['out'].get(), 'kept')
+
+  def test_removed_widget_is_destroyed_and_unbound(self):
+    label = self.win.labels.getWidget('lblGone')
+
+    self.new['widgets']['labels'] = [ self.widgets('labels')['lbl'] ]
+    self.win.apply(self.new)
+
+    self.assertIsNone(self.win.findWidget('lblGone'))
+    self.assertFalse(label.winfo_exists())
+    self.assertFalse([key for key in self.win.events.bindings if key[0] == str(label)])
+
+  def test_changed_command_rebinds(self):
+    button, label = self.win.buttons.getWidget('btn'), self.win.labels.getWidget('lbl')
+    tags = [key[1] for key in self.win.events.bindings if key[1] is not None]
+
+    self.new['commands']['cmd'] = "self.variables['out'].set('new')"
+    self.win.apply(self.new)
+    self.assertIs(self.win.buttons.getWidget('btn'), button)
+
+    button.cget('command')()
+    self.assertEqual(self.win.variables['out'].get(), 'new')
+
+    self.win.variables['out'].set('')
+    label.event_generate('<Button-1>')
+    self.assertEqual(self.win.variables['out'].get(), 'new')
+
+    # The strokes are repainted under a new tag, and the old one is unbound
+    self.assertFalse([key for key in self.win.events.bindings if key[1] in tags])
+    self.assertIn(('unbind', str(self.win.canvases.getWidget('can')), '<Button-1>', tags[0]), self.logged('unbind'))
+
+if __name__ == '__main__':
+  unittest.main()
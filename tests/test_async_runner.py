@@ -0,0 +1,73 @@
+import asyncio
+import collections
+import sys
+import threading
+import time
+import tkinter
+import unittest
+
+from src.gui.main import AsyncRunner, RecordingBackend
+
+async def sleep(seconds, result):
+  await asyncio.sleep(seconds)
+  return result
+
+def wait(task, step, timeout=2):
+  """ Steps the event loop with `step` until the task is done, or the timeout passes. """
+
+  deadline = time.monotonic() + timeout
+  while not task.done() and time.monotonic() < deadline:
+    step()
+    time.sleep(0.001)
+  return task.done()
+
+class AsyncRunnerTest(unittest.TestCase):
+  @unittest.skipIf(sys.platform == 'win32', 'the default loop on Windows is a proactor loop, which is polled')
+  def test_selector_loop_internals(self):
+    # AsyncRunner reads these private attributes of asyncio's selector event loops
+    loop = asyncio.new_event_loop()
+
+    try:
+      self.assertTrue(callable(loop._selector.fileno))
+      self.assertIsInstance(loop._ready, collections.deque)
+      self.assertIsInstance(loop._scheduled, list)
+
+      handle = loop.call_later(1, lambda: None)
+      self.assertIs(loop._scheduled[0], handle)
+      self.assertGreater(loop._scheduled[0].when(), loop.time())
+    finally:
+      loop.close()
+
+  @unittest.skipIf(not hasattr(tkinter.Tcl().tk, 'createfilehandler'), 'tkinter has no file handlers on this platform')
+  def test_file_handler(self):
+    tcl = tkinter.Tcl()
+    runner = AsyncRunner(tcl)
+
+    try:
+      self.assertIsNotNone(runner._fd)
+      task = runner.spawn(sleep(0.02, 'done'))
+      self.assertTrue(wait(task, tcl.update))
+      self.assertEqual(task.result(), 'done')
+    finally:
+      runner.close()
+
+  def test_polling_fallback(self):
+    # Recorded widgets have no file handlers, so the runner has to poll for a wakeup from a thread
+    with RecordingBackend() as backend:
+      runner = AsyncRunner(backend.createRoot())
+
+      async def woken():
+        future = runner.loop.create_future()
+        threading.Timer(0.02, runner.loop.call_soon_threadsafe, (future.set_result, 'woken')).start()
+        return await future
+
+      try:
+        self.assertIsNone(runner._fd)
+        task = runner.spawn(woken())
+        self.assertTrue(wait(task, lambda: backend.run(runner.interval)))
+        self.assertEqual(task.result(), 'woken')
+      finally:
+        runner.close()
+
+if __name__ == '__main__':
+  unittest.main()
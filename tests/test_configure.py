@@ -0,0 +1,45 @@
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+def layout():
+  return {
+    'main' : {
+      'win' : { 'width' : 320, 'height' : 240, 'title' : 'Configure' },
+      'widgets' : {
+        'labels' : [ { 'name' : 'lblOne', 'geoMode' : 'pack', 'options' : { 'text' : 'built', 'fg' : 'blue' } } ]
+      }
+    }
+  }
+
+class ConfigureTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.win = WindowManager.build(layout()).getWindow('main')
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def configured(self):
+    return [entry[2] for entry in self.backend.log if entry[0] == 'configure']
+
+  def test_construction_options_are_not_rewritten(self):
+    self.win.labels.configureMany({ 'lblOne' : { 'text' : 'built', 'fg' : 'blue' } })
+    self.win.flush()
+    self.assertEqual(self.configured(), [ ])
+
+  def test_batch_merges_and_drops_repeats(self):
+    with self.win.batch():
+      self.win.labels.configure('lblOne', text='first')
+      self.win.labels.configure('lblOne', text='second', fg='blue')
+    self.win.flush()
+
+    self.assertEqual(self.configured(), [ { 'text' : 'second' } ])
+    self.assertEqual(self.win.labels.getWidget('lblOne').cget('text'), 'second')
+
+    self.win.labels.configureMany({ 'lblOne' : { 'text' : 'second' } })
+    self.win.flush()
+    self.assertEqual(len(self.configured()), 1)
+
+if __name__ == '__main__':
+  unittest.main()
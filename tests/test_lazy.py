@@ -0,0 +1,55 @@
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+def layout():
+  return {
+    'main' : {
+      'win' : { 'width' : 320, 'height' : 240, 'title' : 'Lazy' },
+      'widgets' : {
+        'frames' : [
+          { 'name' : 'frmLazy', 'geoMode' : 'pack', 'lazy' : True },
+          { 'name' : 'frmInner', 'root' : 'frmLazy', 'geoMode' : 'pack' }
+        ],
+        'labels' : [
+          { 'name' : 'lblOuter', 'root' : 'frmLazy', 'geoMode' : 'pack', 'options' : { 'text' : 'Outer' } },
+          { 'name' : 'lblInner', 'root' : 'frmInner', 'geoMode' : 'pack', 'options' : { 'text' : 'Inner' } }
+        ]
+      }
+    }
+  }
+
+class LazyTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.win = WindowManager.build(layout()).getWindow('main')
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def constructed(self):
+    return [entry[2] for entry in self.backend.log if entry[0] == 'construct']
+
+  def test_children_are_deferred(self):
+    self.assertEqual(self.constructed().count('Label'), 0)
+    self.assertEqual(set(self.win.deferredNames), set([ 'frmInner', 'lblOuter', 'lblInner' ]))
+    self.assertNotIn('lblInner', self.win.widgetIndex)
+
+  def test_first_access_builds_the_subtree(self):
+    label = self.win.labels.getWidget('lblInner')
+
+    self.assertIsNotNone(label)
+    self.assertEqual(label.cget('text'), 'Inner')
+    self.assertIs(label.master, self.win.frames.getWidget('frmInner'))
+    self.assertEqual(self.win.deferredNames, { })
+    self.assertEqual(self.constructed().count('Label'), 2)
+
+  def test_map_builds_the_subtree(self):
+    self.win.frames.getWidget('frmLazy').event_generate('<Map>')
+
+    self.assertEqual(self.win.deferredNames, { })
+    self.assertIn('lblOuter', self.win.widgetIndex)
+    self.assertIn('lblInner', self.win.widgetIndex)
+
+if __name__ == '__main__':
+  unittest.main()
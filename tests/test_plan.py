@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend, Plan
+
+def window(title):
+  return {
+    'win' : { 'width' : 320, 'height' : 240, 'title' : title },
+    'commands' : { 'clicked' : 'pass' },
+    'widgets' : {
+      'frames' : [ { 'name' : 'frm', 'geoMode' : 'pack', 'geoOptions' : { 'fill' : 'both' } } ],
+      'buttons' : [
+        { 'name' : f'btn{i}', 'root' : 'frm', 'geoMode' : 'pack', 'options' : { 'text' : str(i), 'command' : 'clicked' }, 'events' : { '<Enter>' : [ 'clicked' ] } }
+        for i in range(3)
+      ],
+      'labels' : [ { 'name' : 'lbl', 'geoMode' : 'pack', 'options' : { 'textvariable' : { 'name' : 'text', 'type' : 'StringVar', 'value' : title } } } ],
+      'canvases' : [ { 'name' : 'can', 'geoMode' : 'pack', 'strokes' : [ { 'type' : 'line', 'unnamed' : [ 0, 0, 10, 10 ] } ] } ]
+    }
+  }
+
+RAW = json.dumps({ 'one' : window('One'), 'two' : window('Two') })
+
+def build(func, *args):
+  """ Builds a manager with a backend of its own, and returns the manager and the backend's log. """
+
+  with RecordingBackend() as backend:
+    return func(*args), backend.log
+
+class PlanTest(unittest.TestCase):
+  def test_plan_builds_like_the_layout(self):
+    direct, expected = build(WindowManager.buildRaw, RAW)
+    planned, log = build(WindowManager.fromPlan, WindowManager.compile(RAW))
+
+    self.assertEqual(log, expected)
+    self.assertEqual(sorted(planned.windows), sorted(direct.windows))
+    self.assertEqual(planned.getWindow('two').variables['text'].get(), 'Two')
+
+  def test_cached_plan_round_trip(self):
+    with tempfile.TemporaryDirectory() as folder:
+      path = os.path.join(folder, 'layout.plan')
+      plan = WindowManager.compile(RAW, path)
+
+      # Plans hold JSON data, so the cached plan matches once tuples are read back as lists
+      cached = Plan.load(path)
+      self.assertEqual(cached.asDict(), json.loads(json.dumps(plan.asDict())))
+      self.assertEqual(WindowManager.compile(RAW, path).asDict(), cached.asDict())
+
+      _, expected = build(WindowManager.buildRaw, RAW)
+      _, log = build(WindowManager.fromPlan, cached)
+      self.assertEqual(log, expected)
+
+  def test_stale_plan_is_recompiled(self):
+    with tempfile.TemporaryDirectory() as folder:
+      path = os.path.join(folder, 'layout.plan')
+      WindowManager.compile(RAW, path)
+
+      raw = json.dumps({ 'one' : window('Changed') })
+      self.assertEqual(WindowManager.compile(raw, path).digest, Plan.key(raw))
+      self.assertEqual(Plan.load(path).digest, Plan.key(raw))
+
+if __name__ == '__main__':
+  unittest.main()
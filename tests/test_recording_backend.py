@@ -0,0 +1,110 @@
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+def layout():
+  return {
+    'main' : {
+      'win' : { 'width' : 320, 'height' : 240, 'title' : 'Recording' },
+      'commands' : {
+        'rows' : "return [f'row {i}' for i in range(1000)]",
+        'hit' : "self.variables['hits'] = self.variables.get('hits', 0) + 1"
+      },
+      'widgets' : {
+        'canvases' : [
+          {
+            'name' : 'canCulled', 'geoMode' : 'pack', 'cull' : True, 'options' : { 'width' : 100, 'height' : 100 },
+            'strokes' : [
+              { 'type' : 'rectangle', 'unnamed' : [ i * 20, 0, i * 20 + 10, 10 ], 'name' : f'rect{i}' } for i in range(50)
+            ]
+          }
+        ],
+        'listboxes' : [
+          { 'name' : 'lstVirtual', 'geoMode' : 'pack', 'options' : { 'height' : 10 }, 'virtual' : { 'source' : 'rows', 'count' : 1000 } }
+        ]
+      }
+    }
+  }
+
+class RecordingBackendTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.win = WindowManager.build(layout()).getWindow('main')
+    self.backend.run()
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def test_culled_canvas(self):
+    view = self.win.culled['canCulled']
+
+    # Only the strokes within the 100x100 view, plus the margin, get items
+    self.assertIsNotNone(view.item('rect0'))
+    self.assertIsNone(view.item('rect49'))
+    self.assertLess(len(view.live), 50)
+
+    view.update({ 'rect49' : [ 0, 20, 10, 30 ] })
+    self.backend.run()
+    self.assertIsNotNone(view.item('rect49'))
+
+  def test_culled_canvas_scroll_command(self):
+    view = self.win.culled['canCulled']
+    scrolled = [ ]
+    self.win.canvases.configure('canCulled', yscrollcommand=lambda *args: scrolled.append(args))
+
+    # The new command is wrapped, so scrolling still refreshes the view
+    command = view.canvas.cget('yscrollcommand')
+    self.assertTrue(isinstance(command, str))
+    view.canvas.tk.call(command, '0.0', '0.5')
+    self.assertEqual(scrolled, [ ('0.0', '0.5') ])
+    self.assertIsNotNone(view._job)
+
+  def test_culled_canvas_rejects_enter(self):
+    view = self.win.culled['canCulled']
+
+    with self.assertRaisesRegex(Exception, "can't be bound"):
+      view.add([ { 'type' : 'oval', 'unnamed' : [ 0, 0, 5, 5 ], 'events' : { '<Enter>' : [ 'hit' ] } } ])
+
+  def test_virtual_list(self):
+    listbox = self.win.listboxes.getWidget('lstVirtual')
+    view = self.win.virtual['lstVirtual']
+    self.assertLess(listbox.size(), 1000)
+
+    listbox.selection_set(2)
+    listbox.event_generate('<<ListboxSelect>>')
+    self.assertEqual(view.selection(), [ 2 ])
+
+    view.see(500)
+    self.assertIn('row 500', listbox.rows.values())
+    self.assertEqual(view.selection(), [ 2 ])
+    self.assertEqual(listbox.curselection(), ())
+
+  def test_virtual_list_steps_past_the_edge(self):
+    listbox = self.win.listboxes.getWidget('lstVirtual')
+    view = self.win.virtual['lstVirtual']
+
+    listbox.index = lambda index: view.page - 1
+    listbox.event_generate('<Down>', keysym='Down')
+    self.assertEqual(view.top, 1)
+    self.assertEqual(view.selection(), [ view.page ])
+
+  def test_virtual_list_short_source(self):
+    view = self.win.virtual['lstVirtual']
+
+    view.setSource(iter(range(30)), 100)
+    view.see(90)
+    self.assertEqual(len(view.source), 30)
+    self.assertEqual(view.top, 20)
+
+  def test_timers_run_in_due_order(self):
+    fired = [ ]
+    self.win.gui.after(50, fired.append, 'late')
+    self.win.gui.after(5, fired.append, 'early')
+
+    self.backend.run(20)
+    self.assertEqual(fired, [ 'early' ])
+    self.backend.run(100)
+    self.assertEqual(fired, [ 'early', 'late' ])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,50 @@
+import io
+import json
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+def window(title):
+  return {
+    'win' : { 'width' : 320, 'height' : 240, 'title' : title },
+    'widgets' : { 'labels' : [ { 'name' : 'lbl', 'geoMode' : 'pack', 'options' : { 'text' : title } } ] }
+  }
+
+RAW = json.dumps({ 'one' : window('One'), 'two' : window('Two'), 'three' : window('Three') })
+
+class StreamTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def texts(self):
+    return [entry[3]['text'] for entry in self.backend.log if entry[0] == 'construct' and entry[2] == 'Label']
+
+  def test_first_window_is_built_before_the_rest(self):
+    man = WindowManager.buildStream(io.StringIO(RAW), first='two', chunk=16)
+
+    self.assertEqual(list(man.windows), [ 'two' ])
+    self.assertEqual(self.texts(), [ 'Two' ])
+    self.assertEqual(man.getWindow('two').gui.wmState, 'normal')
+
+    # The rest is read and built from the event loop, in the order of the file
+    self.backend.run()
+    self.assertEqual(self.texts(), [ 'Two', 'One', 'Three' ])
+    self.assertEqual(man.specs, { })
+    self.assertEqual(man.getWindow('one').gui.wmState, 'withdrawn')
+
+  def test_access_reads_ahead(self):
+    man = WindowManager.buildStream(io.StringIO(RAW), chunk=16)
+    self.assertEqual(self.texts(), [ 'One' ])
+
+    self.assertTrue(man.hasWindow('three'))
+    self.assertEqual(man.getWindow('three').labels.getWidget('lbl').cget('text'), 'Three')
+
+  def test_missing_first_window(self):
+    with self.assertRaises(Exception):
+      WindowManager.buildStream(io.StringIO(RAW), first='four')
+
+if __name__ == '__main__':
+  unittest.main()
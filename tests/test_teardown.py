@@ -0,0 +1,84 @@
+import unittest
+
+from src.gui.main import WindowManager, RecordingBackend
+
+def label(name, root=None, text='label'):
+  return { 'name' : name, 'root' : root, 'geoMode' : 'pack', 'options' : { 'text' : text } }
+
+def layout():
+  return {
+    'main' : {
+      'win' : { 'width' : 320, 'height' : 240, 'title' : 'Teardown' },
+      'commands' : { 'clicked' : 'pass' },
+      'widgets' : {
+        'frames' : [
+          { 'name' : 'frmLazy', 'geoMode' : 'pack', 'lazy' : True },
+          { 'name' : 'frmInner', 'root' : 'frmLazy', 'geoMode' : 'pack' },
+          { 'name' : 'frmBuilt', 'geoMode' : 'pack' }
+        ],
+        'labels' : [
+          dict(label('lblDeferred', 'frmInner'), options={ 'textvariable' : { 'name' : 'deferred', 'type' : 'StringVar', 'value' : 'a' } }),
+          dict(label('lblBuilt', 'frmBuilt'), options={ 'textvariable' : { 'name' : 'built', 'type' : 'StringVar', 'value' : 'b' } }),
+          dict(label('lblEvents', 'frmBuilt'), events={ '<Button-1>' : [ 'clicked' ] })
+        ]
+      }
+    }
+  }
+
+class TeardownTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.win = WindowManager.build(layout()).getWindow('main')
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def constructed(self):
+    return [entry[1] for entry in self.backend.log if entry[0] == 'construct']
+
+  def test_delete_deferred_widget(self):
+    built = self.constructed()
+    self.win.frames.deleteWidget('frmInner')
+
+    self.assertEqual(self.constructed(), built)
+    self.assertNotIn('frmInner', self.win.deferredNames)
+    self.assertNotIn('lblDeferred', self.win.deferredNames)
+    self.assertNotIn('deferred', self.win.variables)
+    self.assertNotIn('deferred', self.win.variableUsers)
+
+    # The rest of the lazy subtree still builds
+    self.assertIsNotNone(self.win.frames.getWidget('frmLazy'))
+    self.assertEqual(self.win.deferred.get('frmLazy', [ ]), [ ])
+
+  def test_remove_built_subtree(self):
+    frame = self.win.frames.getWidget('frmBuilt')
+    labels = [self.win.labels.getWidget(name) for name in [ 'lblBuilt', 'lblEvents' ]]
+    self.win.removeWidget('frmBuilt')
+
+    for name in [ 'frmBuilt', 'lblBuilt', 'lblEvents' ]: self.assertIsNone(self.win.findWidget(name))
+    for widget in [ frame ] + labels: self.assertFalse(widget.winfo_exists())
+    self.assertFalse([key for key in self.win.events.bindings if key[0] == str(labels[1])])
+    self.assertNotIn('built', self.win.variables)
+
+  def test_pool_reuses_removed_widget(self):
+    # Only widgets built while recycling is on are pooled
+    self.win.recycle()
+    self.win.addWidgets({ 'labels' : [ label('lblPooled', 'frmBuilt') ] })
+    self.win.labels.configure('lblPooled', text='changed', bg='red')
+    pooled = self.win.labels.getWidget('lblPooled')
+
+    self.win.removeWidget('lblPooled')
+    self.assertTrue(pooled.winfo_exists())
+    self.assertFalse(pooled.winfo_ismapped())
+
+    built = self.constructed()
+    self.win.addWidgets({ 'labels' : [ label('lblAgain', 'frmBuilt') ] })
+
+    again = self.win.labels.getWidget('lblAgain')
+    self.assertIs(again, pooled)
+    self.assertEqual(self.constructed(), built)
+    self.assertEqual(again.cget('text'), 'label')
+    self.assertEqual(self.win.pool.reused, 1)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,84 @@
+import threading
+import unittest
+
+import src.gui.main as gui
+from src.gui.main import Window, WindowManager, RecordingBackend
+
+class UpdateQueueTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.root = Window(100, 100, 'Updates')
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def watch(self, widget):
+    """ Records the threads that schedule timers on `widget`. """
+
+    threads, after = [ ], widget.after
+
+    def watched(ms, func=None, *args):
+      threads.append(threading.get_ident())
+      return after(ms, func, *args)
+
+    widget.after = watched
+    return threads
+
+  def post(self, target, fn, *args):
+    thread = threading.Thread(target=target.post, args=(fn, ) + args)
+    thread.start()
+    thread.join()
+
+  def test_manager_starts_on_the_tkinter_thread(self):
+    self.assertEqual(gui.TK_THREAD, threading.get_ident())
+
+    threads = self.watch(self.root.gui)
+    man = WindowManager()
+    self.assertIsNotNone(man.updates._job)
+    self.assertEqual(man.updates._thread, threading.get_ident())
+
+    ran = [ ]
+    self.post(man, ran.append, 'posted')
+    self.backend.run(man.updates.idle)
+
+    self.assertEqual(ran, [ 'posted' ])
+    self.assertEqual(set(threads), set([ threading.get_ident() ]))
+
+  def test_post_from_the_tkinter_thread_wakes_the_poller(self):
+    man = WindowManager()
+    self.backend.run(1000)
+    self.assertEqual(man.updates._wait, man.updates.idle)
+
+    ran = [ ]
+    man.post(ran.append, 'posted')
+    self.backend.run(man.updates.interval)
+    self.assertEqual(ran, [ 'posted' ])
+
+  def test_window_without_manager_posts_from_any_thread(self):
+    threads = self.watch(self.root.gui)
+    self.assertIsNotNone(self.root.updates._job)
+
+    ran = [ ]
+    self.post(self.root, ran.append, 'posted')
+    self.backend.run(self.root.updates.idle)
+
+    self.assertEqual(ran, [ 'posted' ])
+    self.assertEqual(set(threads), set([ threading.get_ident() ]))
+
+  def test_manager_takes_over_pending_updates(self):
+    ran = [ ]
+    self.root.post(ran.append, 'pending')
+
+    man = WindowManager()
+    man.addWindow('root', self.root)
+    self.assertIsNone(self.root._updates._job)
+    self.assertIs(self.root.updates, man.updates)
+
+    self.backend.run(man.updates.idle)
+    self.assertEqual(ran, [ 'pending' ])
+
+    man.removeWindow('root')
+    self.assertIsNotNone(self.root._updates._job)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+
+from src.gui.main import Watchdog, RecordingBackend
+
+class WatchdogTest(unittest.TestCase):
+  def setUp(self):
+    self.backend = RecordingBackend().__enter__()
+    self.root = self.backend.createRoot()
+
+  def tearDown(self):
+    self.backend.__exit__(None, None, None)
+
+  def test_restart_stops_the_old_thread(self):
+    # Hold the old thread in its stall callback while the watchdog is restarted
+    entered, release = threading.Event(), threading.Event()
+
+    def onStall(stall):
+      entered.set()
+      release.wait(1)
+
+    dog = Watchdog(self.root, threshold=0.02, interval=0.01, onStall=onStall).start()
+    self.assertTrue(entered.wait(1))
+    old = dog._thread
+
+    dog.stop().start()
+    release.set()
+    old.join(1)
+
+    try:
+      self.assertFalse(old.is_alive())
+      self.assertTrue(dog._thread.is_alive())
+    finally:
+      dog.stop()
+
+  def test_stall_is_recorded(self):
+    # Recorded timers only run through the backend, so the heartbeat stalls until it's run
+    stalls = [ ]
+    dog = Watchdog(self.root, threshold=0.05, interval=0.01, onStall=stalls.append).start()
+
+    try:
+      time.sleep(0.2)
+      self.assertEqual(len(stalls), 1)
+      self.assertGreaterEqual(stalls[0]['duration'], 0.05)
+      self.assertTrue(stalls[0]['stack'])
+    finally:
+      dog.stop()
+
+if __name__ == '__main__':
+  unittest.main()